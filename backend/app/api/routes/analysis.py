@@ -2,24 +2,28 @@
 Analysis API Routes
 """
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks
-import os
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
+from fastapi.responses import StreamingResponse
 import uuid
 import json
 from datetime import datetime
 
 from app.core.config import settings
 from app.core.database import get_collection
+from app.core.metrics import AnalysisTimings
 from app.models.analysis import AnalysisStatus
-from app.services.analysis.video_processor import VideoProcessor
-from app.services.analysis.scoring_engine import ScoringEngine
+from app.services.analysis.feature_matrix import feature_matrix
+from app.services.analysis.pipeline import match_subject_terms, score_results
+from app.services.analysis.result_cache import result_cache
+from app.services.jobs.job_queue import job_queue
+from app.services.jobs.progress import completed_progress, read_progress, stream_progress
+from app.utils.file_handler import FileHandler, FileTooLargeError
 
 router = APIRouter()
 
 
 @router.post("/upload", response_model=dict)
 async def upload_video(
-    background_tasks: BackgroundTasks,
     video: UploadFile = File(...),
     mentor_name: str = Form(...),
     subject: str = Form(...),
@@ -59,12 +63,18 @@ async def upload_video(
     # Generate unique filename
     analysis_id = str(uuid.uuid4())
     filename = f"{analysis_id}.{file_ext}"
-    filepath = os.path.join(settings.UPLOAD_DIR, "videos", filename)
     
-    # Save file
-    with open(filepath, "wb") as buffer:
-        content = await video.read()
-        buffer.write(content)
+    # Stream file to disk, hashing as it goes
+    file_handler = FileHandler(settings.UPLOAD_DIR)
+    try:
+        saved = await file_handler.save_upload_stream(
+            video,
+            filename,
+            max_size=settings.MAX_FILE_SIZE,
+            chunk_size=settings.UPLOAD_CHUNK_SIZE
+        )
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     
     # Create analysis record
     collection = get_collection("analyses")
@@ -74,20 +84,98 @@ async def upload_video(
         "mentor_name": mentor_name,
         "subject": subject,
         "video_filename": filename,
-        "status": AnalysisStatus.PENDING,
+        "video_size": saved["size_bytes"],
+        "video_sha256": saved["sha256"],
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow()
     }
     
-    await collection.insert_one(analysis_doc)
+    # Same video analysed before: rescore the stored outputs right away
+    cached = await result_cache.get(saved["sha256"])
+    if cached is not None:
+        timings = AnalysisTimings()
+        with timings.active():
+            analysis_doc.update(score_results(match_subject_terms(cached, subject)))
+        
+        now = datetime.utcnow()
+        analysis_doc.update({
+            "status": AnalysisStatus.COMPLETED,
+            "progress": completed_progress(),
+            "timings": timings.as_dict(),
+            "completed_at": now,
+            "updated_at": now
+        })
+        await collection.insert_one(analysis_doc)
+        feature_matrix.add(analysis_doc)
+        
+        return {
+            "analysis_id": analysis_id,
+            "status": "completed",
+            "message": "Video uploaded successfully. Reused results from an identical video."
+        }
     
-    # Start background processing
-    background_tasks.add_task(process_video_analysis, analysis_id, filepath)
+    # Inserting the document queues it, any worker can claim it
+    analysis_doc.update(job_queue.job_fields())
+    await collection.insert_one(analysis_doc)
     
     return {
         "analysis_id": analysis_id,
         "status": "uploaded",
-        "message": "Video uploaded successfully. Analysis started."
+        "message": "Video uploaded successfully. Analysis queued."
+    }
+
+
+@router.get("/{analysis_id}/progress", response_model=dict)
+async def get_analysis_progress(analysis_id: str):
+    """Get analysis status and stage progress without the results"""
+    progress = await read_progress(analysis_id)
+    
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    
+    return progress
+
+
+@router.get("/{analysis_id}/events")
+async def analysis_events(analysis_id: str, request: Request):
+    """Stream stage progress as Server-Sent Events until the analysis finishes"""
+    progress = await read_progress(analysis_id)
+    
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    
+    return StreamingResponse(
+        stream_progress(analysis_id, progress, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop nginx from buffering the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@router.post("/{analysis_id}/retry", response_model=dict)
+async def retry_analysis(analysis_id: str):
+    """Queue an analysis again, re-running only stages without a current checkpoint"""
+    collection = get_collection("analyses")
+    
+    if not await job_queue.enqueue(analysis_id):
+        analysis = await collection.find_one({"_id": analysis_id}, {"status": 1})
+        if not analysis:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        raise HTTPException(status_code=409, detail="Analysis is being processed")
+    
+    # No longer completed, leave it out of scoring simulations
+    feature_matrix.remove(analysis_id)
+    
+    analysis = await collection.find_one({"_id": analysis_id}, {"checkpoints": 1})
+    
+    return {
+        "analysis_id": analysis_id,
+        "status": "pending",
+        "checkpointed_stages": sorted(analysis.get("checkpoints") or {}),
+        "message": "Analysis queued. Stages with a current checkpoint are reused."
     }
 
 
@@ -95,7 +183,8 @@ async def upload_video(
 async def get_analysis(analysis_id: str):
     """Get analysis results"""
     collection = get_collection("analyses")
-    analysis = await collection.find_one({"_id": analysis_id})
+    # Checkpoints duplicate the results, keep them out of responses
+    analysis = await collection.find_one({"_id": analysis_id}, {"checkpoints": 0})
     
     if not analysis:
         raise HTTPException(status_code=404, detail="Analysis not found")
@@ -109,7 +198,7 @@ async def list_analyses(skip: int = 0, limit: int = 10):
     """List all analyses"""
     collection = get_collection("analyses")
     
-    cursor = collection.find().sort("created_at", -1).skip(skip).limit(limit)
+    cursor = collection.find({}, {"checkpoints": 0}).sort("created_at", -1).skip(skip).limit(limit)
     analyses = await cursor.to_list(length=limit)
     
     for analysis in analyses:
@@ -123,60 +212,3 @@ async def list_analyses(skip: int = 0, limit: int = 10):
         "skip": skip,
         "limit": limit
     }
-
-
-async def process_video_analysis(analysis_id: str, video_path: str):
-    """Background task to process video analysis"""
-    collection = get_collection("analyses")
-    
-    try:
-        # Update status to processing
-        await collection.update_one(
-            {"_id": analysis_id},
-            {"$set": {"status": AnalysisStatus.PROCESSING, "updated_at": datetime.utcnow()}}
-        )
-        
-        # Initialize processors
-        video_processor = VideoProcessor(video_path)
-        scoring_engine = ScoringEngine()
-        
-        # Process video
-        results = await video_processor.process()
-        
-        # Calculate scores
-        scores = scoring_engine.calculate_scores(results)
-        
-        # Generate insights
-        insights = scoring_engine.generate_insights(results, scores)
-        
-        # Update database
-        await collection.update_one(
-            {"_id": analysis_id},
-            {
-                "$set": {
-                    "status": AnalysisStatus.COMPLETED,
-                    "scores": scores,
-                    "insights": insights,
-                    "transcript": results.get("transcript"),
-                    "audio_features": results.get("audio_features"),
-                    "visual_features": results.get("visual_features"),
-                    "nlp_analysis": results.get("nlp_analysis"),
-                    "video_duration": results.get("duration"),
-                    "completed_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow()
-                }
-            }
-        )
-        
-    except Exception as e:
-        await collection.update_one(
-            {"_id": analysis_id},
-            {
-                "$set": {
-                    "status": AnalysisStatus.FAILED,
-                    "error": str(e),
-                    "updated_at": datetime.utcnow()
-                }
-            }
-        )
-        print(f"Analysis failed for {analysis_id}: {str(e)}")
\ No newline at end of file
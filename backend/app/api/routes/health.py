@@ -3,18 +3,60 @@ Health Check Routes
 """
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.core.config import settings
 from app.core.database import get_database
+from app.services.ai_pipeline.llm_cache import llm_cache
+from app.services.ai_pipeline.model_registry import model_registry
 
 router = APIRouter()
 
 
 @router.get("")
 async def health_check():
-    """Basic health check"""
-    return {
-        "status": "healthy",
-        "service": "Mentor Scoring AI Backend"
-    }
+    """
+    Basic health check
+    
+    503 while models are still warming up, or when a required one failed
+    to load, so load balancers only send uploads to nodes that can analyze.
+    Optional components that failed (Ollama) are listed under "degraded".
+    """
+    # Without preloading, models load on first use: nothing to wait for
+    if not settings.PRELOAD_MODELS or model_registry.ready:
+        return {
+            "status": "healthy",
+            "service": "Mentor Scoring AI Backend",
+            "models_ready": True,
+            "degraded": model_registry.degraded
+        }
+    
+    return JSONResponse(
+        status_code=503,
+        content={
+            "status": "unhealthy" if model_registry.warmed_up else "starting",
+            "service": "Mentor Scoring AI Backend",
+            "models_ready": False,
+            "errors": model_registry.errors
+        }
+    )
+
+
+@router.get("/models")
+async def models_health():
+    """Model registry health check"""
+    return model_registry.status()
+
+
+@router.get("/llm")
+async def llm_gateway_health():
+    """LLM gateway queue and latency metrics"""
+    return model_registry.get_llm_gateway().stats()
+
+
+@router.get("/llm-cache")
+async def llm_cache_health():
+    """LLM response cache hit/miss counters"""
+    return llm_cache.stats()
 
 
 @router.get("/db")
@@ -0,0 +1,32 @@
+"""
+Scoring API Routes
+"""
+
+from fastapi import APIRouter, HTTPException
+
+from app.api.schemas.scoring import ScoringSimulationRequest, ScoringSimulationResponse
+from app.services.analysis.feature_matrix import feature_matrix
+
+router = APIRouter()
+
+
+@router.post("/simulate", response_model=ScoringSimulationResponse)
+async def simulate_scoring(request: ScoringSimulationRequest):
+    """
+    Rescore all completed analyses with candidate weights/thresholds
+    
+    Nothing is stored. Weights are used as given, not normalised. Returns the
+    mentor ranking under the candidate rubric next to the current one (and
+    optionally every simulated overall score).
+    """
+    await feature_matrix.ensure_current()
+    
+    try:
+        return feature_matrix.simulate(
+            weights=request.weights,
+            thresholds=request.thresholds,
+            limit=request.limit,
+            include_scores=request.include_scores
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -3,7 +3,7 @@ Analysis API Schemas
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 
 
@@ -32,6 +32,25 @@ class InsightsResponse(BaseModel):
     key_highlights: Optional[str] = None
 
 
+class TranscriptSegmentResponse(BaseModel):
+    """Transcript segment response schema"""
+    start: float
+    end: float
+    text: str
+
+
+class AnalysisProgressResponse(BaseModel):
+    """Stage progress response (also the SSE event payload)"""
+    analysis_id: str
+    status: str
+    stage: str
+    percent: float
+    eta_seconds: Optional[float] = None
+    stages: Dict[str, str] = {}
+    updated_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
 class AnalysisStatusResponse(BaseModel):
     """Analysis status response"""
     analysis_id: str
@@ -52,6 +71,7 @@ class AnalysisResultResponse(BaseModel):
     scores: Optional[ScoresResponse] = None
     insights: Optional[InsightsResponse] = None
     transcript: Optional[str] = None
+    transcript_segments: Optional[List[TranscriptSegmentResponse]] = None
     created_at: datetime
     updated_at: datetime
     completed_at: Optional[datetime] = None
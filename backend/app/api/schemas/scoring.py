@@ -0,0 +1,44 @@
+"""
+Scoring API Schemas
+"""
+
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Union
+
+
+class ScoringSimulationRequest(BaseModel):
+    """What-if scoring request: weights/thresholds to try instead of the current ones"""
+    weights: Dict[str, float] = Field(default_factory=dict, examples=[{"technical_depth": 0.4, "interaction": 0.0}])
+    thresholds: Dict[str, Dict[str, Union[float, List[float]]]] = Field(
+        default_factory=dict,
+        examples=[{"engagement": {"gesture_count_min": 5}, "communication": {"optimal_wpm": [120, 160]}}]
+    )
+    limit: int = Field(50, ge=1, le=1000)
+    include_scores: bool = False
+
+
+class SimulatedMentorRank(BaseModel):
+    """Mentor position under the candidate rubric, and under the current one"""
+    rank: int
+    previous_rank: int
+    rank_change: int
+    id: str
+    mentor_name: str
+    average_score: float
+    previous_average_score: float
+    total_sessions: int
+
+
+class ScoringSimulationResponse(BaseModel):
+    """What-if scoring result"""
+    analyses: int
+    mentors: int
+    weights: Dict[str, float]
+    thresholds: Dict[str, Dict[str, Union[float, List[float]]]]
+    average_overall: float
+    previous_average_overall: float
+    rank_changes: int
+    ranking: List[SimulatedMentorRank]
+    analysis_ids: Optional[List[str]] = None
+    overall_scores: Optional[List[float]] = None
+    elapsed_ms: float
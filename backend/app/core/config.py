@@ -22,14 +22,95 @@ class Settings(BaseSettings):
     
     # File Upload
     MAX_FILE_SIZE: int = 524288000  # 500MB
+    UPLOAD_CHUNK_SIZE: int = 1048576  # 1MB
     UPLOAD_DIR: str = "uploads"
     ALLOWED_EXTENSIONS: str = "mp4,avi,mov,mkv,webm"
     
     # AI Models
     OLLAMA_BASE_URL: str = "http://localhost:11434"
     OLLAMA_MODEL: str = "llama3.1:8b"
+    OLLAMA_NUM_PARALLEL: int = 1  # Requests Ollama runs at once, also the gateway's in-flight limit
+    OLLAMA_KEEP_ALIVE: str = "30m"  # How long Ollama keeps the model loaded after a request
+    LLM_REQUEST_TIMEOUT: float = 120.0  # Seconds per generate request
+    LLM_SCORING_MODE: str = "combined"  # "combined" (one JSON request) or "separate" (one per aspect)
+    LLM_TRANSCRIPT_MODE: str = "chunked"  # "chunked" (whole transcript) or "head" (first 1000 chars)
+    LLM_CHUNK_TOKENS: int = 800  # Max tokens per transcript window
+    LLM_CHUNK_CONCURRENCY: int = 2  # Windows scored at once per analysis
+    WHISPER_BACKEND: str = "openai"  # "openai" (openai-whisper) or "faster_whisper" (CTranslate2)
     WHISPER_MODEL: str = "base"
     WHISPER_DEVICE: str = "cpu"
+    WHISPER_COMPUTE_TYPE: str = "int8"  # faster_whisper only: int8, int8_float16, float16, float32
+    WHISPER_BEAM_SIZE: int = 1  # 1 = greedy decoding
+    WHISPER_NUM_THREADS: int = 0  # CPU threads per transcription worker, 0 = library default
+    TRANSCRIPTION_SEGMENT_SECONDS: float = 60.0  # Longest segment per Whisper call, cut at quiet points
+    PRELOAD_MODELS: bool = True  # Warm up the model registry at startup
+    
+    # LLM Response Cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MEMORY_ENTRIES: int = 1024
+    LLM_CACHE_TTL_SECONDS: int = 604800  # 7 days
+    LLM_CACHE_MAX_ENTRIES: int = 100000
+    
+    # Technical Vocabulary
+    TERM_VOCABULARY_DIR: str = ""  # Extra <subject>.txt term lists, override built-ins
+    TERM_DEFAULT_VOCABULARY: str = "software"  # Used when no vocabulary matches the subject
+    
+    # Audio Decoding
+    FFMPEG_BINARY: str = "ffmpeg"
+    FFPROBE_BINARY: str = "ffprobe"  # Video duration when the header has no frame count
+    AUDIO_SAMPLE_RATE: int = 16000  # Whisper's native rate, shared by all audio stages
+    AUDIO_ANALYSIS_MAX_SECONDS: float = 0  # Audio features cover this much of the recording, 0 = all
+    AUDIO_BLOCK_SECONDS: float = 30.0  # Block size for streaming feature extraction
+    
+    # Voice Activity Detection
+    VAD_ENABLED: bool = True  # Transcribe speech only, pause metrics from speech intervals
+    VAD_THRESHOLD_DB: float = 12.0  # Speech = this far above the recording's noise floor
+    VAD_MIN_SILENCE_SECONDS: float = 0.5  # Shorter gaps stay inside one speech interval
+    VAD_PAD_SECONDS: float = 0.2  # Added around each speech interval
+    
+    # Stage Execution
+    STAGE_EXECUTOR: str = "process"  # "process" (dedicated worker pools) or "thread"
+    STAGE_WORKERS_TRANSCRIPTION: int = 1
+    STAGE_WORKERS_AUDIO: int = 1
+    STAGE_WORKERS_VISUAL: int = 1
+    
+    # Stage Scheduling (per process, shared by all analyses)
+    STAGE_SLOTS_CPU: int = 3  # CPU-heavy stages (decode, VAD, Whisper, audio, visual) at once
+    STAGE_SLOTS_IO: int = 8
+    STAGE_SLOTS_LLM: int = 4  # Analyses in the NLP stage at once
+    STAGE_TIMEOUT_DECODE: float = 600  # Seconds once a stage starts, 0 = no limit
+    STAGE_TIMEOUT_VAD: float = 300
+    STAGE_TIMEOUT_TRANSCRIPTION: float = 3600
+    STAGE_TIMEOUT_AUDIO: float = 900
+    STAGE_TIMEOUT_VISUAL: float = 900
+    STAGE_TIMEOUT_NLP: float = 1800
+    
+    # Job Queue
+    WORKER_CONCURRENCY: int = 2  # Jobs per `python -m app.worker` process
+    EMBEDDED_WORKER_CONCURRENCY: int = 1  # Jobs run inside the API process (0 = none)
+    JOB_LEASE_SECONDS: int = 120
+    JOB_POLL_INTERVAL: float = 2.0
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: float = 30.0
+    JOB_RETRY_BACKOFF_MAX_SECONDS: float = 900.0
+    WORKER_METRICS_PORT: int = 9100  # Prometheus endpoint of `python -m app.worker` (0 = off)
+    
+    # Progress Events
+    PROGRESS_PERSIST_INTERVAL: float = 2.0  # Most often progress within a stage is written to Mongo
+    PROGRESS_POLL_INTERVAL: float = 2.0  # Reads of jobs running in other worker processes
+    SSE_KEEPALIVE_SECONDS: float = 15.0
+    
+    # Scoring Simulation
+    FEATURE_MATRIX_REFRESH_SECONDS: float = 30.0  # Catch up on analyses completed by other processes
+    
+    # Visual Sampling
+    VISUAL_SEEK_THRESHOLD_SECONDS: float = 2.0  # Seek instead of grab() past this gap
+    VISUAL_SAMPLES_PER_MINUTE: int = 30  # Budget = this * sqrt(minutes)
+    VISUAL_MIN_SAMPLES: int = 10
+    VISUAL_MAX_SAMPLES: int = 300
+    VISUAL_MIN_SAMPLE_INTERVAL: float = 1.0  # Seconds
+    VISUAL_SCENE_CHANGE_THRESHOLD: float = 0.12  # Mean thumbnail difference (0-1)
+    VISUAL_SCENE_EXTRA_RATIO: float = 0.25  # Extra scene-change samples, fraction of budget
     
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:5173", "http://localhost:3000"]
@@ -0,0 +1,268 @@
+"""
+Pipeline Metrics
+Per-stage timings stored on each analysis, and Prometheus metrics for the process
+"""
+
+import multiprocessing
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Seconds, from sub-second LLM calls to hour-long recordings
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200, 3600)
+
+STAGE_SECONDS = Histogram(
+    "mentor_stage_duration_seconds",
+    "Wall time of a pipeline stage",
+    ["stage"],
+    buckets=DURATION_BUCKETS
+)
+STAGE_CPU_SECONDS = Histogram(
+    "mentor_stage_cpu_seconds",
+    "CPU time of one unit of stage work on a stage worker",
+    ["stage"],
+    buckets=DURATION_BUCKETS
+)
+STAGE_PEAK_RSS = Gauge(
+    "mentor_stage_peak_rss_bytes",
+    "Peak RSS of the process that last ran the stage's work",
+    ["stage"]
+)
+STAGE_RUNS = Counter(
+    "mentor_stage_runs_total",
+    "Pipeline stage runs by outcome",
+    ["stage", "outcome"]
+)
+FALLBACKS = Counter(
+    "mentor_fallbacks_total",
+    "Degraded results: defaults or simulated values used instead of real output",
+    ["stage", "reason"]
+)
+LLM_QUEUE_SECONDS = Histogram(
+    "mentor_llm_queue_wait_seconds",
+    "Time LLM requests wait in the gateway before being sent",
+    buckets=DURATION_BUCKETS
+)
+ANALYSIS_SECONDS = Histogram(
+    "mentor_analysis_duration_seconds",
+    "End-to-end analysis time in a worker",
+    ["outcome"],
+    buckets=DURATION_BUCKETS
+)
+
+_timings: ContextVar[Optional["AnalysisTimings"]] = ContextVar("analysis_timings", default=None)
+_stage: ContextVar[Optional[str]] = ContextVar("pipeline_stage", default=None)
+_fallback_sink: ContextVar[Optional[List[Tuple[str, str]]]] = ContextVar("fallback_sink", default=None)
+
+# Fallbacks recorded while running a stage function (possibly in a worker
+# process), handed back to the caller with the result
+_work_local = threading.local()
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class AnalysisTimings:
+    """
+    Stage measurements for one analysis
+
+    Activated around a run with `active()`; stages and stage workers
+    started inside report into it. Stored on the analysis as `timings`.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.stages: Dict[str, Dict] = {}
+
+    @contextmanager
+    def active(self) -> Iterator["AnalysisTimings"]:
+        """Collect measurements from the current task (and tasks it starts)"""
+        token = _timings.set(self)
+        try:
+            yield self
+        finally:
+            _timings.reset(token)
+
+    def _entry(self, stage: str) -> Dict:
+        return self.stages.setdefault(stage, {
+            "runs": 0,
+            "wall_seconds": 0.0,
+            "errors": 0,
+            "work_calls": 0,
+            "cpu_seconds": 0.0,
+            "peak_rss_mb": None,
+            "fallbacks": {}
+        })
+
+    def add_run(self, stage: str, wall: float, error: bool = False):
+        entry = self._entry(stage)
+        entry["runs"] += 1
+        entry["wall_seconds"] += wall
+        entry["errors"] += int(error)
+
+    def add_work(self, stage: str, cpu: float, rss: Optional[int]):
+        entry = self._entry(stage)
+        entry["work_calls"] += 1
+        entry["cpu_seconds"] += cpu
+        if rss is not None:
+            entry["peak_rss_mb"] = max(entry["peak_rss_mb"] or 0.0, rss / 2 ** 20)
+
+    def add_fallback(self, stage: str, reason: str):
+        fallbacks = self._entry(stage)["fallbacks"]
+        fallbacks[reason] = fallbacks.get(reason, 0) + 1
+
+    def as_dict(self) -> Dict:
+        """Sub-document stored on the analysis"""
+        stages = {}
+        for stage, entry in self.stages.items():
+            stages[stage] = {
+                **entry,
+                "wall_seconds": round(entry["wall_seconds"], 3),
+                "cpu_seconds": round(entry["cpu_seconds"], 3),
+                "peak_rss_mb": round(entry["peak_rss_mb"], 1) if entry["peak_rss_mb"] is not None else None,
+                "fallbacks": dict(entry["fallbacks"])
+            }
+
+        return {
+            "total_seconds": round(time.perf_counter() - self.started_at, 3),
+            "fallback_count": sum(sum(s["fallbacks"].values()) for s in stages.values()),
+            "stages": stages
+        }
+
+
+def current_stage() -> Optional[str]:
+    """Name of the innermost running stage in this task"""
+    return _stage.get()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Measure one run of a pipeline stage
+
+    Records wall time and whether it raised. Works around synchronous code
+    and awaits alike; stage work dispatched inside is attributed to `name`.
+    """
+    token = _stage.set(name)
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except Exception:
+        outcome = "error"
+        raise
+    except BaseException:
+        outcome = "cancelled"
+        raise
+    finally:
+        wall = time.perf_counter() - started
+        _stage.reset(token)
+
+        STAGE_SECONDS.labels(name).observe(wall)
+        STAGE_RUNS.labels(name, outcome).inc()
+        timings = _timings.get()
+        if timings is not None:
+            timings.add_run(name, wall, outcome == "error")
+
+
+def record_fallback(stage_name: str, reason: str):
+    """
+    Count a degraded result
+
+    Inside stage work (measured_call) the fallback travels back with the
+    result, so ones recorded in worker processes aren't lost.
+    """
+    pending = getattr(_work_local, "fallbacks", None)
+    if pending is not None:
+        pending.append((stage_name, reason))
+        return
+
+    FALLBACKS.labels(stage_name, reason).inc()
+    timings = _timings.get()
+    if timings is not None:
+        timings.add_fallback(stage_name, reason)
+    sink = _fallback_sink.get()
+    if sink is not None:
+        sink.append((stage_name, reason))
+
+
+@contextmanager
+def collect_fallbacks() -> Iterator[List[Tuple[str, str]]]:
+    """Collect the fallbacks recorded inside the block (and tasks it starts)"""
+    sink: List[Tuple[str, str]] = []
+    token = _fallback_sink.set(sink)
+    try:
+        yield sink
+    finally:
+        _fallback_sink.reset(token)
+
+
+def measured_call(func: Callable, *args) -> Tuple[object, Dict]:
+    """
+    Run stage work and measure it where it runs
+
+    Executed on the stage worker, so CPU time and RSS belong to the work
+    rather than the API process. A worker process runs one call at a time,
+    so its whole CPU time counts (including Whisper/BLAS threads); on the
+    thread executor only the calling thread's is attributable.
+
+    Returns:
+        (func's result, usage dict for record_work)
+
+    Raises:
+        Whatever func raises, with the usage (and the fallbacks recorded
+        before the failure) attached as `work_usage`
+    """
+    in_worker_process = multiprocessing.parent_process() is not None
+    cpu_clock = time.process_time if in_worker_process else time.thread_time
+
+    def usage() -> Dict:
+        return {
+            "cpu_seconds": cpu_clock() - cpu_started,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "fallbacks": list(_work_local.fallbacks)
+        }
+
+    _work_local.fallbacks = []
+    cpu_started = cpu_clock()
+    try:
+        result = func(*args)
+        return result, usage()
+    except Exception as e:
+        # Pickled with the exception, so it survives the trip from a worker process
+        e.work_usage = usage()
+        raise
+    finally:
+        _work_local.fallbacks = None
+
+
+def record_work(default_stage: str, usage: Dict):
+    """Record usage returned by measured_call against the current stage"""
+    name = current_stage() or default_stage
+
+    STAGE_CPU_SECONDS.labels(name).observe(usage["cpu_seconds"])
+    if usage["peak_rss_bytes"] is not None:
+        STAGE_PEAK_RSS.labels(name).set(usage["peak_rss_bytes"])
+
+    timings = _timings.get()
+    if timings is not None:
+        timings.add_work(name, usage["cpu_seconds"], usage["peak_rss_bytes"])
+
+    for stage_name, reason in usage["fallbacks"]:
+        record_fallback(stage_name, reason)
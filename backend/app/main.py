@@ -3,14 +3,25 @@ FastAPI Main Application
 """
 
 from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import asyncio
 import os
 
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
 from app.core.config import settings
 from app.core.database import connect_to_mongo, close_mongo_connection
-from app.api.routes import analysis, mentors, health
+from app.api.routes import analysis, mentors, health, scoring
+from app.services.ai_pipeline.llm_cache import llm_cache
+from app.services.ai_pipeline.model_registry import model_registry
+from app.services.ai_pipeline.stage_runner import stage_runner
+from app.services.analysis.feature_matrix import feature_matrix
+from app.services.jobs.job_queue import job_queue
+from app.services.jobs.worker import AnalysisWorker
+from app.utils.upload_limit import UploadSizeLimitMiddleware
 
 
 @asynccontextmanager
@@ -27,9 +38,31 @@ async def lifespan(app: FastAPI):
     os.makedirs(f"{settings.UPLOAD_DIR}/temp", exist_ok=True)
     print("✅ Upload directories created")
     
+    await job_queue.ensure_indexes()
+    await llm_cache.ensure_indexes()
+    await feature_matrix.ensure_indexes()
+    
+    # Load models in the background, /api/health reports when they're ready
+    warm_up_task = None
+    if settings.PRELOAD_MODELS:
+        warm_up_task = asyncio.create_task(model_registry.warm_up())
+    
+    # Process queued analyses in this process too (set to 0 to use only
+    # standalone `python -m app.worker` processes)
+    worker = None
+    if settings.EMBEDDED_WORKER_CONCURRENCY > 0:
+        worker = AnalysisWorker(concurrency=settings.EMBEDDED_WORKER_CONCURRENCY)
+        worker.start()
+    
     yield
     
     # Shutdown
+    if worker is not None:
+        await worker.stop()
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+    model_registry.close()
+    stage_runner.shutdown()
     await close_mongo_connection()
     print("✅ Closed MongoDB connection")
 
@@ -42,6 +75,15 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Reject oversized uploads while they arrive, with some room for
+# multipart boundaries and form fields. Added before CORS so CORS wraps it
+# and the 413 still carries CORS headers for the browser
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limit=settings.MAX_FILE_SIZE + 1024 * 1024,
+    max_size=settings.MAX_FILE_SIZE
+)
+
 # CORS Middleware
 app.add_middleware(
     CORSMiddleware,
@@ -58,6 +100,7 @@ app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads"
 app.include_router(health.router, prefix="/api/health", tags=["Health"])
 app.include_router(analysis.router, prefix="/api/analysis", tags=["Analysis"])
 app.include_router(mentors.router, prefix="/api/mentors", tags=["Mentors"])
+app.include_router(scoring.router, prefix="/api/scoring", tags=["Scoring"])
 
 
 @app.get("/")
@@ -72,6 +115,12 @@ async def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: stage timings, outcomes and fallbacks of this process"""
+    return Response(generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -34,6 +34,22 @@ class Insights(BaseModel):
     key_highlights: Optional[str] = None
 
 
+class TranscriptSegment(BaseModel):
+    """Timestamped piece of the transcript"""
+    start: float
+    end: float
+    text: str
+
+
+class AnalysisProgress(BaseModel):
+    """Pipeline progress of an analysis"""
+    stage: str
+    percent: float = Field(ge=0, le=100)
+    eta_seconds: Optional[float] = None
+    stages: Dict[str, str] = {}
+    updated_at: Optional[datetime] = None
+
+
 class AnalysisBase(BaseModel):
     """Base analysis model"""
     mentor_id: str
@@ -52,9 +68,12 @@ class AnalysisInDB(AnalysisBase):
     """Analysis in database"""
     id: str = Field(alias="_id")
     status: AnalysisStatus = AnalysisStatus.PENDING
+    progress: Optional[AnalysisProgress] = None
     scores: Optional[Scores] = None
+    scoring_version: Optional[str] = None
     insights: Optional[Insights] = None
     transcript: Optional[str] = None
+    transcript_segments: Optional[List[TranscriptSegment]] = None
     
     # AI Pipeline Data
     audio_features: Optional[Dict] = None
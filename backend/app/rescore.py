@@ -0,0 +1,59 @@
+"""
+Bulk Rescoring
+Run with: python -m app.rescore [--all] [--batch-size N] [--limit N] [--dry-run]
+
+Rescores completed analyses from their stored features after a change
+to the scoring weights or rubric. No models are run.
+"""
+
+import argparse
+import asyncio
+
+from app.core.database import connect_to_mongo, close_mongo_connection
+from app.services.analysis.rescoring import Rescorer
+
+
+async def main(args: argparse.Namespace):
+    """Rescore and print a summary"""
+    await connect_to_mongo()
+
+    try:
+        rescorer = Rescorer(batch_size=args.batch_size, dry_run=args.dry_run)
+        stats = await rescorer.run(everything=args.all, limit=args.limit)
+    finally:
+        await close_mongo_connection()
+
+    action = "Would rescore" if args.dry_run else "Rescored"
+    print(
+        f"✅ {action} {stats['scanned']} analyses to scoring version {stats['scoring_version']} "
+        f"({stats['updated']} updated) in {stats['seconds']}s, {stats['per_second']}/s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rescore completed analyses from stored features")
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Also rescore analyses already at the current scoring version"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=2000,
+        help="Analyses scored and written per bulk_write"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Stop after this many analyses"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Score without writing anything"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
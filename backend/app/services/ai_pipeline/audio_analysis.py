@@ -5,82 +5,131 @@ Analyzes audio features using librosa and pydub
 
 import librosa
 import numpy as np
-import asyncio
-from functools import partial
-from typing import Dict
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import record_fallback
+from app.services.ai_pipeline.audio_decoder import DecodedAudio
+from app.services.ai_pipeline.audio_stats import LogHistogram, RunningStats
+from app.services.ai_pipeline.stage_runner import stage_runner
+from app.services.ai_pipeline.vad import pause_statistics
+
+# librosa >= 0.10 moved tempo estimation to librosa.feature.rhythm
+try:
+    from librosa.feature.rhythm import tempo as _tempo
+except ImportError:
+    _tempo = librosa.beat.tempo
 
 
 class AudioAnalyzer:
     """Analyze audio features from video"""
     
-    async def analyze(self, video_path: str) -> Dict:
+    # STFT geometry (librosa defaults)
+    N_FFT = 2048
+    HOP_LENGTH = 512
+    
+    # Pitch peak picking (librosa.piptrack defaults)
+    PITCH_FMIN = 150.0
+    PITCH_FMAX = 4000.0
+    PITCH_THRESHOLD = 0.1
+    
+    # Without VAD, frames below this RMS percentile count as pauses
+    PAUSE_PERCENTILE = 20
+    
+    def __init__(self, max_duration: Optional[float] = None, block_seconds: Optional[float] = None):
+        # Seconds of audio analyzed, 0 = the whole recording
+        self.max_duration = settings.AUDIO_ANALYSIS_MAX_SECONDS if max_duration is None else max_duration
+        self.block_seconds = block_seconds or settings.AUDIO_BLOCK_SECONDS
+    
+    async def analyze(self, audio: DecodedAudio, speech: Optional[List[Tuple[float, float]]] = None) -> Dict:
         """
         Analyze audio features
         
+        Args:
+            audio: Decoded audio shared by the pipeline
+            speech: Speech intervals from VAD, None if VAD didn't run
+            
         Returns:
             Dictionary of audio features
         """
-        loop = asyncio.get_event_loop()
-        
-        features = await loop.run_in_executor(
-            None,
-            self._extract_features,
-            video_path
-        )
-        
-        return features
+        # Run feature extraction in an audio worker (CPU-intensive)
+        return await stage_runner.run("audio", extract_audio_features, audio, speech)
     
-    def _extract_features(self, video_path: str) -> Dict:
-        """Extract audio features"""
+    def _extract_features(self, audio: DecodedAudio, speech: Optional[List[Tuple[float, float]]] = None) -> Dict:
+        """
+        Extract audio features block by block
+        
+        Each block gets one STFT; per-frame values are folded into running
+        accumulators and dropped, so memory stays flat however long the
+        recording is. A memory-mapped buffer is only paged in block by block.
+        """
         
         try:
-            # Load audio
-            y, sr = librosa.load(video_path, sr=22050, mono=True, duration=120)
+            # Features are rate-independent, so use the shared buffer as decoded
+            sr = audio.sample_rate
+            y = audio.samples
+            if self.max_duration:
+                y = y[:int(self.max_duration * sr)]
+            if len(y) == 0:
+                raise ValueError("no audio samples")
             
             # Duration
-            duration = librosa.get_duration(y=y, sr=sr)
+            duration = len(y) / sr if sr else 0
             
-            # Energy
-            energy = librosa.feature.rms(y=y)[0]
-            energy_mean = float(np.mean(energy))
-            energy_std = float(np.std(energy))
+            energy = RunningStats()
+            pitch = RunningStats()
+            rms_sketch = LogHistogram()
+            tempo_sum = 0.0
+            tempo_frames = 0
+            previous_db = None
             
-            # Pitch
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-            pitch_values = []
-            for t in range(pitches.shape[1]):
-                index = magnitudes[:, t].argmax()
-                pitch = pitches[index, t]
-                if pitch > 0:
-                    pitch_values.append(pitch)
+            for block in self._blocks(y, sr):
+                # One magnitude spectrogram shared by pitch and onsets
+                S = np.abs(librosa.stft(block, n_fft=self.N_FFT, hop_length=self.HOP_LENGTH, center=False))
+                
+                # Energy (time-domain frames, the spectrogram's Hann window would rescale it)
+                rms = librosa.feature.rms(
+                    y=block, frame_length=self.N_FFT, hop_length=self.HOP_LENGTH, center=False
+                )[0]
+                energy.update(rms)
+                rms_sketch.update(rms)
+                
+                # Pitch: strongest peak per frame, voiced frames only
+                frame_pitches = self._pitch_track(S, sr)
+                pitch.update(frame_pitches[frame_pitches > 0])
+                
+                # Speech rate estimation from the mel onset envelope, weighted by block length
+                mel_db = librosa.power_to_db(librosa.feature.melspectrogram(S=S ** 2, sr=sr))
+                onset_env, previous_db = self._onset_envelope(mel_db, previous_db)
+                tempo = _tempo(onset_envelope=onset_env, sr=sr, hop_length=self.HOP_LENGTH)[0]
+                tempo_sum += float(tempo) * onset_env.size
+                tempo_frames += onset_env.size
             
-            pitch_mean = float(np.mean(pitch_values)) if pitch_values else 0
-            pitch_std = float(np.std(pitch_values)) if pitch_values else 0
+            speech_rate = (tempo_sum / tempo_frames if tempo_frames else 0) * 1.5
             
-            # Speech rate estimation
-            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-            tempo = librosa.beat.tempo(onset_envelope=onset_env, sr=sr)[0]
-            speech_rate = tempo * 1.5
-            
-            # Pause detection
-            rms = librosa.feature.rms(y=y)[0]
-            threshold = np.percentile(rms, 20)
-            silent_frames = np.sum(rms < threshold)
-            pause_ratio = silent_frames / len(rms)
-            
-            return {
+            features = {
                 "duration": duration,
-                "energy_mean": energy_mean,
-                "energy_std": energy_std,
-                "pitch_mean": pitch_mean,
-                "pitch_std": pitch_std,
+                "energy_mean": energy.mean,
+                "energy_std": energy.std,
+                "pitch_mean": pitch.mean,
+                "pitch_std": pitch.std,
                 "speech_rate": speech_rate,
-                "pause_ratio": pause_ratio,
                 "sample_rate": sr
             }
             
+            # Pause detection
+            if speech is not None:
+                # Same speech intervals Whisper was given
+                analysed = [(s, min(e, duration)) for s, e in speech if s < duration]
+                features.update(pause_statistics(analysed, duration))
+            else:
+                threshold = rms_sketch.quantile(self.PAUSE_PERCENTILE / 100)
+                features["pause_ratio"] = rms_sketch.fraction_below(threshold)
+            
+            return features
+            
         except Exception as e:
             print(f"Audio analysis error: {e}")
+            record_fallback("audio", "default_features")
             return {
                 "duration": 0,
                 "energy_mean": 0.5,
@@ -89,5 +138,95 @@ class AudioAnalyzer:
                 "pitch_std": 50,
                 "speech_rate": 150,
                 "pause_ratio": 0.15,
-                "sample_rate": 22050
-            }
\ No newline at end of file
+                "sample_rate": settings.AUDIO_SAMPLE_RATE
+            }
+    
+    def _blocks(self, y: np.ndarray, sr: int) -> Iterator[np.ndarray]:
+        """
+        Split samples into blocks of whole, contiguous STFT frames
+        
+        Consecutive blocks overlap by N_FFT - HOP_LENGTH samples so their
+        frames line up exactly with one uncentered STFT over the whole
+        signal. A short tail is merged into the last block rather than
+        analysed on its own.
+        """
+        hop = self.HOP_LENGTH
+        frames_total = 1 + (len(y) - self.N_FFT) // hop if len(y) >= self.N_FFT else 0
+        
+        if frames_total == 0:
+            # Shorter than one frame, analyse it zero-padded
+            if len(y):
+                yield np.pad(np.asarray(y, dtype=np.float32), (0, self.N_FFT - len(y)))
+            return
+        
+        block_frames = max(1, int(self.block_seconds * sr / hop))
+        start = 0
+        while start < frames_total:
+            count = block_frames
+            if frames_total - (start + count) < block_frames // 2:
+                count = frames_total - start
+            
+            first = start * hop
+            last = (start + count - 1) * hop + self.N_FFT
+            yield np.ascontiguousarray(y[first:last], dtype=np.float32)
+            start += count
+    
+    def _onset_envelope(self, mel_db: np.ndarray, previous_db: Optional[np.ndarray]):
+        """
+        Spectral flux onset strength (librosa's default: mean positive
+        first difference of the log-mel spectrogram), continued across blocks
+        
+        Returns:
+            Onset envelope for the block and its last mel column for the next block
+        """
+        if previous_db is None:
+            previous_db = mel_db[:, :1]
+        flux = np.diff(np.concatenate([previous_db, mel_db], axis=1), axis=1)
+        onset_env = np.maximum(0.0, flux).mean(axis=0)
+        return onset_env, mel_db[:, -1:]
+    
+    def _pitch_track(self, S: np.ndarray, sr: int) -> np.ndarray:
+        """
+        Pitch of the strongest spectral peak in each frame
+        
+        Same peaks and parabolic interpolation as librosa.piptrack, but only
+        the bins inside [PITCH_FMIN, PITCH_FMAX) are processed and the
+        per-frame pick is one argmax over the frequency axis.
+        
+        Args:
+            S: Magnitude spectrogram (bins x frames)
+            sr: Sample rate
+            
+        Returns:
+            Pitch in Hz per frame, 0 where no peak was found
+        """
+        n_frames = S.shape[1]
+        freqs = librosa.fft_frequencies(sr=sr, n_fft=self.N_FFT)
+        band = np.flatnonzero((freqs >= self.PITCH_FMIN) & (freqs < min(self.PITCH_FMAX, sr / 2)))
+        if band.size == 0 or n_frames == 0:
+            return np.zeros(n_frames)
+        
+        # fmin > 0 and fmax <= Nyquist keep every band bin's neighbours in range
+        lo, hi = int(band[0]), int(band[-1]) + 1
+        below, centre, above = S[lo - 1:hi - 1], S[lo:hi], S[lo + 1:hi + 1]
+        
+        # Parabolic interpolation, no shift if the vertex is over a bin away
+        slope = (above - below) / 2
+        curvature = above + below - 2 * centre
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shift = np.where(np.abs(slope) < np.abs(curvature), -slope / curvature, 0)
+        
+        # Local maxima of the thresholded spectrum
+        gated = S * (S > self.PITCH_THRESHOLD * S.max(axis=0, keepdims=True))
+        peaks = (gated[lo:hi] > gated[lo - 1:hi - 1]) & (gated[lo:hi] >= gated[lo + 1:hi + 1])
+        magnitudes = np.where(peaks, centre + 0.5 * slope * shift, 0)
+        
+        frames = np.arange(n_frames)
+        strongest = magnitudes.argmax(axis=0)
+        pitch = (lo + strongest + shift[strongest, frames]) * sr / self.N_FFT
+        return np.where(magnitudes[strongest, frames] > 0, pitch, 0.0)
+
+
+def extract_audio_features(audio: DecodedAudio, speech: Optional[List[Tuple[float, float]]] = None) -> Dict:
+    """Stage entry point, runs inside an audio worker"""
+    return AudioAnalyzer()._extract_features(audio, speech)
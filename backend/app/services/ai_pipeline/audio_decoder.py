@@ -0,0 +1,147 @@
+"""
+Audio Decoding Service
+Decodes the audio track of a video once with ffmpeg into a shared PCM buffer
+"""
+
+import asyncio
+import os
+import subprocess
+import uuid
+import numpy as np
+from typing import Optional
+from app.core.config import settings
+
+
+class DecodedAudio:
+    """
+    Mono float32 PCM buffer shared by every audio stage
+
+    When backed by a file the samples are memory-mapped, and pickling only
+    sends the path, so worker processes map the same pages instead of
+    receiving a copy of the whole buffer.
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int, path: Optional[str] = None):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.path = path
+
+    @classmethod
+    def from_file(cls, path: str, sample_rate: int) -> "DecodedAudio":
+        """Memory-map raw float32 PCM written by ffmpeg"""
+        if os.path.getsize(path) == 0:
+            samples = np.zeros(0, dtype=np.float32)
+        else:
+            samples = np.memmap(path, dtype=np.float32, mode="r")
+        return cls(samples, sample_rate, path)
+
+    def __getstate__(self):
+        if self.path is not None:
+            return {"path": self.path, "sample_rate": self.sample_rate}
+        return {"samples": self.samples, "sample_rate": self.sample_rate}
+
+    def __setstate__(self, state):
+        if "path" in state:
+            other = DecodedAudio.from_file(state["path"], state["sample_rate"])
+            self.__dict__.update(other.__dict__)
+        else:
+            self.__init__(state["samples"], state["sample_rate"])
+
+    @property
+    def duration(self) -> float:
+        """Duration of the buffer in seconds"""
+        if not self.sample_rate:
+            return 0.0
+        return len(self.samples) / self.sample_rate
+
+    def resampled(self, target_sr: int) -> np.ndarray:
+        """
+        Get samples at the requested rate
+
+        Only resamples when a stage really needs a different rate,
+        otherwise the shared buffer is returned as-is (no copy).
+        """
+        if target_sr == self.sample_rate:
+            return self.samples
+
+        import librosa
+        return librosa.resample(
+            np.asarray(self.samples),
+            orig_sr=self.sample_rate,
+            target_sr=target_sr
+        )
+
+    def release(self):
+        """Drop the buffer and delete its backing file, if any"""
+        self.samples = np.zeros(0, dtype=np.float32)
+        if self.path is not None and os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                print(f"Error deleting decoded audio {self.path}: {e}")
+        self.path = None
+
+
+class AudioDecoder:
+    """Decode video audio with a single ffmpeg pass"""
+
+    def __init__(self, sample_rate: int = None, spill_dir: Optional[str] = None):
+        """
+        Args:
+            sample_rate: Output rate, defaults to AUDIO_SAMPLE_RATE
+            spill_dir: If set, PCM is written to a file here and memory-mapped
+        """
+        self.sample_rate = sample_rate or settings.AUDIO_SAMPLE_RATE
+        self.spill_dir = spill_dir
+
+    async def decode(self, video_path: str) -> DecodedAudio:
+        """
+        Decode the audio track of a video
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            Decoded mono float32 audio at the configured sample rate
+        """
+        loop = asyncio.get_event_loop()
+
+        return await loop.run_in_executor(
+            None,
+            self._decode,
+            video_path
+        )
+
+    def _decode(self, video_path: str) -> DecodedAudio:
+        """Run ffmpeg and read raw float32 PCM from its output"""
+        output = "-"
+        if self.spill_dir is not None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            output = os.path.join(self.spill_dir, f"{uuid.uuid4()}.f32")
+
+        cmd = [
+            settings.FFMPEG_BINARY,
+            "-nostdin",
+            "-threads", "0",
+            "-y",
+            "-i", video_path,
+            "-vn",
+            "-f", "f32le",
+            "-acodec", "pcm_f32le",
+            "-ac", "1",
+            "-ar", str(self.sample_rate),
+            output
+        ]
+
+        try:
+            out = subprocess.run(cmd, capture_output=True, check=True).stdout
+        except subprocess.CalledProcessError as e:
+            if output != "-" and os.path.exists(output):
+                os.remove(output)
+            raise RuntimeError(f"Failed to decode audio: {e.stderr.decode(errors='ignore')[-500:]}") from e
+
+        if output != "-":
+            return DecodedAudio.from_file(output, self.sample_rate)
+
+        samples = np.frombuffer(out, dtype=np.float32)
+        return DecodedAudio(samples, self.sample_rate)
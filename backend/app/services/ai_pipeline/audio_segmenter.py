@@ -0,0 +1,164 @@
+"""
+Audio Segmenter
+Splits long recordings at quiet points into bounded segments for parallel transcription
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+# Energy frame length in seconds
+FRAME_SECONDS = 0.03
+
+# Cut points are chosen on energy smoothed over this many seconds,
+# so a cut lands in a pause rather than between two syllables
+SMOOTHING_SECONDS = 0.3
+
+# Frames per block when computing energy over a memory-mapped buffer
+ENERGY_BLOCK_FRAMES = 8192
+
+
+def frame_energy(samples: np.ndarray, sr: int, frame_seconds: float = FRAME_SECONDS) -> np.ndarray:
+    """
+    RMS of consecutive non-overlapping frames
+
+    Computed block by block, so a memory-mapped buffer is paged in gradually.
+
+    Args:
+        samples: Mono PCM
+        sr: Sample rate
+        frame_seconds: Frame length
+
+    Returns:
+        RMS per frame
+    """
+    frame = max(1, int(sr * frame_seconds))
+    n_frames = len(samples) // frame
+    energy = np.empty(n_frames, dtype=np.float32)
+
+    for first in range(0, n_frames, ENERGY_BLOCK_FRAMES):
+        last = min(n_frames, first + ENERGY_BLOCK_FRAMES)
+        block = np.asarray(samples[first * frame:last * frame], dtype=np.float32).reshape(-1, frame)
+        energy[first:last] = np.sqrt(np.mean(block ** 2, axis=1))
+
+    return energy
+
+
+def split_at_silences(
+    energy: np.ndarray,
+    frame_seconds: float,
+    max_seconds: float,
+    min_seconds: float,
+    start: float = 0.0,
+    end: float = None
+) -> List[Tuple[float, float]]:
+    """
+    Cut [start, end) into segments no longer than max_seconds
+
+    Each cut goes at the quietest point between min_seconds and max_seconds
+    after the previous one.
+
+    Args:
+        energy: Frame RMS from frame_energy
+        frame_seconds: Frame length used for energy
+        max_seconds: Longest allowed segment
+        min_seconds: Shortest segment before the last one
+        start: Range start in seconds
+        end: Range end in seconds, defaults to the end of energy
+
+    Returns:
+        (start, end) pairs in seconds, in order, covering the range
+    """
+    if end is None:
+        end = len(energy) * frame_seconds
+
+    smooth = max(1, int(SMOOTHING_SECONDS / frame_seconds))
+    kernel = np.ones(smooth, dtype=np.float32) / smooth
+
+    segments = []
+    position = start
+    while end - position > max_seconds:
+        lo = int((position + min_seconds) / frame_seconds)
+        hi = min(len(energy), int((position + max_seconds) / frame_seconds))
+
+        if hi - lo < smooth:
+            cut = position + max_seconds
+        else:
+            window = np.convolve(energy[lo:hi], kernel, mode="valid")
+            cut = (lo + int(np.argmin(window)) + smooth // 2) * frame_seconds
+
+        segments.append((position, cut))
+        position = cut
+
+    if end > position:
+        segments.append((position, end))
+
+    return segments
+
+
+def plan_segments(samples: np.ndarray, sr: int, max_seconds: float) -> List[Tuple[float, float]]:
+    """
+    Segment a whole recording for transcription
+
+    Args:
+        samples: Mono PCM
+        sr: Sample rate
+        max_seconds: Longest allowed segment
+
+    Returns:
+        (start, end) pairs in seconds
+    """
+    duration = len(samples) / sr if sr else 0
+    if duration <= max_seconds:
+        return [(0.0, duration)] if duration > 0 else []
+
+    energy = frame_energy(samples, sr)
+    return split_at_silences(energy, FRAME_SECONDS, max_seconds, max_seconds / 2, end=duration)
+
+
+def pack_speech(
+    intervals: List[Tuple[float, float]],
+    samples: np.ndarray,
+    sr: int,
+    max_seconds: float
+) -> List[List[Tuple[float, float]]]:
+    """
+    Group speech intervals into transcription segments
+
+    Consecutive intervals are packed until their speech adds up to
+    max_seconds; intervals longer than that are first cut at quiet points.
+
+    Args:
+        intervals: Speech (start, end) pairs in seconds, sorted
+        samples: Mono PCM, used to cut overlong intervals
+        sr: Sample rate
+        max_seconds: Most speech per segment
+
+    Returns:
+        Segments, each a list of speech intervals
+    """
+    pieces = []
+    for start, end in intervals:
+        if end - start <= max_seconds:
+            pieces.append((start, end))
+            continue
+
+        offset = int(start / FRAME_SECONDS) * FRAME_SECONDS
+        energy = frame_energy(samples[int(offset * sr):int(end * sr)], sr)
+        for s, e in split_at_silences(energy, FRAME_SECONDS, max_seconds, max_seconds / 2,
+                                      start=start - offset, end=end - offset):
+            pieces.append((s + offset, e + offset))
+
+    segments = []
+    current, current_seconds = [], 0.0
+    for start, end in pieces:
+        if current and current_seconds + (end - start) > max_seconds:
+            segments.append(current)
+            current, current_seconds = [], 0.0
+        current.append((start, end))
+        current_seconds += end - start
+
+    if current:
+        segments.append(current)
+
+    return segments
@@ -0,0 +1,104 @@
+"""
+Streaming Audio Statistics
+Constant-memory accumulators for block-wise audio analysis
+"""
+
+import numpy as np
+
+
+class RunningStats:
+    """Mean and standard deviation over batches of values (Welford/Chan merge)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values: np.ndarray):
+        """Fold a batch of values into the running moments"""
+        values = np.asarray(values, dtype=np.float64)
+        n = values.size
+        if n == 0:
+            return
+
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += batch_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation, like np.std"""
+        if self.count == 0:
+            return 0.0
+        return float(np.sqrt(self.m2 / self.count))
+
+
+class LogHistogram:
+    """
+    Quantile sketch for non-negative values such as frame RMS
+
+    Values are counted in log-spaced bins (plus one bin for zeros), so
+    quantiles are accurate to a fraction of a bin's width while memory is
+    fixed no matter how many values are added.
+    """
+
+    def __init__(self, low: float = 1e-6, high: float = 10.0, bins: int = 2048):
+        self.edges = np.geomspace(low, high, bins + 1)
+        self.zeros = 0
+        self.counts = np.zeros(bins + 2, dtype=np.int64)  # underflow, bins, overflow
+        self.total = 0
+
+    def update(self, values: np.ndarray):
+        """Count a batch of values"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+
+        positive = values[values > 0]
+        self.zeros += values.size - positive.size
+        indices = np.searchsorted(self.edges, positive, side="right")
+        self.counts += np.bincount(indices, minlength=self.counts.size)
+        self.total += values.size
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile (0-1), interpolated geometrically within a bin"""
+        if self.total == 0:
+            return 0.0
+
+        rank = q * (self.total - 1)
+        if rank < self.zeros:
+            return 0.0
+
+        cumulative = self.zeros + np.cumsum(self.counts)
+        index = int(np.searchsorted(cumulative, rank, side="right"))
+        index = min(index, self.counts.size - 1)
+
+        if index == 0:
+            return float(self.edges[0])
+        if index == self.counts.size - 1:
+            return float(self.edges[-1])
+
+        low, high = self.edges[index - 1], self.edges[index]
+        before = cumulative[index - 1] if index > 0 else self.zeros
+        fraction = (rank - before) / max(1, self.counts[index])
+        return float(low * (high / low) ** min(1.0, max(0.0, fraction)))
+
+    def fraction_below(self, threshold: float) -> float:
+        """Approximate share of values strictly below threshold"""
+        if self.total == 0 or threshold <= 0:
+            return 0.0
+
+        index = int(np.searchsorted(self.edges, threshold, side="right"))
+        below = self.zeros + int(self.counts[:index].sum())
+
+        # Part of the bin the threshold falls in, assuming log-uniform spread
+        if 0 < index < self.counts.size - 1:
+            low, high = self.edges[index - 1], self.edges[index]
+            below += self.counts[index] * np.log(threshold / low) / np.log(high / low)
+
+        return float(below / self.total)
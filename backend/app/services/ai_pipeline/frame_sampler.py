@@ -0,0 +1,238 @@
+"""
+Frame Sampling Service
+Reads frames at target timestamps instead of decoding every frame
+"""
+
+import json
+import math
+import subprocess
+import cv2
+import numpy as np
+from typing import Iterator, List, Optional, Tuple
+from app.core.config import settings
+
+
+def probe_duration(video_path: str) -> Optional[float]:
+    """
+    Container duration from ffprobe, without decoding any frames
+
+    Args:
+        video_path: Path to video file
+
+    Returns:
+        Duration in seconds, or None if ffprobe can't tell
+    """
+    cmd = [
+        settings.FFPROBE_BINARY,
+        "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "json",
+        video_path
+    ]
+
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True, timeout=30).stdout
+        duration = float(json.loads(out)["format"]["duration"])
+    except (OSError, subprocess.SubprocessError, ValueError, KeyError, TypeError) as e:
+        print(f"⚠️ Could not probe duration of {video_path}: {e}")
+        return None
+
+    return duration if duration > 0 else None
+
+
+class FrameSampler:
+    """
+    Pull frames at chosen timestamps from an opened video
+
+    Short gaps are skipped with grab() (no retrieve/colour conversion),
+    long gaps use a container seek so skipped frames are never decoded.
+    `frames_requested` counts grab()/read() calls only: a seek also decodes
+    from the previous keyframe, which OpenCV doesn't report.
+    """
+
+    def __init__(
+        self,
+        cap: cv2.VideoCapture,
+        seek_threshold_seconds: float = None,
+        duration: Optional[float] = None
+    ):
+        """
+        Args:
+            cap: Opened video
+            seek_threshold_seconds: Gaps longer than this are seeked over
+            duration: Known duration in seconds, used when the header has
+                no frame count (common for webm/mkv)
+        """
+        self.cap = cap
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        self.total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if self.total_frames <= 0 and duration and self.fps > 0:
+            self.total_frames = int(duration * self.fps)
+
+        if seek_threshold_seconds is None:
+            seek_threshold_seconds = settings.VISUAL_SEEK_THRESHOLD_SECONDS
+        self.seek_threshold = max(1, int(seek_threshold_seconds * self.fps))
+
+        # Index of the frame the decoder returns next
+        self.position = 0
+
+        # Stats
+        self.frames_requested = 0
+        self.seeks = 0
+
+    @property
+    def duration(self) -> float:
+        """Video duration in seconds"""
+        if self.fps <= 0:
+            return 0.0
+        return self.total_frames / self.fps
+
+    def read_at(self, timestamp: float) -> Optional[np.ndarray]:
+        """
+        Read the frame shown at a timestamp
+
+        Args:
+            timestamp: Time in seconds
+
+        Returns:
+            BGR frame, or None if it can't be read
+        """
+        target = int(round(timestamp * self.fps))
+        if self.total_frames > 0:
+            target = min(target, self.total_frames - 1)
+
+        gap = target - self.position
+
+        if gap < 0 or gap > self.seek_threshold:
+            # Jump to the nearest keyframe instead of decoding the gap
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+            self.position = target
+            self.seeks += 1
+        else:
+            while self.position < target:
+                if not self.cap.grab():
+                    return None
+                self.position += 1
+                self.frames_requested += 1
+
+        ret, frame = self.cap.read()
+        if not ret:
+            return None
+
+        self.position += 1
+        self.frames_requested += 1
+        return frame
+
+    def frames(self, timestamps: List[float]) -> Iterator[Tuple[float, np.ndarray]]:
+        """Yield (timestamp, frame) for each readable timestamp, in order"""
+        for timestamp in sorted(timestamps):
+            frame = self.read_at(timestamp)
+            if frame is not None:
+                yield timestamp, frame
+
+
+class SamplingPlanner:
+    """
+    Plan which timestamps to analyse across the whole video
+
+    The sample budget grows with the square root of the duration, is spread
+    over equal strata covering the full video, and scene changes found
+    between neighbouring samples get extra samples around them.
+    """
+
+    # Thumbnail size for scene change signatures
+    SIGNATURE_SIZE = (32, 18)
+
+    def __init__(
+        self,
+        samples_per_minute: int = None,
+        min_samples: int = None,
+        max_samples: int = None,
+        min_interval: float = None,
+        scene_threshold: float = None,
+        scene_extra_ratio: float = None
+    ):
+        # Explicit zeros are kept, only None falls back to the settings
+        self.samples_per_minute = settings.VISUAL_SAMPLES_PER_MINUTE if samples_per_minute is None else samples_per_minute
+        self.min_samples = settings.VISUAL_MIN_SAMPLES if min_samples is None else min_samples
+        self.max_samples = settings.VISUAL_MAX_SAMPLES if max_samples is None else max_samples
+        self.min_interval = settings.VISUAL_MIN_SAMPLE_INTERVAL if min_interval is None else min_interval
+        self.scene_threshold = settings.VISUAL_SCENE_CHANGE_THRESHOLD if scene_threshold is None else scene_threshold
+        self.scene_extra_ratio = settings.VISUAL_SCENE_EXTRA_RATIO if scene_extra_ratio is None else scene_extra_ratio
+
+    def budget(self, duration: float) -> int:
+        """
+        Number of stratified samples for a video
+
+        Args:
+            duration: Video duration in seconds
+
+        Returns:
+            Sample budget (sub-linear in duration, never denser than min_interval)
+        """
+        if duration <= 0:
+            return 0
+
+        minutes = duration / 60
+        budget = int(round(self.samples_per_minute * math.sqrt(minutes)))
+        budget = min(self.max_samples, max(self.min_samples, budget))
+
+        if self.min_interval > 0:
+            budget = min(budget, int(duration / self.min_interval))
+        return max(1, budget)
+
+    def plan(self, duration: float) -> List[float]:
+        """
+        Stratified sample timestamps covering the whole video
+
+        Args:
+            duration: Video duration in seconds
+
+        Returns:
+            One timestamp at the centre of each of `budget` equal strata
+        """
+        count = self.budget(duration)
+        if count == 0:
+            return []
+
+        stratum = duration / count
+        return [(i + 0.5) * stratum for i in range(count)]
+
+    def signature(self, frame: np.ndarray) -> np.ndarray:
+        """Small grayscale thumbnail used to compare frames"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(gray, self.SIGNATURE_SIZE, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    def scene_change_samples(self, signatures: List[Tuple[float, np.ndarray]]) -> List[float]:
+        """
+        Extra timestamps around scene changes
+
+        Args:
+            signatures: (timestamp, signature) of the stratified samples, in order
+
+        Returns:
+            Timestamps inside gaps whose endpoints look like different scenes,
+            limited to scene_extra_ratio of the stratified budget
+        """
+        limit = int(len(signatures) * self.scene_extra_ratio)
+        if limit == 0:
+            return []
+
+        changes = []
+        for (t1, sig1), (t2, sig2) in zip(signatures, signatures[1:]):
+            distance = float(np.mean(np.abs(sig1 - sig2))) / 255
+            if distance > self.scene_threshold and t2 - t1 > 2 * self.min_interval:
+                changes.append((distance, t1, t2))
+
+        # Biggest changes first when over the limit
+        changes.sort(reverse=True)
+
+        extra = []
+        for _, t1, t2 in changes:
+            if len(extra) >= limit:
+                break
+            # Bracket the change with samples at 1/3 and 2/3 of the gap
+            gap = t2 - t1
+            extra.extend([t1 + gap / 3, t1 + 2 * gap / 3])
+
+        return sorted(extra[:limit])
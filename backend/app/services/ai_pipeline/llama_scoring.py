@@ -3,64 +3,242 @@ LLaMA NLP Scoring Service
 Uses LLaMA 3.1 via Ollama for NLP analysis
 """
 
-import ollama
 import asyncio
+import json
 import re
-from typing import Dict
+import uuid
+from typing import Callable, Dict, List, Optional
+from pydantic import BaseModel, ValidationError, field_validator
 from app.core.config import settings
+from app.core.metrics import record_fallback
+from app.services.ai_pipeline.llm_cache import llm_cache
+from app.services.ai_pipeline.model_registry import model_registry
+from app.services.ai_pipeline.term_matcher import term_analysis
+from app.services.ai_pipeline.transcript_chunker import estimate_tokens, split_transcript
+
+
+class RubricScores(BaseModel):
+    """Schema for the combined rubric response, invalid fields become None"""
+    technical_depth: Optional[float] = None
+    clarity: Optional[float] = None
+    structure: Optional[float] = None
+    
+    @field_validator("technical_depth", "clarity", "structure", mode="before")
+    @classmethod
+    def parse_score(cls, value):
+        try:
+            score = float(value)
+        except (TypeError, ValueError):
+            return None
+        if score != score:  # NaN
+            return None
+        return min(1.0, max(0.0, score))
 
 
 class LlamaScorer:
     """Analyze transcript using LLaMA 3.1"""
     
+    # Per-field fallbacks when the model gives no usable score
+    DEFAULT_SCORES = {
+        "technical_depth": 0.6,
+        "clarity": 0.7,
+        "structure": 0.65
+    }
+    
     def __init__(self):
         self.model = settings.OLLAMA_MODEL
-        self.client = ollama.AsyncClient(host=settings.OLLAMA_BASE_URL)
+        self.gateway = model_registry.get_llm_gateway()
+        
+        # Fairness key for the gateway queue, one per analysis
+        self.owner = uuid.uuid4().hex
     
-    async def analyze_transcript(self, transcript: str) -> Dict:
+    async def analyze_transcript(self, transcript: str, subject: Optional[str] = None) -> Dict:
         """
         Analyze transcript for technical depth, clarity, etc.
         
         Args:
             transcript: Transcribed text
+            subject: Analysis subject, picks the technical vocabulary
             
         Returns:
             NLP analysis results
         """
         
         if not transcript or len(transcript) < 50:
+            record_fallback("nlp", "short_transcript")
             return self._default_analysis()
         
         try:
-            # Analyze different aspects
-            tasks = [
-                self._analyze_technical_depth(transcript),
-                self._analyze_clarity(transcript),
-                self._analyze_structure(transcript)
-            ]
+            if settings.LLM_TRANSCRIPT_MODE == "chunked":
+                # Score the whole transcript window by window
+                windows = split_transcript(transcript, settings.LLM_CHUNK_TOKENS)
+                rubric = await self._score_windows(windows)
+            else:
+                # Score only the opening excerpt
+                windows = [transcript[:1000]]
+                rubric = await self._score_excerpt(windows[0])
             
-            technical, clarity, structure = await asyncio.gather(*tasks)
+            technical = rubric["technical_depth"]
+            clarity = rubric["clarity"]
+            structure = rubric["structure"]
             
             # Count questions
             question_count = len(re.findall(r'\?', transcript))
             
-            # Count technical terms
-            technical_terms = self._count_technical_terms(transcript)
-            
-            return {
+            analysis = {
                 "technical_depth_score": technical,
                 "clarity_score": clarity,
                 "structure_score": structure,
                 "question_count": question_count,
-                "technical_term_count": technical_terms,
-                "word_count": len(transcript.split())
+                "word_count": len(transcript.split()),
+                "llm_scoring_mode": settings.LLM_SCORING_MODE,
+                "llm_transcript_mode": settings.LLM_TRANSCRIPT_MODE,
+                "chunk_count": len(windows)
             }
             
+            # Count technical terms from the subject's vocabulary
+            analysis.update(term_analysis(transcript, subject))
+            
+            return analysis
+            
         except Exception as e:
             print(f"LLaMA analysis error: {e}")
+            record_fallback("nlp", "default_analysis")
             return self._default_analysis()
     
-    async def _analyze_technical_depth(self, transcript: str) -> float:
+    async def _score_excerpt(self, excerpt: str) -> Dict[str, float]:
+        """Score one piece of transcript on every rubric aspect"""
+        if settings.LLM_SCORING_MODE == "separate":
+            # One request per aspect
+            tasks = [
+                self._analyze_technical_depth(excerpt),
+                self._analyze_clarity(excerpt),
+                self._analyze_structure(excerpt)
+            ]
+            
+            technical, clarity, structure = await asyncio.gather(*tasks)
+            return {
+                "technical_depth": technical,
+                "clarity": clarity,
+                "structure": structure
+            }
+        
+        # All aspects from one JSON response
+        return await self._analyze_combined(excerpt)
+    
+    async def _score_windows(self, windows: List[str]) -> Dict[str, float]:
+        """
+        Map-reduce scoring over transcript windows
+        
+        Windows are scored concurrently (at most LLM_CHUNK_CONCURRENCY at a
+        time) and combined with weights proportional to window length.
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.LLM_CHUNK_CONCURRENCY))
+        
+        async def score(window: str) -> Dict[str, float]:
+            async with semaphore:
+                return await self._score_excerpt(window)
+        
+        window_scores = await asyncio.gather(*[score(w) for w in windows])
+        weights = [max(1, estimate_tokens(w)) for w in windows]
+        total = sum(weights)
+        
+        return {
+            field: sum(scores[field] * weight for scores, weight in zip(window_scores, weights)) / total
+            for field in self.DEFAULT_SCORES
+        }
+    
+    async def _generate(
+        self,
+        prompt: str,
+        options: Dict,
+        format: str = '',
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """
+        Send one generate request to Ollama and return the response text
+        
+        Responses are served from the LLM cache when possible. A fresh
+        response is only cached if `validate` accepts it, so an unparseable
+        answer gets another try next time.
+        """
+        key = llm_cache.key(self.model, prompt, options, format)
+        cached = await llm_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        text = await self.gateway.generate(
+            self.model,
+            prompt,
+            options,
+            format=format,
+            owner=self.owner
+        )
+        
+        if validate is None or validate(text):
+            await llm_cache.put(key, text, self.model)
+        
+        return text
+    
+    @staticmethod
+    def _has_score(text: str) -> bool:
+        """Whether a single-score response contains a score"""
+        return bool(re.findall(r'0\.\d+|1\.0', text))
+    
+    @staticmethod
+    def _has_rubric_scores(text: str) -> bool:
+        """Whether a combined response is a JSON object with all three scores"""
+        try:
+            data = json.loads(text)
+            if not isinstance(data, dict):
+                return False
+            scores = RubricScores(**data)
+        except (ValueError, ValidationError):
+            return False
+        return all(value is not None for value in scores.model_dump().values())
+    
+    async def _analyze_combined(self, excerpt: str) -> Dict[str, float]:
+        """Score technical depth, clarity and structure in one request"""
+        
+        prompt = f"""Analyze the following teaching transcript and rate it on three aspects,
+each on a scale of 0.0 to 1.0:
+
+- technical_depth: 0.0-0.3 very basic, no technical content; 0.4-0.6 moderate technical content; 0.7-1.0 deep technical content with detailed explanations
+- clarity: 0.0-0.3 confusing, unclear; 0.4-0.6 moderately clear; 0.7-1.0 very clear and well-structured
+- structure: 0.0-0.3 poorly organized; 0.4-0.6 moderately organized; 0.7-1.0 well-organized with clear flow
+
+Respond with ONLY a JSON object like {{"technical_depth": 0.0, "clarity": 0.0, "structure": 0.0}}.
+
+Transcript: {excerpt}"""
+        
+        scores = RubricScores()
+        try:
+            response = await self._generate(
+                prompt,
+                options={'temperature': 0.3, 'num_predict': 60},
+                format='json',
+                validate=self._has_rubric_scores
+            )
+            data = json.loads(response)
+            if isinstance(data, dict):
+                scores = RubricScores(**data)
+        except (ValueError, ValidationError) as e:
+            print(f"LLaMA rubric parse error: {e}")
+        except Exception as e:
+            print(f"LLaMA rubric request error: {e}")
+        
+        # Fall back per field, one bad value doesn't discard the others
+        values = scores.model_dump()
+        for field, value in values.items():
+            if value is None:
+                record_fallback("llm", f"default_{field}")
+        
+        return {
+            field: value if value is not None else self.DEFAULT_SCORES[field]
+            for field, value in values.items()
+        }
+    
+    async def _analyze_technical_depth(self, excerpt: str) -> float:
         """Analyze technical depth using LLaMA"""
         
         prompt = f"""Analyze the following teaching transcript for technical depth.
@@ -71,25 +249,26 @@ Rate the technical depth on a scale of 0.0 to 1.0, where:
 
 Respond with ONLY a number between 0.0 and 1.0.
 
-Transcript: {transcript[:1000]}
+Transcript: {excerpt}
 
 Technical Depth Score:"""
         
         try:
-            response = await self.client.generate(
-                model=self.model,
-                prompt=prompt,
-                options={'temperature': 0.3, 'num_predict': 10}
+            response = await self._generate(
+                prompt,
+                options={'temperature': 0.3, 'num_predict': 10},
+                validate=self._has_score
             )
             
-            score_text = response['response'].strip()
+            score_text = response.strip()
             score = float(re.findall(r'0\.\d+|1\.0', score_text)[0])
             return min(1.0, max(0.0, score))
             
         except:
-            return 0.6
+            record_fallback("llm", "default_technical_depth")
+            return self.DEFAULT_SCORES["technical_depth"]
     
-    async def _analyze_clarity(self, transcript: str) -> float:
+    async def _analyze_clarity(self, excerpt: str) -> float:
         """Analyze clarity using LLaMA"""
         
         prompt = f"""Analyze the following teaching transcript for clarity of explanation.
@@ -100,25 +279,26 @@ Rate the clarity on a scale of 0.0 to 1.0, where:
 
 Respond with ONLY a number between 0.0 and 1.0.
 
-Transcript: {transcript[:1000]}
+Transcript: {excerpt}
 
 Clarity Score:"""
         
         try:
-            response = await self.client.generate(
-                model=self.model,
-                prompt=prompt,
-                options={'temperature': 0.3, 'num_predict': 10}
+            response = await self._generate(
+                prompt,
+                options={'temperature': 0.3, 'num_predict': 10},
+                validate=self._has_score
             )
             
-            score_text = response['response'].strip()
+            score_text = response.strip()
             score = float(re.findall(r'0\.\d+|1\.0', score_text)[0])
             return min(1.0, max(0.0, score))
             
         except:
-            return 0.7
+            record_fallback("llm", "default_clarity")
+            return self.DEFAULT_SCORES["clarity"]
     
-    async def _analyze_structure(self, transcript: str) -> float:
+    async def _analyze_structure(self, excerpt: str) -> float:
         """Analyze structure using LLaMA"""
         
         prompt = f"""Analyze the following teaching transcript for structure and organization.
@@ -129,47 +309,33 @@ Rate the structure on a scale of 0.0 to 1.0, where:
 
 Respond with ONLY a number between 0.0 and 1.0.
 
-Transcript: {transcript[:1000]}
+Transcript: {excerpt}
 
 Structure Score:"""
         
         try:
-            response = await self.client.generate(
-                model=self.model,
-                prompt=prompt,
-                options={'temperature': 0.3, 'num_predict': 10}
+            response = await self._generate(
+                prompt,
+                options={'temperature': 0.3, 'num_predict': 10},
+                validate=self._has_score
             )
             
-            score_text = response['response'].strip()
+            score_text = response.strip()
             score = float(re.findall(r'0\.\d+|1\.0', score_text)[0])
             return min(1.0, max(0.0, score))
             
         except:
-            return 0.65
-    
-    def _count_technical_terms(self, transcript: str) -> int:
-        """Count technical terms in transcript"""
-        
-        technical_patterns = [
-            r'\b(?:algorithm|function|variable|class|object|method|parameter)\b',
-            r'\b(?:database|query|server|client|API|protocol)\b',
-            r'\b(?:machine learning|neural network|deep learning|AI)\b',
-            r'\b(?:data structure|complexity|optimization|efficiency)\b',
-        ]
-        
-        count = 0
-        for pattern in technical_patterns:
-            count += len(re.findall(pattern, transcript, re.IGNORECASE))
-        
-        return count
+            record_fallback("llm", "default_structure")
+            return self.DEFAULT_SCORES["structure"]
     
     def _default_analysis(self) -> Dict:
         """Return default analysis"""
         return {
-            "technical_depth_score": 0.6,
-            "clarity_score": 0.7,
-            "structure_score": 0.65,
+            "technical_depth_score": self.DEFAULT_SCORES["technical_depth"],
+            "clarity_score": self.DEFAULT_SCORES["clarity"],
+            "structure_score": self.DEFAULT_SCORES["structure"],
             "question_count": 3,
             "technical_term_count": 5,
+            "technical_terms": [],
             "word_count": 0
         }
\ No newline at end of file
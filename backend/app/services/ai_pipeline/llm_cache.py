@@ -0,0 +1,157 @@
+"""
+LLM Response Cache
+Two-tier cache (in-memory LRU + MongoDB with TTL) in front of Ollama generate calls
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from pymongo import ASCENDING
+
+from app.core import database
+from app.core.config import settings
+
+
+class LLMCache:
+    """
+    Cache LLM responses keyed by (model, prompt, options, format)
+
+    Lookups check the process-local LRU first, then the llm_cache
+    collection. Persistent entries expire through a TTL index and the
+    collection is trimmed to LLM_CACHE_MAX_ENTRIES, oldest first.
+    """
+
+    # Check the persistent tier's size every N writes
+    EVICTION_CHECK_INTERVAL = 100
+
+    def __init__(self, collection_name: str = "llm_cache"):
+        self.collection_name = collection_name
+        self.enabled = settings.LLM_CACHE_ENABLED
+        self.memory_entries = settings.LLM_CACHE_MEMORY_ENTRIES
+        self.ttl_seconds = settings.LLM_CACHE_TTL_SECONDS
+        self.max_entries = settings.LLM_CACHE_MAX_ENTRIES
+
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._writes = 0
+
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    @property
+    def collection(self):
+        """Persistent tier, None when there's no database connection"""
+        if database.mongodb_client is None:
+            return None
+        return database.get_collection(self.collection_name)
+
+    def key(self, model: str, prompt: str, options: Dict, format: str = '') -> str:
+        """Hash of everything that determines the response"""
+        payload = json.dumps(
+            {"model": model, "prompt": prompt, "options": options, "format": format},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def ensure_indexes(self):
+        """TTL index for expiry and a created_at index for size eviction"""
+        if self.collection is None:
+            return
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+        await self.collection.create_index([("created_at", ASCENDING)])
+
+    async def get(self, key: str) -> Optional[str]:
+        """Look up a cached response"""
+        if not self.enabled:
+            return None
+
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return self._memory[key]
+
+        collection = self.collection
+        if collection is not None:
+            try:
+                entry = await collection.find_one(
+                    {"_id": key, "expires_at": {"$gt": datetime.utcnow()}}
+                )
+            except Exception as e:
+                print(f"LLM cache read error: {e}")
+                entry = None
+
+            if entry is not None:
+                self._remember(key, entry["response"])
+                self.persistent_hits += 1
+                return entry["response"]
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, response: str, model: str):
+        """Store a response in both tiers"""
+        if not self.enabled:
+            return
+
+        self._remember(key, response)
+
+        collection = self.collection
+        if collection is None:
+            return
+
+        now = datetime.utcnow()
+        try:
+            await collection.replace_one(
+                {"_id": key},
+                {
+                    "response": response,
+                    "model": model,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=self.ttl_seconds)
+                },
+                upsert=True
+            )
+
+            self._writes += 1
+            if self._writes % self.EVICTION_CHECK_INTERVAL == 0:
+                await self._evict()
+        except Exception as e:
+            print(f"LLM cache write error: {e}")
+
+    def _remember(self, key: str, response: str):
+        """Insert into the LRU, dropping the least recently used entry"""
+        self._memory[key] = response
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    async def _evict(self):
+        """Trim the persistent tier to max_entries, oldest first"""
+        collection = self.collection
+        excess = await collection.estimated_document_count() - self.max_entries
+        if excess <= 0:
+            return
+
+        cursor = collection.find({}, {"_id": 1}).sort("created_at", ASCENDING).limit(excess)
+        oldest = [entry["_id"] async for entry in cursor]
+        await collection.delete_many({"_id": {"$in": oldest}})
+
+    def stats(self) -> Dict:
+        """Hit and miss counters"""
+        lookups = self.memory_hits + self.persistent_hits + self.misses
+        hits = self.memory_hits + self.persistent_hits
+        return {
+            "enabled": self.enabled,
+            "memory_hits": self.memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory)
+        }
+
+
+# Global LLM cache
+llm_cache = LLMCache()
@@ -0,0 +1,186 @@
+"""
+LLM Gateway
+Process-wide gate in front of Ollama: shared connections, global in-flight
+limit, fair queueing across analyses, timeouts and latency metrics
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional
+
+import httpx
+import ollama
+
+from app.core.config import settings
+from app.core.metrics import LLM_QUEUE_SECONDS, stage
+
+
+class LLMGateway:
+    """
+    Single path for every Ollama generate request in the process
+
+    At most OLLAMA_NUM_PARALLEL requests are sent at once, matching what the
+    Ollama server actually runs in parallel; the rest wait here instead of
+    piling up (and timing out) inside Ollama. Waiting requests are served
+    round-robin per owner (one owner per analysis), so one long transcript
+    can't starve the others.
+    """
+
+    def __init__(self):
+        self.max_in_flight = max(1, settings.OLLAMA_NUM_PARALLEL)
+        self.timeout = settings.LLM_REQUEST_TIMEOUT
+        self.keep_alive = settings.OLLAMA_KEEP_ALIVE
+
+        self._client: Optional[ollama.AsyncClient] = None
+        self._in_flight = 0
+        self._waiting: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+
+        # Metrics
+        self.requests = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.inference_total = 0.0
+        self.inference_max = 0.0
+
+    @property
+    def client(self) -> ollama.AsyncClient:
+        """Shared Ollama client with a pooled, keep-alive HTTP connection set"""
+        if self._client is None:
+            self._client = ollama.AsyncClient(
+                host=settings.OLLAMA_BASE_URL,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_in_flight,
+                    max_keepalive_connections=self.max_in_flight
+                )
+            )
+        return self._client
+
+    @property
+    def queued(self) -> int:
+        """Requests waiting for a slot"""
+        return sum(len(q) for q in self._waiting.values())
+
+    async def _acquire(self, owner: str):
+        """Wait for an in-flight slot"""
+        if self._in_flight < self.max_in_flight and not self._waiting:
+            self._in_flight += 1
+            return
+
+        future = asyncio.get_event_loop().create_future()
+        self._waiting.setdefault(owner, deque()).append(future)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was handed over just as we were cancelled
+                self._release()
+            else:
+                queue = self._waiting.get(owner)
+                if queue is not None and future in queue:
+                    queue.remove(future)
+                    if not queue:
+                        del self._waiting[owner]
+            raise
+
+    def _release(self):
+        """Hand the slot to the next owner in round-robin order"""
+        while self._waiting:
+            owner, queue = next(iter(self._waiting.items()))
+            future = queue.popleft()
+
+            if queue:
+                self._waiting.move_to_end(owner)
+            else:
+                del self._waiting[owner]
+
+            if not future.done():
+                future.set_result(None)
+                return
+
+        self._in_flight -= 1
+
+    async def generate(
+        self,
+        model: str,
+        prompt: str,
+        options: Dict,
+        format: str = '',
+        owner: str = "default"
+    ) -> str:
+        """
+        Run one generate request through the gate
+
+        Args:
+            model: Ollama model name
+            prompt: Prompt text
+            options: Ollama options
+            format: '' or 'json'
+            owner: Fairness key, normally the analysis
+
+        Returns:
+            Response text
+
+        Raises:
+            asyncio.TimeoutError: If Ollama doesn't answer within LLM_REQUEST_TIMEOUT
+        """
+        queued_at = time.perf_counter()
+        await self._acquire(owner)
+        started_at = time.perf_counter()
+
+        wait = started_at - queued_at
+        LLM_QUEUE_SECONDS.observe(wait)
+        self.queue_wait_total += wait
+        self.queue_wait_max = max(self.queue_wait_max, wait)
+        self.requests += 1
+
+        try:
+            with stage("llm"):
+                response = await asyncio.wait_for(
+                    self.client.generate(
+                        model=model,
+                        prompt=prompt,
+                        format=format,
+                        options=options,
+                        keep_alive=self.keep_alive
+                    ),
+                    timeout=self.timeout
+                )
+            return response['response']
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started_at
+            self.inference_total += elapsed
+            self.inference_max = max(self.inference_max, elapsed)
+            self._release()
+
+    async def preload(self, model: str):
+        """Ask Ollama to load the model now and keep it resident"""
+        await asyncio.wait_for(
+            self.client.generate(model=model, keep_alive=self.keep_alive),
+            timeout=self.timeout
+        )
+
+    def stats(self) -> Dict:
+        """Queue and latency metrics"""
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self._in_flight,
+            "queued": self.queued,
+            "requests": self.requests,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "queue_wait_avg": round(self.queue_wait_total / self.requests, 4) if self.requests else 0.0,
+            "queue_wait_max": round(self.queue_wait_max, 4),
+            "inference_avg": round(self.inference_total / self.requests, 4) if self.requests else 0.0,
+            "inference_max": round(self.inference_max, 4)
+        }
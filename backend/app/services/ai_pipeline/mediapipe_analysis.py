@@ -5,9 +5,11 @@ Analyzes visual engagement using MediaPipe (with fallback)
 
 import cv2
 import numpy as np
-import asyncio
-from functools import partial
 from typing import Dict
+from app.core.metrics import record_fallback
+from app.services.ai_pipeline.frame_sampler import FrameSampler, SamplingPlanner, probe_duration
+from app.services.ai_pipeline.model_registry import model_registry
+from app.services.ai_pipeline.stage_runner import stage_runner
 
 # Try to import MediaPipe, fallback if not available
 try:
@@ -21,15 +23,8 @@ except ImportError:
 class MediaPipeAnalyzer:
     """Analyze visual engagement using MediaPipe or basic CV"""
     
-    def __init__(self):
-        if MEDIAPIPE_AVAILABLE:
-            self.mp_pose = mp.solutions.pose
-            self.mp_face_mesh = mp.solutions.face_mesh
-            self.mp_hands = mp.solutions.hands
-        else:
-            self.mp_pose = None
-            self.mp_face_mesh = None
-            self.mp_hands = None
+    # Sample count the gesture thresholds were tuned on
+    REFERENCE_SAMPLES = 30
     
     async def analyze(self, video_path: str) -> Dict:
         """
@@ -38,92 +33,102 @@ class MediaPipeAnalyzer:
         Returns:
             Dictionary of visual features
         """
-        loop = asyncio.get_event_loop()
-        
-        features = await loop.run_in_executor(
-            None,
-            self._extract_visual_features,
-            video_path
-        )
-        
-        return features
+        # Run frame analysis in a visual worker (CPU-intensive)
+        return await stage_runner.run("visual", extract_visual_features, video_path)
     
     def _extract_visual_features(self, video_path: str) -> Dict:
         """Extract visual features from video"""
         
         if not MEDIAPIPE_AVAILABLE:
             # Return simulated data if MediaPipe not available
+            record_fallback("visual", "mediapipe_unavailable")
             return self._get_simulated_features()
         
         try:
             cap = cv2.VideoCapture(video_path)
+            duration = None
+            if cap.get(cv2.CAP_PROP_FRAME_COUNT) <= 0:
+                # webm/mkv often have no frame count in the header
+                duration = probe_duration(video_path)
+            sampler = FrameSampler(cap, duration=duration)
+            planner = SamplingPlanner()
             
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
+            total_frames = sampler.total_frames
             
-            sample_rate = max(1, int(fps))
+            stats = {
+                "samples_analyzed": 0,
+                "face_detections": 0,
+                "hand_gestures": 0,
+                "face_confidences": []
+            }
             
-            gesture_count = 0
-            face_detections = 0
-            hand_gestures = 0
-            face_confidences = []
+            # Stratified samples spread over the whole video
+            sample_times = planner.plan(sampler.duration)
+            signatures = []
             
-            frame_idx = 0
-            samples_analyzed = 0
-            max_samples = 30
+            # Graphs are shared across analyses, so hold them for the whole video
+            face_mesh, hands = model_registry.get_mediapipe_graphs()
             
-            with self.mp_face_mesh.FaceMesh(
-                min_detection_confidence=0.5,
-                min_tracking_confidence=0.5
-            ) as face_mesh, \
-            self.mp_hands.Hands(
-                min_detection_confidence=0.5,
-                min_tracking_confidence=0.5
-            ) as hands:
+            with model_registry.mediapipe_lock:
+                for timestamp, frame in sampler.frames(sample_times):
+                    signatures.append((timestamp, planner.signature(frame)))
+                    self._analyze_frame(frame, face_mesh, hands, stats)
                 
-                while cap.isOpened() and samples_analyzed < max_samples:
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
-                    
-                    if frame_idx % sample_rate == 0:
-                        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                        
-                        # Face detection
-                        face_results = face_mesh.process(rgb_frame)
-                        if face_results.multi_face_landmarks:
-                            face_detections += 1
-                            face_confidences.append(0.9)
-                        
-                        # Hand detection
-                        hand_results = hands.process(rgb_frame)
-                        if hand_results.multi_hand_landmarks:
-                            hand_gestures += len(hand_results.multi_hand_landmarks)
-                        
-                        samples_analyzed += 1
-                    
-                    frame_idx += 1
+                # Extra samples around detected scene changes
+                scene_times = planner.scene_change_samples(signatures)
+                for _, frame in sampler.frames(scene_times):
+                    self._analyze_frame(frame, face_mesh, hands, stats)
             
             cap.release()
             
+            samples_analyzed = stats["samples_analyzed"]
+            hand_gestures = stats["hand_gestures"]
+            face_confidences = stats["face_confidences"]
+            
             face_confidence = float(np.mean(face_confidences)) if face_confidences else 0
-            face_presence_ratio = face_detections / samples_analyzed if samples_analyzed > 0 else 0
+            face_presence_ratio = stats["face_detections"] / samples_analyzed if samples_analyzed > 0 else 0
             eye_contact_ratio = face_presence_ratio
             
+            # Sample counts vary with duration, so report gestures per
+            # REFERENCE_SAMPLES to keep the scoring thresholds comparable
+            gesture_count = 0
+            if samples_analyzed > 0:
+                gesture_count = round(hand_gestures * self.REFERENCE_SAMPLES / samples_analyzed)
+            
             return {
                 "total_frames": total_frames,
                 "samples_analyzed": samples_analyzed,
-                "gesture_count": hand_gestures,
+                "scene_change_samples": len(scene_times),
+                "gesture_count": gesture_count,
                 "face_confidence": face_confidence,
                 "face_presence_ratio": face_presence_ratio,
                 "eye_contact_ratio": eye_contact_ratio,
-                "hand_gestures": hand_gestures
+                "hand_gestures": hand_gestures,
+                "frames_requested": sampler.frames_requested
             }
             
         except Exception as e:
             print(f"Visual analysis error: {e}")
+            record_fallback("visual", "simulated_after_error")
             return self._get_simulated_features()
     
+    def _analyze_frame(self, frame, face_mesh, hands, stats: Dict):
+        """Run face and hand detection on one sampled frame"""
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        
+        # Face detection
+        face_results = face_mesh.process(rgb_frame)
+        if face_results.multi_face_landmarks:
+            stats["face_detections"] += 1
+            stats["face_confidences"].append(0.9)
+        
+        # Hand detection
+        hand_results = hands.process(rgb_frame)
+        if hand_results.multi_hand_landmarks:
+            stats["hand_gestures"] += len(hand_results.multi_hand_landmarks)
+        
+        stats["samples_analyzed"] += 1
+    
     def _get_simulated_features(self) -> Dict:
         """Return simulated visual features for testing"""
         import random
@@ -135,4 +140,9 @@ class MediaPipeAnalyzer:
             "face_presence_ratio": round(random.uniform(0.70, 0.90), 2),
             "eye_contact_ratio": round(random.uniform(0.65, 0.85), 2),
             "hand_gestures": random.randint(8, 15)
-        }
\ No newline at end of file
+        }
+
+
+def extract_visual_features(video_path: str) -> Dict:
+    """Stage entry point, runs inside a visual worker"""
+    return MediaPipeAnalyzer()._extract_visual_features(video_path)
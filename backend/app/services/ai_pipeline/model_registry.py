@@ -0,0 +1,162 @@
+"""
+Model Registry
+Process-wide home for loaded AI models, warmed up once at startup
+"""
+
+import asyncio
+import threading
+from typing import Dict, List, Tuple
+
+from app.core.config import settings
+from app.services.ai_pipeline.llm_gateway import LLMGateway
+
+
+class ModelRegistry:
+    """Keeps Whisper, MediaPipe graphs and the LLM gateway resident"""
+
+    # Analyses still complete without these (default NLP scores)
+    OPTIONAL = ("ollama",)
+
+    def __init__(self):
+        self._load_lock = threading.Lock()
+
+        # Loaded models are shared, so inference on each is serialized
+        self.whisper_lock = threading.Lock()
+        self.mediapipe_lock = threading.Lock()
+
+        self._whisper_model = None
+        self._face_mesh = None
+        self._hands = None
+        self._llm_gateway = None
+
+        # warmed_up once warm_up() has finished; ready only if every
+        # required model loaded (see errors otherwise, optional ones too)
+        self.warmed_up = False
+        self.ready = False
+        self.errors: Dict[str, str] = {}
+
+    def get_whisper_model(self):
+        """Get the configured Whisper backend, loading it on first use"""
+        if self._whisper_model is None:
+            with self._load_lock:
+                if self._whisper_model is None:
+                    from app.services.ai_pipeline.whisper_backends import create_whisper_backend
+                    self._whisper_model = create_whisper_backend().load()
+        return self._whisper_model
+
+    def get_mediapipe_graphs(self) -> Tuple:
+        """
+        Get the (face_mesh, hands) graphs, building them on first use
+
+        Returns:
+            Tuple of graphs, or (None, None) if MediaPipe is not installed
+        """
+        from app.services.ai_pipeline.mediapipe_analysis import MEDIAPIPE_AVAILABLE
+
+        if not MEDIAPIPE_AVAILABLE:
+            return None, None
+
+        if self._face_mesh is None:
+            with self._load_lock:
+                if self._face_mesh is None:
+                    import mediapipe as mp
+
+                    # Static image mode: sampled frames are far apart and the
+                    # graphs are reused across videos, so no tracking state
+                    self._hands = mp.solutions.hands.Hands(
+                        static_image_mode=True,
+                        min_detection_confidence=0.5
+                    )
+                    self._face_mesh = mp.solutions.face_mesh.FaceMesh(
+                        static_image_mode=True,
+                        min_detection_confidence=0.5
+                    )
+        return self._face_mesh, self._hands
+
+    def get_llm_gateway(self) -> LLMGateway:
+        """Get the shared LLM gateway (one Ollama connection pool per process)"""
+        if self._llm_gateway is None:
+            self._llm_gateway = LLMGateway()
+        return self._llm_gateway
+
+    async def warm_up(self):
+        """Load every model so the first analysis doesn't pay for it"""
+        from app.services.ai_pipeline.stage_runner import stage_runner
+
+        if stage_runner.uses_processes:
+            # Heavy models live in the stage workers, not the API process
+            try:
+                self.errors.update(await stage_runner.warm_up())
+            except Exception as e:
+                self.errors["workers"] = str(e)
+                print(f"⚠️ Failed to start stage workers: {e}")
+        else:
+            await self._load_local_models()
+
+        # Load the LLM into Ollama now and keep it resident
+        try:
+            await self.get_llm_gateway().preload(settings.OLLAMA_MODEL)
+            print(f"✅ Loaded {settings.OLLAMA_MODEL} in Ollama")
+        except Exception as e:
+            self.errors["ollama"] = str(e) or type(e).__name__
+            print(f"⚠️ Failed to preload {settings.OLLAMA_MODEL}: {e}")
+
+        self.warmed_up = True
+        self.ready = all(name in self.OPTIONAL for name in self.errors)
+
+    @property
+    def degraded(self) -> List[str]:
+        """Optional components that failed to load"""
+        return sorted(name for name in self.errors if name in self.OPTIONAL)
+
+    async def _load_local_models(self):
+        """Load Whisper and MediaPipe into this process"""
+        loop = asyncio.get_event_loop()
+
+        loaders = {
+            "whisper": self.get_whisper_model,
+            "mediapipe": self.get_mediapipe_graphs,
+        }
+
+        for name, loader in loaders.items():
+            try:
+                loaded = await loop.run_in_executor(None, loader)
+                if loaded == (None, None):
+                    print(f"⚠️ Skipped {name} model (not installed)")
+                else:
+                    print(f"✅ Loaded {name} model")
+            except Exception as e:
+                self.errors[name] = str(e)
+                print(f"⚠️ Failed to load {name} model: {e}")
+
+    def status(self) -> Dict:
+        """Get loading status of each model"""
+        from app.services.ai_pipeline.stage_runner import stage_runner
+
+        return {
+            "ready": self.ready,
+            "warmed_up": self.warmed_up,
+            "degraded": self.degraded,
+            "stages": stage_runner.status(),
+            "whisper": self._whisper_model is not None,
+            "whisper_backend": (
+                self._whisper_model.describe() if self._whisper_model is not None
+                else settings.WHISPER_BACKEND
+            ),
+            "mediapipe": self._face_mesh is not None,
+            "ollama": self._llm_gateway is not None and "ollama" not in self.errors,
+            "errors": self.errors
+        }
+
+    def close(self):
+        """Release native MediaPipe resources"""
+        for graph in (self._face_mesh, self._hands):
+            if graph is not None:
+                graph.close()
+        self._face_mesh = None
+        self._hands = None
+        self.ready = False
+
+
+# Global model registry
+model_registry = ModelRegistry()
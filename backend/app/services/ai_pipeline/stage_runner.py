@@ -0,0 +1,161 @@
+"""
+Stage Runner
+Runs CPU-bound pipeline stages in dedicated worker processes
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import measured_call, record_work
+
+# Set by _init_worker in each worker process, reported back by _ping
+_warm_up_error: Optional[str] = None
+
+
+def _init_worker(stage: str):
+    """Load the models a stage needs once per worker process"""
+    from app.services.ai_pipeline.model_registry import model_registry
+
+    global _warm_up_error
+    try:
+        if stage == "transcription":
+            model_registry.get_whisper_model()
+        elif stage == "visual":
+            model_registry.get_mediapipe_graphs()
+        elif stage == "audio":
+            import librosa  # noqa: F401 - heavy import, keep it out of the first job
+    except Exception as e:
+        _warm_up_error = str(e) or type(e).__name__
+        print(f"⚠️ Worker warm-up failed for {stage}: {e}")
+
+
+def _ping() -> Optional[str]:
+    """Task used to start workers, returns the worker's warm-up error if any"""
+    return _warm_up_error
+
+
+class StageRunner:
+    """
+    Dispatch stage functions to per-stage executors
+
+    With STAGE_EXECUTOR=process every stage gets its own ProcessPoolExecutor,
+    so Whisper, librosa and MediaPipe never hold the API process's GIL.
+    STAGE_EXECUTOR=thread keeps the old behaviour (default thread pool).
+    Stage functions must be module-level and return compact, picklable results.
+    Every call is measured on the worker (CPU time, peak RSS, fallbacks).
+    """
+
+    STAGES = ("transcription", "audio", "visual")
+
+    def __init__(self):
+        self._pools: Dict[str, ProcessPoolExecutor] = {}
+
+    @property
+    def uses_processes(self) -> bool:
+        return settings.STAGE_EXECUTOR == "process"
+
+    def workers_for(self, stage: str) -> int:
+        """Configured worker count for a stage"""
+        return {
+            "transcription": settings.STAGE_WORKERS_TRANSCRIPTION,
+            "audio": settings.STAGE_WORKERS_AUDIO,
+            "visual": settings.STAGE_WORKERS_VISUAL,
+        }.get(stage, 1)
+
+    def _get_executor(self, stage: str) -> Optional[Executor]:
+        """Get the executor for a stage, creating its pool on first use"""
+        if not self.uses_processes:
+            return None
+
+        if stage not in self._pools:
+            self._pools[stage] = ProcessPoolExecutor(
+                max_workers=max(1, self.workers_for(stage)),
+                # Spawn: forking a process that holds an event loop and
+                # model threads is unsafe
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(stage,)
+            )
+        return self._pools[stage]
+
+    async def run(self, stage: str, func: Callable, *args):
+        """
+        Run a stage function off the event loop
+
+        Args:
+            stage: Stage name, selects the pool
+            func: Module-level function to run
+            *args: Picklable arguments
+
+        Returns:
+            Whatever func returns
+        """
+        loop = asyncio.get_event_loop()
+        executor = self._get_executor(stage)
+
+        try:
+            result, usage = await loop.run_in_executor(executor, measured_call, func, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM); rebuild the pool on next use
+            self._pools.pop(stage, None)
+            raise
+        except Exception as e:
+            # Failed work still used CPU and may have recorded fallbacks
+            usage = getattr(e, "work_usage", None)
+            if usage is not None:
+                record_work(stage, usage)
+            raise
+
+        record_work(stage, usage)
+        return result
+
+    async def warm_up(self) -> Dict[str, str]:
+        """
+        Start every worker so models load before the first job
+
+        Returns:
+            Warm-up error by stage, for stages whose workers failed to load
+        """
+        errors = {}
+        if not self.uses_processes:
+            return errors
+
+        for stage in self.STAGES:
+            executor = self._get_executor(stage)
+            loop = asyncio.get_event_loop()
+            results = await asyncio.gather(*[
+                loop.run_in_executor(executor, _ping)
+                for _ in range(self.workers_for(stage))
+            ])
+            failed = [error for error in results if error is not None]
+            if failed:
+                errors[stage] = failed[0]
+                print(f"⚠️ {len(failed)} {stage} worker(s) failed to load: {failed[0]}")
+            else:
+                print(f"✅ Started {self.workers_for(stage)} {stage} worker(s)")
+        return errors
+
+    def status(self) -> Dict:
+        """Executor mode and per-stage worker counts"""
+        return {
+            "executor": settings.STAGE_EXECUTOR,
+            "workers": {
+                stage: self.workers_for(stage) if self.uses_processes else None
+                for stage in self.STAGES
+            },
+            "running": sorted(self._pools)
+        }
+
+    def shutdown(self):
+        """Stop all worker processes"""
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._pools.clear()
+
+
+# Global stage runner
+stage_runner = StageRunner()
@@ -0,0 +1,241 @@
+"""
+Technical Term Matcher
+Per-subject vocabularies compiled into token tries, matched in one pass
+"""
+
+import hashlib
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+# Built-in vocabularies, one <name>.txt per subject
+BUILTIN_VOCABULARY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vocabularies")
+
+# Words plus trailing +/# so "c++" and "c#" stay distinct from "c"
+TOKEN_PATTERN = re.compile(r"\w+[+#]*")
+
+# Trie key marking the end of a term
+_TERM = None
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, shared by terms and transcripts"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def normalize_subject(subject: str) -> str:
+    """'Computer Science' -> 'computer_science'"""
+    return "_".join(tokenize(subject))
+
+
+class TermMatcher:
+    """
+    Compiled vocabulary
+
+    Terms (single or multi-word) are stored in a trie keyed by token. A
+    transcript is tokenized once and scanned left to right taking the
+    longest term starting at each position, so the cost is one dict lookup
+    per word no matter how many terms the vocabulary has.
+    """
+
+    def __init__(self, name: str, terms: List[str]):
+        self.name = name
+        self.root: Dict = {}
+
+        canonical = {}
+        for term in terms:
+            tokens = tokenize(term)
+            if tokens:
+                # First spelling wins for duplicates like "API" / "api"
+                canonical.setdefault(tuple(tokens), term.strip())
+
+        for tokens, term in canonical.items():
+            node = self.root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[_TERM] = term
+
+        self.term_count = len(canonical)
+        self.version = hashlib.sha256(
+            "\n".join(sorted(" ".join(t) for t in canonical)).encode()
+        ).hexdigest()[:12]
+
+    def count(self, text: str) -> Dict[str, int]:
+        """
+        Count vocabulary terms in text
+
+        Args:
+            text: Transcript
+
+        Returns:
+            Occurrences per matched term
+        """
+        tokens = tokenize(text)
+        root = self.root
+        counts = Counter()
+
+        i = 0
+        n = len(tokens)
+        while i < n:
+            node = root.get(tokens[i])
+            if node is None:
+                i += 1
+                continue
+
+            # Longest match starting here
+            match, match_end = node.get(_TERM), i + 1
+            j = i + 1
+            while j < n:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _TERM in node:
+                    match, match_end = node[_TERM], j
+
+            if match is None:
+                i += 1
+            else:
+                counts[match] += 1
+                i = match_end
+
+        return dict(counts)
+
+
+class TermVocabularies:
+    """
+    Resolve subjects to compiled matchers
+
+    Vocabularies are plain text files: one term per line, '#' comments and
+    an optional '# aliases: a, b' line listing other subject names. Files in
+    TERM_VOCABULARY_DIR override built-ins of the same name. Matchers are
+    cached and recompiled only when their file changes.
+    """
+
+    def __init__(self, extra_dir: Optional[str] = None, default: Optional[str] = None):
+        self.dirs = [BUILTIN_VOCABULARY_DIR]
+        extra_dir = extra_dir if extra_dir is not None else settings.TERM_VOCABULARY_DIR
+        if extra_dir:
+            self.dirs.append(extra_dir)
+        self.default = default or settings.TERM_DEFAULT_VOCABULARY
+
+        self._dirs_stamp = None
+        self._files: Dict[str, str] = {}
+        self._aliases: Dict[Tuple[str, ...], str] = {}
+        self._matchers: Dict[str, Tuple[Tuple[int, int], TermMatcher]] = {}
+
+    def _stamp(self, path: str) -> Tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh_index(self):
+        """Rescan vocabulary files when a directory has changed"""
+        stamp = tuple(
+            self._stamp(d)[0] if os.path.isdir(d) else None for d in self.dirs
+        )
+        if stamp == self._dirs_stamp:
+            return
+
+        files = {}
+        for directory in self.dirs:
+            if not os.path.isdir(directory):
+                continue
+            for filename in sorted(os.listdir(directory)):
+                if filename.endswith(".txt"):
+                    files[filename[:-4]] = os.path.join(directory, filename)
+
+        aliases = {}
+        for name, path in files.items():
+            aliases[tuple(name.split("_"))] = name
+            for alias in self._read(path)[1]:
+                aliases.setdefault(tuple(tokenize(alias)), name)
+
+        self._files = files
+        self._aliases = aliases
+        self._dirs_stamp = stamp
+
+    def _read(self, path: str) -> Tuple[List[str], List[str]]:
+        """Terms and aliases from a vocabulary file"""
+        terms, aliases = [], []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line.lower().startswith("# aliases:"):
+                    aliases.extend(a.strip() for a in line.split(":", 1)[1].split(",") if a.strip())
+                elif line and not line.startswith("#"):
+                    terms.append(line)
+        return terms, aliases
+
+    def resolve(self, subject: Optional[str]) -> str:
+        """
+        Vocabulary name for a subject
+
+        Exact name/alias first, then the longest alias appearing inside the
+        subject ('Intro to Python Programming' -> programming), else the default.
+        """
+        self._refresh_index()
+        tokens = tuple(tokenize(subject or ""))
+
+        if tokens in self._aliases:
+            return self._aliases[tokens]
+
+        best, best_len = None, 0
+        for alias, name in self._aliases.items():
+            size = len(alias)
+            if size <= best_len or size > len(tokens):
+                continue
+            if any(tokens[i:i + size] == alias for i in range(len(tokens) - size + 1)):
+                best, best_len = name, size
+
+        return best or self.default
+
+    def matcher(self, name: str) -> TermMatcher:
+        """Compiled matcher for a vocabulary, rebuilt if its file changed"""
+        self._refresh_index()
+        path = self._files.get(name) or self._files[self.default]
+        stamp = self._stamp(path)
+
+        cached = self._matchers.get(name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        terms, _ = self._read(path)
+        matcher = TermMatcher(name, terms)
+        self._matchers[name] = (stamp, matcher)
+        return matcher
+
+    def matcher_for(self, subject: Optional[str]) -> TermMatcher:
+        """Compiled matcher for a subject"""
+        return self.matcher(self.resolve(subject))
+
+
+def term_analysis(transcript: str, subject: Optional[str] = None) -> Dict:
+    """
+    Technical term fields of the NLP analysis
+
+    Args:
+        transcript: Transcribed text
+        subject: Analysis subject, picks the vocabulary
+
+    Returns:
+        technical_term_count, per-term counts and the vocabulary used
+    """
+    matcher = term_vocabularies.matcher_for(subject)
+    counts = matcher.count(transcript or "")
+
+    return {
+        "technical_term_count": sum(counts.values()),
+        "technical_terms": [
+            {"term": term, "count": count}
+            for term, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        ],
+        "vocabulary": matcher.name,
+        "vocabulary_version": matcher.version
+    }
+
+
+# Global vocabulary registry
+term_vocabularies = TermVocabularies()
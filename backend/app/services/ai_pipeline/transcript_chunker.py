@@ -0,0 +1,89 @@
+"""
+Transcript Chunker
+Splits transcripts into token-bounded windows for map-reduce LLM scoring
+"""
+
+import hashlib
+import re
+from typing import List
+
+# Rough tokens per word for English with LLaMA-style tokenizers
+TOKENS_PER_WORD = 4 / 3
+
+# A sentence ends a window (once it's at least half full) when its hash
+# falls in 1 of this many buckets. Boundaries then depend on content, not
+# position, so an edit only changes the windows around it.
+BOUNDARY_MODULUS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text"""
+    return int(len(text.split()) * TOKENS_PER_WORD)
+
+
+def _split_sentences(transcript: str) -> List[str]:
+    """Split text into sentences, keeping their punctuation"""
+    sentences = re.split(r'(?<=[.!?])\s+', transcript.strip())
+    return [s for s in sentences if s]
+
+
+def _split_long_sentence(sentence: str, max_tokens: int) -> List[str]:
+    """Break a sentence that alone exceeds max_tokens into word runs"""
+    words = sentence.split()
+    max_words = max(1, int(max_tokens / TOKENS_PER_WORD))
+    return [" ".join(words[i:i + max_words]) for i in range(0, len(words), max_words)]
+
+
+def _is_boundary(sentence: str) -> bool:
+    """Content-defined boundary test"""
+    digest = hashlib.md5(sentence.encode()).digest()
+    return digest[0] % BOUNDARY_MODULUS == 0
+
+
+def split_transcript(transcript: str, max_tokens: int) -> List[str]:
+    """
+    Split a transcript into windows of at most max_tokens
+
+    Windows end on sentence boundaries. Between half and full size, a
+    window closes at a content-defined boundary, so re-analysing a lightly
+    edited transcript reproduces most windows exactly (and hits the LLM cache).
+
+    Args:
+        transcript: Full transcript text
+        max_tokens: Token budget per window
+
+    Returns:
+        Window texts in transcript order
+    """
+    max_words = max(1, int(max_tokens / TOKENS_PER_WORD))
+    min_words = max_words // 2
+
+    pieces = []
+    for sentence in _split_sentences(transcript):
+        if len(sentence.split()) > max_words:
+            pieces.extend(_split_long_sentence(sentence, max_tokens))
+        else:
+            pieces.append(sentence)
+
+    windows = []
+    current = []
+    current_words = 0
+
+    for piece in pieces:
+        piece_words = len(piece.split())
+
+        if current and current_words + piece_words > max_words:
+            windows.append(" ".join(current))
+            current, current_words = [], 0
+
+        current.append(piece)
+        current_words += piece_words
+
+        if current_words >= min_words and _is_boundary(piece):
+            windows.append(" ".join(current))
+            current, current_words = [], 0
+
+    if current:
+        windows.append(" ".join(current))
+
+    return windows
@@ -0,0 +1,120 @@
+"""
+Voice Activity Detection
+Energy-based speech/silence segmentation, run once per recording
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.ai_pipeline.audio_decoder import DecodedAudio
+from app.services.ai_pipeline.audio_segmenter import FRAME_SECONDS, frame_energy
+
+# Speech runs shorter than this are clicks and bumps, not words
+MIN_SPEECH_SECONDS = 0.15
+
+# Percentile of frame energy taken as the noise floor
+NOISE_FLOOR_PERCENTILE = 10
+
+# Frames quieter than this are silence whatever the noise floor
+ABSOLUTE_FLOOR_DB = -60.0
+
+# Pauses at least this long are reported separately
+LONG_PAUSE_SECONDS = 2.0
+
+Interval = Tuple[float, float]
+
+
+def _merge(intervals: List[Interval], max_gap: float) -> List[Interval]:
+    """Join intervals separated by less than max_gap"""
+    merged = []
+    for start, end in intervals:
+        if merged and start - merged[-1][1] < max_gap:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def detect_speech(
+    samples: np.ndarray,
+    sr: int,
+    threshold_db: Optional[float] = None,
+    min_silence: Optional[float] = None,
+    pad: Optional[float] = None
+) -> List[Interval]:
+    """
+    Find speech intervals in a recording
+
+    A frame is speech when its level is threshold_db above the noise floor
+    (a low percentile of frame levels, so it adapts to each room). Short
+    runs are dropped, gaps shorter than min_silence are bridged and every
+    interval is padded so word edges aren't clipped.
+
+    Args:
+        samples: Mono PCM
+        sr: Sample rate
+        threshold_db: Level above the noise floor that counts as speech
+        min_silence: Shortest silence that separates two intervals
+        pad: Seconds added on both sides of each interval
+
+    Returns:
+        Sorted, non-overlapping (start, end) pairs in seconds
+    """
+    threshold_db = settings.VAD_THRESHOLD_DB if threshold_db is None else threshold_db
+    min_silence = settings.VAD_MIN_SILENCE_SECONDS if min_silence is None else min_silence
+    pad = settings.VAD_PAD_SECONDS if pad is None else pad
+
+    energy = frame_energy(samples, sr)
+    if energy.size == 0:
+        return []
+
+    levels = 20 * np.log10(energy + 1e-10)
+    noise_floor = np.percentile(levels, NOISE_FLOOR_PERCENTILE)
+    active = levels > max(noise_floor + threshold_db, ABSOLUTE_FLOOR_DB)
+
+    # Run boundaries: +1 where speech starts, -1 where it stops
+    edges = np.diff(np.concatenate([[0], active.astype(np.int8), [0]]))
+    starts = np.flatnonzero(edges == 1) * FRAME_SECONDS
+    ends = np.flatnonzero(edges == -1) * FRAME_SECONDS
+
+    intervals = _merge(list(zip(starts.tolist(), ends.tolist())), min_silence)
+    intervals = [(s, e) for s, e in intervals if e - s >= MIN_SPEECH_SECONDS]
+
+    duration = len(samples) / sr
+    padded = [(max(0.0, s - pad), min(duration, e + pad)) for s, e in intervals]
+    return _merge(padded, 0.0)
+
+
+def pause_statistics(intervals: List[Interval], duration: float) -> Dict:
+    """
+    Pause metrics from speech intervals
+
+    Silence before the first and after the last interval is setup or
+    wrap-up, not pausing, so ratios use the span the speaker was talking in.
+
+    Args:
+        intervals: Speech intervals from detect_speech
+        duration: Recording length in seconds
+
+    Returns:
+        Speech time, pause ratio and pause counts
+    """
+    speech_seconds = sum(e - s for s, e in intervals)
+    pauses = [b[0] - a[1] for a, b in zip(intervals, intervals[1:])]
+    span = intervals[-1][1] - intervals[0][0] if intervals else 0.0
+
+    return {
+        "speech_seconds": round(speech_seconds, 2),
+        "speech_ratio": speech_seconds / duration if duration else 0.0,
+        "pause_ratio": sum(pauses) / span if span else 0.0,
+        "pause_count": len(pauses),
+        "long_pause_count": sum(1 for p in pauses if p >= LONG_PAUSE_SECONDS),
+        "mean_pause_seconds": float(np.mean(pauses)) if pauses else 0.0
+    }
+
+
+def detect_speech_intervals(audio: DecodedAudio) -> List[Interval]:
+    """Stage entry point, runs inside an audio worker"""
+    return detect_speech(audio.samples, audio.sample_rate)
@@ -0,0 +1,149 @@
+"""
+Whisper Backends
+Interchangeable speech-to-text engines behind one result structure
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+# Both engines take 16 kHz mono float32
+WHISPER_SAMPLE_RATE = 16000
+
+
+class WhisperBackend(ABC):
+    """
+    Base class for Whisper engines
+
+    transcribe() returns {"text", "segments", "language"} where segments
+    are {"start", "end", "text"} dicts in seconds from the start of the input.
+    """
+
+    name = "base"
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        device: Optional[str] = None,
+        beam_size: Optional[int] = None,
+        threads: Optional[int] = None
+    ):
+        self.model_name = model_name or settings.WHISPER_MODEL
+        self.device = device or settings.WHISPER_DEVICE
+        self.beam_size = beam_size or settings.WHISPER_BEAM_SIZE
+        self.threads = settings.WHISPER_NUM_THREADS if threads is None else threads
+        self.model = None
+
+    @abstractmethod
+    def load(self) -> "WhisperBackend":
+        """Load model weights"""
+
+    @abstractmethod
+    def transcribe(self, samples: np.ndarray) -> Dict:
+        """Transcribe 16 kHz mono float32 samples"""
+
+    def describe(self) -> str:
+        """Settings that change the output, for cache keys and reports"""
+        return f"{self.name}:{self.model_name}:beam={self.beam_size}"
+
+
+class OpenAIWhisperBackend(WhisperBackend):
+    """Reference openai-whisper implementation (PyTorch)"""
+
+    name = "openai"
+
+    def load(self) -> "OpenAIWhisperBackend":
+        import whisper
+
+        if self.threads > 0:
+            # Split the cores between workers instead of oversubscribing them
+            import torch
+            torch.set_num_threads(self.threads)
+
+        self.model = whisper.load_model(self.model_name, device=self.device)
+        return self
+
+    def transcribe(self, samples: np.ndarray) -> Dict:
+        options = {"fp16": self.device != "cpu"}
+        if self.beam_size > 1:
+            options["beam_size"] = self.beam_size
+
+        result = self.model.transcribe(samples, **options)
+
+        return {
+            "text": result["text"],
+            "segments": [
+                {"start": s["start"], "end": s["end"], "text": s["text"]}
+                for s in result.get("segments", [])
+            ],
+            "language": result.get("language")
+        }
+
+
+class FasterWhisperBackend(WhisperBackend):
+    """CTranslate2 implementation (faster-whisper) with quantized weights"""
+
+    name = "faster_whisper"
+
+    def __init__(self, *args, compute_type: Optional[str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compute_type = compute_type or settings.WHISPER_COMPUTE_TYPE
+
+    def load(self) -> "FasterWhisperBackend":
+        from faster_whisper import WhisperModel
+
+        self.model = WhisperModel(
+            self.model_name,
+            device=self.device,
+            compute_type=self.compute_type,
+            cpu_threads=max(0, self.threads),
+            num_workers=1
+        )
+        return self
+
+    def transcribe(self, samples: np.ndarray) -> Dict:
+        segments, info = self.model.transcribe(
+            np.asarray(samples, dtype=np.float32),
+            beam_size=self.beam_size
+        )
+
+        # segments is a generator, decoding happens while iterating
+        segments = [
+            {"start": s.start, "end": s.end, "text": s.text}
+            for s in segments
+        ]
+
+        return {
+            "text": "".join(s["text"] for s in segments),
+            "segments": segments,
+            "language": info.language
+        }
+
+    def describe(self) -> str:
+        return f"{super().describe()}:{self.compute_type}"
+
+
+BACKENDS = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def create_whisper_backend(name: Optional[str] = None, **kwargs) -> WhisperBackend:
+    """
+    Build the configured backend (not loaded yet)
+
+    Args:
+        name: "openai" or "faster_whisper", defaults to WHISPER_BACKEND
+        **kwargs: Overrides for model_name, device, beam_size, threads
+
+    Raises:
+        ValueError: For an unknown backend name
+    """
+    name = name or settings.WHISPER_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown WHISPER_BACKEND {name!r}, expected one of {sorted(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
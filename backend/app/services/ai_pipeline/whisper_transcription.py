@@ -3,41 +3,146 @@ Whisper Transcription Service
 Uses OpenAI Whisper for speech-to-text
 """
 
-import whisper
 import asyncio
-from functools import partial
+import numpy as np
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 from app.core.config import settings
+from app.services.ai_pipeline.audio_decoder import DecodedAudio
+from app.services.ai_pipeline.audio_segmenter import pack_speech, plan_segments
+from app.services.ai_pipeline.model_registry import model_registry
+from app.services.ai_pipeline.stage_runner import stage_runner
+from app.services.ai_pipeline.whisper_backends import WHISPER_SAMPLE_RATE
+
+Interval = Tuple[float, float]
+
+# Silence inserted between speech intervals joined into one Whisper input
+JOIN_GAP_SECONDS = 0.3
 
 
 class WhisperTranscriber:
-    """Transcribe audio using Whisper model"""
+    """Transcribe audio using the configured Whisper backend"""
     
     def __init__(self):
         self.model = None
         self.model_name = settings.WHISPER_MODEL
+        self.backend_name = settings.WHISPER_BACKEND
     
     def _load_model(self):
-        """Load Whisper model (lazy loading)"""
+        """Get the shared Whisper model from the registry"""
         if self.model is None:
-            self.model = whisper.load_model(self.model_name)
+            self.model = model_registry.get_whisper_model()
+    
+    def _transcribe(self, samples) -> dict:
+        """Run Whisper on the shared backend (one decode at a time)"""
+        self._load_model()
+        
+        with model_registry.whisper_lock:
+            return self.model.transcribe(samples)
     
-    async def transcribe(self, video_path: str) -> str:
+    async def transcribe(
+        self,
+        audio: DecodedAudio,
+        speech: Optional[List[Interval]] = None,
+        on_progress: Optional[Callable[[float], Awaitable[None]]] = None
+    ) -> Dict:
         """
         Transcribe video audio
         
+        With speech intervals from VAD only speech is transcribed, packed
+        into segments of at most TRANSCRIPTION_SEGMENT_SECONDS of speech.
+        Without them the whole recording is cut at quiet points instead.
+        Segments are transcribed in parallel across the transcription
+        workers and stitched back in order.
+        
         Args:
-            video_path: Path to video file
+            audio: Decoded audio shared by the pipeline
+            speech: Speech intervals, None if VAD didn't run
+            on_progress: Awaited with the fraction of segments done
             
         Returns:
-            Transcribed text
+            Transcribed text and timestamped segments
         """
-        self._load_model()
+        # Plan and transcribe in transcription workers (CPU-intensive)
+        segments = await stage_runner.run("transcription", plan_transcription, audio, speech)
+        done = 0
+        
+        async def run_segment(intervals: List[Interval]) -> Dict:
+            nonlocal done
+            piece = await stage_runner.run("transcription", run_transcription, audio, intervals)
+            done += 1
+            if on_progress is not None:
+                await on_progress(done / len(segments))
+            return piece
         
-        # Run transcription in thread pool (CPU-intensive)
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            partial(self.model.transcribe, video_path)
-        )
+        pieces = await asyncio.gather(*[run_segment(intervals) for intervals in segments])
         
-        return result["text"]
\ No newline at end of file
+        return {
+            "text": " ".join(piece["text"] for piece in pieces if piece["text"]),
+            "segments": [segment for piece in pieces for segment in piece["segments"]]
+        }
+
+
+def plan_transcription(audio: DecodedAudio, speech: Optional[List[Interval]] = None) -> List[List[Interval]]:
+    """Stage entry point, splits the recording into transcription segments"""
+    max_seconds = settings.TRANSCRIPTION_SEGMENT_SECONDS
+    if speech is None:
+        return [[segment] for segment in plan_segments(audio.samples, audio.sample_rate, max_seconds)]
+    return pack_speech(speech, audio.samples, audio.sample_rate, max_seconds)
+
+
+def _to_recording_time(t: float, offsets: List[Tuple[float, float, float]]) -> float:
+    """Map a time in the joined Whisper input back to recording time"""
+    for joined_start, start, end in reversed(offsets):
+        if t >= joined_start:
+            return min(end, start + (t - joined_start))
+    return offsets[0][1]
+
+
+def run_transcription(audio: DecodedAudio, intervals: List[Interval]) -> Dict:
+    """
+    Stage entry point, transcribes one segment inside a transcription worker
+    
+    The segment's intervals are joined with short gaps, so Whisper only
+    decodes speech.
+    
+    Args:
+        audio: Decoded audio (memory-mapped in worker processes)
+        intervals: Speech (start, end) pairs in seconds
+        
+    Returns:
+        Segment text and Whisper segments with timestamps in recording time
+    """
+    transcriber = WhisperTranscriber()
+    
+    # Whisper takes the PCM buffer directly, so it never re-runs ffmpeg
+    sr = audio.sample_rate
+    gap = np.zeros(int(JOIN_GAP_SECONDS * sr), dtype=np.float32)
+    parts = []
+    offsets = []
+    joined = 0.0
+    for start, end in intervals:
+        if parts:
+            parts.append(gap)
+            joined += len(gap) / sr
+        part = np.asarray(audio.samples[int(start * sr):int(end * sr)], dtype=np.float32)
+        offsets.append((joined, start, end))
+        parts.append(part)
+        joined += len(part) / sr
+    
+    piece = DecodedAudio(np.concatenate(parts), sr)
+    samples = piece.resampled(WHISPER_SAMPLE_RATE)
+    
+    result = transcriber._transcribe(samples)
+    
+    return {
+        "text": result["text"].strip(),
+        "segments": [
+            {
+                "start": round(_to_recording_time(segment["start"], offsets), 2),
+                "end": round(_to_recording_time(segment["end"], offsets), 2),
+                "text": segment["text"].strip()
+            }
+            for segment in result.get("segments", [])
+            if segment["text"].strip()
+        ]
+    }
@@ -0,0 +1,53 @@
+"""
+Stage Checkpoints
+Stage outputs persisted on the analysis as each stage completes, so a retry resumes
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.database import get_collection
+from app.models.analysis import AnalysisStatus
+
+
+class StageCheckpoints:
+    """
+    Checkpointed stage outputs of one analysis
+
+    Stored under `checkpoints.<stage>` on the analysis document as
+    {"version", "output", "completed_at"}. An output is only reused when
+    its version matches the stage's current version, so changed settings
+    or code re-run the stage (and everything downstream of it).
+    """
+
+    def __init__(self, analysis_id: Optional[str] = None, saved: Optional[Dict] = None):
+        self.analysis_id = analysis_id
+        self.saved = dict(saved or {})
+
+    def get(self, stage: str, version: str) -> Tuple[bool, Any]:
+        """
+        Stored output of a stage, if current
+
+        Returns:
+            (found, output)
+        """
+        entry = self.saved.get(stage)
+        if entry is None or entry.get("version") != version:
+            return False, None
+        return True, entry.get("output")
+
+    async def save(self, stage: str, version: str, output: Any):
+        """Persist a stage's output right away"""
+        entry = {"version": version, "output": output, "completed_at": datetime.utcnow()}
+        self.saved[stage] = entry
+
+        if self.analysis_id is None:
+            return
+
+        try:
+            await get_collection("analyses").update_one(
+                {"_id": self.analysis_id, "status": AnalysisStatus.PROCESSING},
+                {"$set": {f"checkpoints.{stage}": entry}}
+            )
+        except Exception as e:
+            print(f"⚠️ Checkpoint save failed for {self.analysis_id}/{stage}: {e}")
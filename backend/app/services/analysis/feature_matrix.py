@@ -0,0 +1,258 @@
+"""
+Feature Matrix
+Columnar in-memory copy of the scoring features of every completed analysis, for what-if scoring
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+from pymongo import ASCENDING
+
+from app.core.config import settings
+from app.core.database import get_collection
+from app.models.analysis import AnalysisStatus
+from app.services.analysis.rescoring import PROJECTION, feature_arrays
+from app.services.analysis.scoring_engine import FEATURES, ScoringEngine, with_thresholds, with_weights
+
+LOAD_BATCH_SIZE = 5000
+
+# Catch-up queries reach this far behind the last one, for clock skew
+# between processes and analyses completing while the query runs
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+
+class FeatureMatrix:
+    """
+    One row per completed analysis, one float64 column per scoring feature
+
+    Loaded from Mongo on first use. Analyses completed in this process are
+    added as they complete; ones completed by standalone workers are picked
+    up by a `completed_at` query at most every FEATURE_MATRIX_REFRESH_SECONDS.
+    Rows are updated in place when an analysis completes again, and dropped
+    when it is queued for a retry, here at once and elsewhere by an
+    `updated_at` query on the same schedule.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self.size = 0
+        self.rows: Dict[str, int] = {}
+        self.ids: List[str] = []
+        self.columns: Dict[str, np.ndarray] = {}
+        self.mentors = np.zeros(0, dtype=np.int64)
+        self.active = np.zeros(0, dtype=bool)
+        self.mentor_codes: Dict[str, int] = {}
+        self.mentor_ids: List[str] = []
+        self.mentor_names: List[str] = []
+
+        self._lock = asyncio.Lock()
+        self._watermark: Optional[datetime] = None
+        self._refreshed_at = 0.0
+        self._allocate(0)
+
+    @property
+    def collection(self):
+        return get_collection("analyses")
+
+    async def ensure_indexes(self):
+        """Create the indexes used by catch-up queries"""
+        await self.collection.create_index([("status", ASCENDING), ("completed_at", ASCENDING)])
+        await self.collection.create_index([("updated_at", ASCENDING)])
+
+    def _allocate(self, capacity: int):
+        """Grow every column to hold `capacity` rows"""
+        def grown(array: Optional[np.ndarray], dtype) -> np.ndarray:
+            new = np.zeros(capacity, dtype=dtype)
+            if array is not None:
+                new[:self.size] = array[:self.size]
+            return new
+
+        self.columns = {
+            field: grown(self.columns.get(field), np.float64)
+            for _, field, _ in FEATURES
+        }
+        self.mentors = grown(self.mentors, np.int64)
+        self.active = grown(self.active, bool)
+
+    def _mentor_code(self, doc: Dict) -> int:
+        mentor_id = str(doc.get("mentor_id"))
+        code = self.mentor_codes.get(mentor_id)
+        if code is None:
+            code = self.mentor_codes[mentor_id] = len(self.mentor_ids)
+            self.mentor_ids.append(mentor_id)
+            self.mentor_names.append(doc.get("mentor_name") or "")
+        return code
+
+    def _put(self, docs: List[Dict]):
+        """Insert or overwrite the rows of some analyses"""
+        if not docs:
+            return
+
+        positions = []
+        for doc in docs:
+            row = self.rows.get(doc["_id"])
+            if row is None:
+                row = self.rows[doc["_id"]] = len(self.ids)
+                self.ids.append(doc["_id"])
+            positions.append(row)
+
+        if len(self.ids) > len(self.active):
+            self._allocate(max(len(self.ids), 2 * len(self.active), 1024))
+        self.size = len(self.ids)
+
+        positions = np.array(positions, dtype=np.int64)
+        for field, values in feature_arrays(docs).items():
+            self.columns[field][positions] = values
+        self.mentors[positions] = [self._mentor_code(doc) for doc in docs]
+        self.active[positions] = True
+
+    async def _query(self, query: Dict) -> int:
+        """Load analyses matching a query, returns how many"""
+        projection = {**PROJECTION, "mentor_id": 1, "mentor_name": 1}
+        cursor = self.collection.find(query, projection, batch_size=LOAD_BATCH_SIZE)
+
+        count = 0
+        batch: List[Dict] = []
+        async for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= LOAD_BATCH_SIZE:
+                self._put(batch)
+                count += len(batch)
+                batch = []
+        self._put(batch)
+        return count + len(batch)
+
+    async def _drop_reopened(self, since: datetime) -> int:
+        """Drop analyses changed since a time that are no longer completed, returns how many"""
+        query = {"status": {"$ne": AnalysisStatus.COMPLETED}, "updated_at": {"$gte": since}}
+        cursor = self.collection.find(query, {"_id": 1}, batch_size=LOAD_BATCH_SIZE)
+
+        count = 0
+        async for doc in cursor:
+            if doc["_id"] in self.rows:
+                self.remove(doc["_id"])
+                count += 1
+        return count
+
+    async def ensure_current(self):
+        """Load on first use, later catch up on analyses completed or reopened elsewhere"""
+        async with self._lock:
+            if self.loaded and time.monotonic() - self._refreshed_at < settings.FEATURE_MATRIX_REFRESH_SECONDS:
+                return
+
+            started_at = datetime.utcnow()
+            query = {"status": AnalysisStatus.COMPLETED}
+            if self.loaded:
+                since = self._watermark - REFRESH_OVERLAP
+                query["completed_at"] = {"$gte": since}
+
+            count = await self._query(query)
+            if self.loaded:
+                # Queued again by another process, e.g. a retry on another node
+                await self._drop_reopened(since)
+            if not self.loaded:
+                print(f"✅ Feature matrix loaded: {count} analyses")
+            self.loaded = True
+            self._watermark = started_at
+            self._refreshed_at = time.monotonic()
+
+    def add(self, doc: Dict):
+        """
+        Add a just-completed analysis
+
+        Args:
+            doc: Analysis document with mentor fields and stored features
+        """
+        if self.loaded:
+            self._put([doc])
+
+    def remove(self, analysis_id: str):
+        """Drop an analysis that is no longer completed"""
+        row = self.rows.get(analysis_id)
+        if row is not None:
+            self.active[row] = False
+
+    def simulate(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        thresholds: Optional[Dict[str, Dict]] = None,
+        limit: int = 50,
+        include_scores: bool = False
+    ) -> Dict:
+        """
+        Score every analysis with candidate weights/thresholds and rank mentors
+
+        Args:
+            weights: Weights to replace, by metric
+            thresholds: Rubric parameters to replace, by metric
+            limit: Mentors to return, best first
+            include_scores: Also return every analysis's simulated overall score
+
+        Returns:
+            Simulated and current mentor ranking, averages and effective rubric
+
+        Raises:
+            ValueError: Invalid weights or thresholds
+        """
+        started = time.perf_counter()
+        candidate_weights = with_weights(weights or {})
+        candidate_rubric = with_thresholds(thresholds or {})
+
+        rows = np.flatnonzero(self.active[:self.size])
+        features = {field: column[rows] for field, column in self.columns.items()}
+        mentors = self.mentors[rows]
+
+        engine = ScoringEngine()
+        overall = engine.calculate_scores_batch(features, candidate_weights, candidate_rubric)["overall"]
+        current = engine.calculate_scores_batch(features)["overall"]
+
+        # Per-mentor averages, mentors without analyses left out
+        sessions = np.bincount(mentors, minlength=len(self.mentor_ids))
+        present = np.flatnonzero(sessions)
+        averages = np.bincount(mentors, weights=overall, minlength=len(self.mentor_ids))[present] / sessions[present]
+        current_averages = np.bincount(mentors, weights=current, minlength=len(self.mentor_ids))[present] / sessions[present]
+
+        order = np.argsort(-averages, kind="stable")
+        current_order = np.argsort(-current_averages, kind="stable")
+        ranks = np.empty(len(present), dtype=np.int64)
+        ranks[order] = np.arange(1, len(present) + 1)
+        current_ranks = np.empty(len(present), dtype=np.int64)
+        current_ranks[current_order] = np.arange(1, len(present) + 1)
+
+        ranking = []
+        for i in order[:limit].tolist():
+            code = int(present[i])
+            ranking.append({
+                "rank": int(ranks[i]),
+                "previous_rank": int(current_ranks[i]),
+                "rank_change": int(current_ranks[i] - ranks[i]),
+                "id": self.mentor_ids[code],
+                "mentor_name": self.mentor_names[code],
+                "average_score": round(float(averages[i]), 2),
+                "previous_average_score": round(float(current_averages[i]), 2),
+                "total_sessions": int(sessions[code])
+            })
+
+        result = {
+            "analyses": len(rows),
+            "mentors": len(present),
+            "weights": candidate_weights,
+            "thresholds": candidate_rubric,
+            "average_overall": round(float(overall.mean()), 2) if len(rows) else 0.0,
+            "previous_average_overall": round(float(current.mean()), 2) if len(rows) else 0.0,
+            "rank_changes": int(np.count_nonzero(ranks != current_ranks)),
+            "ranking": ranking
+        }
+        if include_scores:
+            result["analysis_ids"] = [self.ids[row] for row in rows.tolist()]
+            result["overall_scores"] = np.round(overall, 2).tolist()
+
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+
+# Global feature matrix
+feature_matrix = FeatureMatrix()
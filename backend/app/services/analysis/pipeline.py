@@ -0,0 +1,142 @@
+"""
+Analysis Pipeline
+Runs the AI pipeline and scoring for one analysis
+"""
+
+import os
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import AnalysisTimings, stage
+from app.services.ai_pipeline.term_matcher import term_analysis, term_vocabularies
+from app.services.analysis.checkpoints import StageCheckpoints
+from app.services.analysis.video_processor import VideoProcessor
+from app.services.analysis.scoring_engine import ScoringEngine, scoring_version
+from app.services.analysis.result_cache import result_cache
+from app.services.jobs.progress import ProgressTracker
+
+
+def get_video_path(analysis: Dict) -> str:
+    """Path of an analysis's uploaded video"""
+    return os.path.join(settings.UPLOAD_DIR, "videos", analysis["video_filename"])
+
+
+def match_subject_terms(results: Dict, subject: Optional[str]) -> Dict:
+    """
+    Recount technical terms for the analysis's subject
+
+    Cached results may come from an upload with a different subject (or an
+    older vocabulary). Term matching is cheap, so redo it instead of
+    re-running the LLM.
+
+    Args:
+        results: Pipeline results from the result cache
+        subject: Subject of the analysis being scored
+
+    Returns:
+        Results with nlp_analysis term fields for this subject
+    """
+    nlp = results.get("nlp_analysis")
+    if not nlp or not results.get("transcript"):
+        return results
+
+    matcher = term_vocabularies.matcher_for(subject)
+    if nlp.get("vocabulary") == matcher.name and nlp.get("vocabulary_version") == matcher.version:
+        return results
+
+    nlp = dict(nlp)
+    nlp.update(term_analysis(results["transcript"], subject))
+    return {**results, "nlp_analysis": nlp}
+
+
+def score_results(results: Dict) -> Dict:
+    """
+    Score pipeline results
+
+    Args:
+        results: Pipeline outputs (fresh or from the result cache)
+
+    Returns:
+        Fields to store on the analysis document
+    """
+    with stage("scoring"):
+        scoring_engine = ScoringEngine()
+
+        # Calculate scores
+        scores = scoring_engine.calculate_scores(results)
+
+        # Generate insights
+        insights = scoring_engine.generate_insights(results, scores)
+
+    fields = {
+        "scores": scores,
+        "scoring_version": scoring_version(),
+        "insights": insights,
+        "transcript": results.get("transcript"),
+        "transcript_segments": results.get("transcript_segments"),
+        "audio_features": results.get("audio_features"),
+        "visual_features": results.get("visual_features"),
+        "nlp_analysis": results.get("nlp_analysis"),
+        "video_duration": results.get("duration")
+    }
+
+    if results.get("source_analysis_id"):
+        fields["cached_from"] = results["source_analysis_id"]
+
+    return fields
+
+
+async def run_analysis(analysis: Dict, timings: Optional[AnalysisTimings] = None) -> Dict:
+    """
+    Process an analysis's video end to end
+
+    Identical videos (same hash and pipeline version) reuse stored
+    pipeline outputs and only get rescored. Otherwise stage checkpoints
+    from earlier attempts are reused. Stage progress is reported
+    as it goes; progress, stage timings and the stage graph's execution
+    trace are stored with the results.
+
+    Args:
+        analysis: Analysis document
+        timings: Collects stage measurements, created if not given
+
+    Returns:
+        Fields to store on the analysis document
+    """
+    video_sha256 = analysis.get("video_sha256")
+
+    subject = analysis.get("subject")
+    progress = ProgressTracker(analysis["_id"])
+    timings = timings or AnalysisTimings()
+
+    with timings.active():
+        results = None
+        trace = None
+        if video_sha256:
+            results = await result_cache.get(video_sha256)
+
+        if results is not None:
+            results = match_subject_terms(results, subject)
+            progress.skip("decoding", "transcribing", "audio", "visual", "nlp")
+        else:
+            # Process video
+            # Resume from stages an earlier attempt finished
+            checkpoints = StageCheckpoints(analysis["_id"], analysis.get("checkpoints"))
+            video_processor = VideoProcessor(get_video_path(analysis), subject, progress)
+            results = await video_processor.process(checkpoints)
+            trace = video_processor.trace
+
+            # Fallback output (LLM outage, simulated visuals, timeouts)
+            # must not be handed to later uploads of the same video
+            if video_sha256 and not video_processor.degraded:
+                await result_cache.put(video_sha256, results, analysis["_id"])
+
+        await progress.start("scoring")
+        fields = score_results(results)
+        await progress.finish("scoring")
+
+    fields["progress"] = progress.snapshot()
+    fields["timings"] = timings.as_dict()
+    if trace is not None:
+        fields["pipeline_trace"] = trace
+    return fields
@@ -0,0 +1,192 @@
+"""
+Bulk Rescoring
+Recompute scores of completed analyses from their stored features, without re-running models
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from pymongo import UpdateOne
+
+from app.core.database import get_collection
+from app.models.analysis import AnalysisStatus
+from app.services.analysis.scoring_engine import FEATURES, SCORE_METRICS, ScoringEngine, scoring_version
+
+# Only the features the rubric reads are fetched
+PROJECTION = {f"{section}.{field}": 1 for section, field, _ in FEATURES}
+
+
+def feature_arrays(docs: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Column arrays of the rubric's features
+
+    Args:
+        docs: Analysis documents (projected to PROJECTION)
+
+    Returns:
+        One float64 array per feature, defaults filled in where missing
+    """
+    sections = {}
+    arrays = {}
+    for section, field, default in FEATURES:
+        if section not in sections:
+            sections[section] = [doc.get(section) or {} for doc in docs]
+        # None (missing) becomes NaN
+        column = np.array([values.get(field) for values in sections[section]], dtype=np.float64)
+        arrays[field] = np.where(np.isnan(column), default, column)
+    return arrays
+
+
+def score_values(values: np.ndarray, clipped: bool = True) -> List:
+    """
+    Scores as calculate_scores returns them
+
+    Rounded to 2 decimals exactly like round(): np.round scales by 100
+    first, which can land the other side of a tie, so values that close
+    to one go through round() instead. Metric scores at the 0/100 bounds
+    come out of min()/max() as ints there, and are ints here too.
+
+    Args:
+        values: Unrounded scores from calculate_scores_batch
+        clipped: Metric scores (clipped to 0-100), False for "overall"
+
+    Returns:
+        Python numbers, one per analysis
+    """
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(float(values[i]), 2)
+
+    result = rounded.tolist()
+    if clipped:
+        for i in np.flatnonzero((values == 0) | (values == 100)):
+            result[i] = int(values[i])
+    return result
+
+
+class Rescorer:
+    """
+    Rescore completed analyses in batches
+
+    Streams stored features from Mongo, scores each batch with the
+    vectorized rubric and writes scores, insights and `scoring_version`
+    back with one unordered bulk_write per batch. The write of a batch
+    overlaps reading the next one.
+
+    Analyses already at the current scoring version are skipped unless
+    `everything` is set, so an interrupted run can simply be restarted.
+    """
+
+    def __init__(self, batch_size: int = 2000, dry_run: bool = False):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.engine = ScoringEngine()
+
+    @property
+    def collection(self):
+        return get_collection("analyses")
+
+    def score(self, docs: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Score a batch with the vectorized rubric
+
+        Returns:
+            (scores, insights) of each analysis, as calculate_scores and
+            generate_insights would give them
+        """
+        columns = self.engine.calculate_scores_batch(feature_arrays(docs))
+        columns = {name: score_values(columns[name], name != "overall") for name in SCORE_METRICS}
+        insights = self.engine.generate_insights_batch(columns)
+
+        values = [columns[name] for name in SCORE_METRICS]
+        scores = [dict(zip(SCORE_METRICS, row)) for row in zip(*values)]
+        return scores, insights
+
+    def score_batch(self, docs: List[Dict], version: str) -> List[UpdateOne]:
+        """
+        Scores and insights of a batch, as update operations
+
+        Only completed analyses are updated, so one picked up for
+        reprocessing meanwhile keeps the scores it gets from the pipeline.
+        """
+        scores, insights = self.score(docs)
+        now = datetime.utcnow()
+
+        return [
+            UpdateOne(
+                {"_id": doc["_id"], "status": AnalysisStatus.COMPLETED},
+                {"$set": {
+                    "scores": doc_scores,
+                    "insights": doc_insights,
+                    "scoring_version": version,
+                    "rescored_at": now
+                }}
+            )
+            for doc, doc_scores, doc_insights in zip(docs, scores, insights)
+        ]
+
+    async def run(self, everything: bool = False, limit: Optional[int] = None) -> Dict:
+        """
+        Rescore completed analyses
+
+        Args:
+            everything: Also rescore analyses already at the current version
+            limit: Stop after this many analyses
+
+        Returns:
+            Counts and throughput of the run
+        """
+        version = scoring_version()
+        query = {"status": AnalysisStatus.COMPLETED}
+        if not everything:
+            query["scoring_version"] = {"$ne": version}
+
+        started = time.perf_counter()
+        stats = {"scoring_version": version, "scanned": 0, "updated": 0, "batches": 0}
+
+        cursor = self.collection.find(query, PROJECTION, batch_size=self.batch_size)
+        if limit:
+            cursor = cursor.limit(limit)
+
+        pending = None
+        batch: List[Dict] = []
+
+        def flush(docs: List[Dict]) -> Optional[asyncio.Future]:
+            operations = self.score_batch(docs, version)
+            stats["scanned"] += len(docs)
+            stats["batches"] += 1
+            if self.dry_run:
+                return None
+            return asyncio.ensure_future(self.collection.bulk_write(operations, ordered=False))
+
+        async def written(task):
+            if task is not None:
+                result = await task
+                stats["updated"] += result.modified_count
+
+        try:
+            async for doc in cursor:
+                batch.append(doc)
+                if len(batch) >= self.batch_size:
+                    # Keep one write in flight while the next batch is read
+                    await written(pending)
+                    pending = flush(batch)
+                    batch = []
+
+            if batch:
+                await written(pending)
+                pending = flush(batch)
+            await written(pending)
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+
+        elapsed = time.perf_counter() - started
+        stats["seconds"] = round(elapsed, 2)
+        stats["per_second"] = round(stats["scanned"] / elapsed) if elapsed > 0 else 0
+        return stats
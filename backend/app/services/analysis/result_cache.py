@@ -0,0 +1,82 @@
+"""
+Result Cache
+Content-addressed store of pipeline outputs, keyed by video hash and pipeline version
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.core.database import get_collection
+from app.services.analysis.video_processor import stage_versions
+
+# Bump when how results are assembled changes; stage changes are
+# covered by their versions in video_processor.stage_versions()
+PIPELINE_VERSION = "3"
+
+
+class ResultCache:
+    """Reuse transcript, features and NLP analysis for identical videos"""
+
+    # Pipeline outputs worth reusing, scores/insights are always recomputed
+    FIELDS = ("transcript", "transcript_segments", "audio_features", "visual_features", "nlp_analysis", "duration")
+
+    def __init__(self, collection_name: str = "pipeline_cache"):
+        self.collection_name = collection_name
+
+    @property
+    def collection(self):
+        return get_collection(self.collection_name)
+
+    def pipeline_version(self) -> str:
+        """Version string covering pipeline code and the settings of every stage"""
+        parts = [PIPELINE_VERSION] + [
+            f"{stage}={version}" for stage, version in sorted(stage_versions().items())
+        ]
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+    def key(self, video_sha256: str) -> str:
+        """Cache key for a video"""
+        return f"{video_sha256}:{self.pipeline_version()}"
+
+    def is_cacheable(self, results: Dict) -> bool:
+        """Only keep complete results, a failed stage shouldn't stick"""
+        return bool(results.get("transcript")) and bool(results.get("nlp_analysis"))
+
+    async def get(self, video_sha256: str) -> Optional[Dict]:
+        """
+        Look up stored pipeline outputs
+
+        Returns:
+            Pipeline results (same shape as VideoProcessor.process) or None
+        """
+        entry = await self.collection.find_one({"_id": self.key(video_sha256)})
+        if entry is None:
+            return None
+
+        results = {field: entry.get(field) for field in self.FIELDS}
+        results["source_analysis_id"] = entry.get("source_analysis_id")
+        return results
+
+    async def put(self, video_sha256: str, results: Dict, analysis_id: str = None):
+        """Store pipeline outputs for a video"""
+        if not self.is_cacheable(results):
+            return
+
+        entry = {field: results.get(field) for field in self.FIELDS}
+        entry.update({
+            "video_sha256": video_sha256,
+            "pipeline_version": self.pipeline_version(),
+            "source_analysis_id": analysis_id,
+            "created_at": datetime.utcnow()
+        })
+
+        await self.collection.replace_one(
+            {"_id": self.key(video_sha256)},
+            entry,
+            upsert=True
+        )
+
+
+# Global result cache
+result_cache = ResultCache()
@@ -4,7 +4,174 @@ Custom scoring system combining multimodal AI analysis
 Team: Veeresh, Shivraj, Shivakumar, Tharungowda
 """
 
-from typing import Dict, List
+import hashlib
+import json
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Bump when the scoring logic changes in a way WEIGHTS/RUBRIC don't capture
+SCORING_LOGIC_VERSION = "1"
+
+WEIGHTS = {
+    "engagement": 0.20,
+    "communication": 0.20,
+    "technical_depth": 0.30,
+    "clarity": 0.20,
+    "interaction": 0.10
+}
+
+# Base scores, thresholds and bonuses of each metric. Shared by the
+# per-analysis scorer and the vectorized one used for bulk rescoring.
+RUBRIC = {
+    "engagement": {
+        "base": 70.0,
+        "gesture_count_min": 10, "gesture_bonus": 10,
+        "face_confidence_min": 0.8, "face_bonus": 10,
+        "energy_scale": 10
+    },
+    "communication": {
+        "base": 70.0,
+        "optimal_wpm": (130, 170), "optimal_wpm_bonus": 15,
+        "good_wpm": (120, 180), "good_wpm_bonus": 10,
+        "clarity_scale": 15
+    },
+    "technical_depth": {
+        "base": 65.0,
+        "term_count_min": 5, "term_bonus": 20,
+        "depth_scale": 15
+    },
+    "clarity": {
+        "base": 70.0,
+        "optimal_pause_ratio": (0.10, 0.20), "pause_bonus": 15,
+        "structure_scale": 15
+    },
+    "interaction": {
+        "base": 60.0,
+        "question_count_min": 3, "question_bonus": 20,
+        "eye_contact_min": 0.6, "eye_contact_bonus": 20
+    }
+}
+
+# Stored features the rubric reads: (section, field, value when missing)
+FEATURES = (
+    ("audio_features", "energy_mean", 0.5),
+    ("audio_features", "speech_rate", 150),
+    ("audio_features", "pause_ratio", 0.15),
+    ("visual_features", "gesture_count", 0),
+    ("visual_features", "face_confidence", 0),
+    ("visual_features", "eye_contact_ratio", 0),
+    ("nlp_analysis", "clarity_score", 0),
+    ("nlp_analysis", "technical_term_count", 0),
+    ("nlp_analysis", "technical_depth_score", 0),
+    ("nlp_analysis", "structure_score", 0),
+    ("nlp_analysis", "question_count", 0)
+)
+FEATURE_DEFAULTS = {field: default for _, field, default in FEATURES}
+
+METRICS = ("engagement", "communication", "technical_depth", "clarity", "interaction")
+SCORE_METRICS = METRICS + ("overall",)
+
+# Insights: metric scores from STRENGTH_MIN are strengths, below
+# IMPROVEMENT_BELOW need improvement; highlights by overall score band
+STRENGTH_MIN = 85
+IMPROVEMENT_BELOW = 70
+EXCELLENT_OVERALL = 90
+HIGHLIGHTS = (
+    (90, "Exceptional teaching performance across all metrics"),
+    (80, "Strong teaching performance with minor areas for growth"),
+    (70, "Good teaching foundation with opportunities for improvement"),
+    (0, "Developing teaching skills with focused improvement needed")
+)
+
+STRENGTH_MESSAGES = {
+    "engagement": "Outstanding student engagement (Score: {score}/100)",
+    "communication": "Excellent communication clarity (Score: {score}/100)",
+    "technical_depth": "Strong technical knowledge (Score: {score}/100)",
+    "clarity": "Very clear explanations (Score: {score}/100)",
+    "interaction": "Effective student interaction (Score: {score}/100)"
+}
+IMPROVEMENT_MESSAGES = {
+    "engagement": "Student engagement needs improvement (Score: {score}/100)",
+    "communication": "Communication could be enhanced (Score: {score}/100)",
+    "technical_depth": "Technical depth requires strengthening (Score: {score}/100)",
+    "clarity": "Explanations need better structure (Score: {score}/100)",
+    "interaction": "Increase student interaction (Score: {score}/100)"
+}
+RECOMMENDATIONS = {
+    "engagement": ["Use more real-world examples", "Add interactive elements"],
+    "communication": ["Practice pronunciation", "Work on pacing"],
+    "technical_depth": ["Deepen subject knowledge", "Add practical examples"],
+    "clarity": ["Create structured outlines", "Break down complex topics"],
+    "interaction": ["Schedule Q&A sessions", "Encourage questions"]
+}
+EXCELLENT_RECOMMENDATION = "Excellent performance! Consider mentoring other instructors."
+
+
+def scoring_version() -> str:
+    """Version string covering the weights, rubric, insight rules and scoring logic"""
+    rubric = json.dumps([
+        SCORING_LOGIC_VERSION, WEIGHTS, RUBRIC,
+        STRENGTH_MIN, IMPROVEMENT_BELOW, EXCELLENT_OVERALL, HIGHLIGHTS,
+        STRENGTH_MESSAGES, IMPROVEMENT_MESSAGES, RECOMMENDATIONS, EXCELLENT_RECOMMENDATION
+    ], sort_keys=True)
+    return hashlib.sha256(rubric.encode()).hexdigest()[:16]
+
+
+def with_weights(overrides: Dict[str, float]) -> Dict[str, float]:
+    """
+    WEIGHTS with some weights replaced
+
+    Raises:
+        ValueError: Unknown metric, or a negative or non-finite weight
+    """
+    weights = dict(WEIGHTS)
+    for metric, weight in overrides.items():
+        if metric not in weights:
+            raise ValueError(f"Unknown metric {metric!r}, expected one of {list(METRICS)}")
+        if not math.isfinite(weight):
+            raise ValueError(f"Weight of {metric!r} must be a finite number")
+        if weight < 0:
+            raise ValueError(f"Weight of {metric!r} must not be negative")
+        weights[metric] = weight
+    return weights
+
+
+def with_thresholds(overrides: Dict[str, Dict[str, Any]]) -> Dict[str, Dict]:
+    """
+    RUBRIC with some parameters replaced, e.g. {"engagement": {"gesture_count_min": 5}}
+
+    Raises:
+        ValueError: Unknown metric or parameter, or a value of the wrong shape or not finite
+    """
+    rubric = {metric: dict(params) for metric, params in RUBRIC.items()}
+    for metric, params in overrides.items():
+        if metric not in rubric:
+            raise ValueError(f"Unknown metric {metric!r}, expected one of {list(METRICS)}")
+        for name, value in params.items():
+            if name not in rubric[metric]:
+                raise ValueError(f"Unknown parameter {name!r} for {metric!r}, expected one of {list(rubric[metric])}")
+
+            # Ranges are (low, high) pairs, everything else a number
+            if isinstance(rubric[metric][name], tuple):
+                if not isinstance(value, (list, tuple)) or len(value) != 2 or value[0] > value[1]:
+                    raise ValueError(f"{metric}.{name} must be a [low, high] range")
+                value = (float(value[0]), float(value[1]))
+            elif isinstance(value, (list, tuple)):
+                raise ValueError(f"{metric}.{name} must be a number")
+
+            # NaN/Infinity would silently score every analysis as NaN or 0/100
+            if not all(math.isfinite(v) for v in (value if isinstance(value, tuple) else (value,))):
+                raise ValueError(f"{metric}.{name} must be finite")
+            rubric[metric][name] = value
+    return rubric
+
+
+def _feature(section: Dict, field: str) -> float:
+    """A stored feature, or its default when missing"""
+    value = (section or {}).get(field)
+    return FEATURE_DEFAULTS[field] if value is None else value
 
 
 class ScoringEngine:
@@ -17,20 +184,14 @@ class ScoringEngine:
     - Interaction (10%)
     """
     
-    WEIGHTS = {
-        "engagement": 0.20,
-        "communication": 0.20,
-        "technical_depth": 0.30,
-        "clarity": 0.20,
-        "interaction": 0.10
-    }
+    WEIGHTS = WEIGHTS
     
     def calculate_scores(self, analysis_results: Dict) -> Dict:
         """Calculate all scores based on multimodal analysis"""
         
-        audio_features = analysis_results.get("audio_features", {})
-        visual_features = analysis_results.get("visual_features", {})
-        nlp_analysis = analysis_results.get("nlp_analysis", {})
+        audio_features = analysis_results.get("audio_features") or {}
+        visual_features = analysis_results.get("visual_features") or {}
+        nlp_analysis = analysis_results.get("nlp_analysis") or {}
         
         # Calculate individual scores
         engagement = self._calculate_engagement(visual_features, audio_features)
@@ -57,22 +218,90 @@ class ScoringEngine:
             "overall": round(overall, 2)
         }
     
+    def calculate_scores_batch(
+        self,
+        features: Dict[str, np.ndarray],
+        weights: Optional[Dict[str, float]] = None,
+        rubric: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized calculate_scores over many analyses
+        
+        Evaluates the same rubric as the per-analysis methods below, in the
+        same order, so results are bit-identical before rounding.
+        
+        Args:
+            features: One float array per FEATURES field, missing values
+                already replaced by their defaults
+            weights: Candidate weights (see with_weights), default WEIGHTS
+            rubric: Candidate rubric (see with_thresholds), default RUBRIC
+        
+        Returns:
+            Unrounded score arrays by metric, plus "overall"
+        """
+        f = features
+        weights = weights or self.WEIGHTS
+        rubric = rubric or RUBRIC
+        
+        r = rubric["engagement"]
+        engagement = r["base"] + np.where(f["gesture_count"] > r["gesture_count_min"], r["gesture_bonus"], 0)
+        engagement = engagement + np.where(f["face_confidence"] > r["face_confidence_min"], r["face_bonus"], 0)
+        engagement = engagement + f["energy_mean"] * r["energy_scale"]
+        
+        r = rubric["communication"]
+        wpm = f["speech_rate"]
+        optimal = (r["optimal_wpm"][0] <= wpm) & (wpm <= r["optimal_wpm"][1])
+        good = (r["good_wpm"][0] <= wpm) & (wpm <= r["good_wpm"][1])
+        communication = r["base"] + np.where(optimal, r["optimal_wpm_bonus"], np.where(good, r["good_wpm_bonus"], 0))
+        communication = communication + f["clarity_score"] * r["clarity_scale"]
+        
+        r = rubric["technical_depth"]
+        technical = r["base"] + np.where(f["technical_term_count"] > r["term_count_min"], r["term_bonus"], 0)
+        technical = technical + f["technical_depth_score"] * r["depth_scale"]
+        
+        r = rubric["clarity"]
+        pause_ratio = f["pause_ratio"]
+        optimal = (r["optimal_pause_ratio"][0] <= pause_ratio) & (pause_ratio <= r["optimal_pause_ratio"][1])
+        clarity = r["base"] + np.where(optimal, r["pause_bonus"], 0)
+        clarity = clarity + f["structure_score"] * r["structure_scale"]
+        
+        r = rubric["interaction"]
+        interaction = r["base"] + np.where(f["question_count"] > r["question_count_min"], r["question_bonus"], 0)
+        interaction = interaction + np.where(f["eye_contact_ratio"] > r["eye_contact_min"], r["eye_contact_bonus"], 0)
+        
+        scores = {
+            "engagement": np.clip(engagement, 0, 100),
+            "communication": np.clip(communication, 0, 100),
+            "technical_depth": np.clip(technical, 0, 100),
+            "clarity": np.clip(clarity, 0, 100),
+            "interaction": np.clip(interaction, 0, 100)
+        }
+        scores["overall"] = (
+            scores["engagement"] * weights["engagement"] +
+            scores["communication"] * weights["communication"] +
+            scores["technical_depth"] * weights["technical_depth"] +
+            scores["clarity"] * weights["clarity"] +
+            scores["interaction"] * weights["interaction"]
+        )
+        return scores
+    
     def _calculate_engagement(self, visual: Dict, audio: Dict) -> float:
         """
         Engagement Score (0-100)
         Factors: gestures, face presence, energy
         """
-        score = 70.0  # Base score
+        r = RUBRIC["engagement"]
+        score = r["base"]
         
         # Visual engagement indicators
-        if visual.get("gesture_count", 0) > 10:
-            score += 10
-        if visual.get("face_confidence", 0) > 0.8:
-            score += 10
+        if _feature(visual, "gesture_count") > r["gesture_count_min"]:
+            score += r["gesture_bonus"]
+        if _feature(visual, "face_confidence") > r["face_confidence_min"]:
+            score += r["face_bonus"]
         
         # Audio energy
-        energy = audio.get("energy_mean", 0.5)
-        score += (energy * 10)
+        energy = _feature(audio, "energy_mean")
+        score += (energy * r["energy_scale"])
         
         return min(100, max(0, score))
     
@@ -81,18 +310,18 @@ class ScoringEngine:
         Communication Score (0-100)
         Factors: speech rate, clarity from NLP
         """
-        score = 70.0
+        r = RUBRIC["communication"]
+        score = r["base"]
         
         # Speech rate (optimal: 130-170 wpm)
-        wpm = audio.get("speech_rate", 150)
-        if 130 <= wpm <= 170:
-            score += 15
-        elif 120 <= wpm <= 180:
-            score += 10
+        wpm = _feature(audio, "speech_rate")
+        if r["optimal_wpm"][0] <= wpm <= r["optimal_wpm"][1]:
+            score += r["optimal_wpm_bonus"]
+        elif r["good_wpm"][0] <= wpm <= r["good_wpm"][1]:
+            score += r["good_wpm_bonus"]
         
         # Clarity from NLP
-        if nlp.get("clarity_score"):
-            score += (nlp["clarity_score"] * 15)
+        score += (_feature(nlp, "clarity_score") * r["clarity_scale"])
         
         return min(100, max(0, score))
     
@@ -101,15 +330,15 @@ class ScoringEngine:
         Technical Depth Score (0-100)
         Factors: technical terms, depth from LLaMA
         """
-        score = 65.0
+        r = RUBRIC["technical_depth"]
+        score = r["base"]
         
         # Technical terms usage
-        if nlp.get("technical_term_count", 0) > 5:
-            score += 20
+        if _feature(nlp, "technical_term_count") > r["term_count_min"]:
+            score += r["term_bonus"]
         
         # Content depth from LLaMA
-        if nlp.get("technical_depth_score"):
-            score += (nlp["technical_depth_score"] * 15)
+        score += (_feature(nlp, "technical_depth_score") * r["depth_scale"])
         
         return min(100, max(0, score))
     
@@ -118,16 +347,16 @@ class ScoringEngine:
         Clarity Score (0-100)
         Factors: pause ratio, sentence structure
         """
-        score = 70.0
+        r = RUBRIC["clarity"]
+        score = r["base"]
         
         # Pause ratio (optimal: 0.10-0.20)
-        pause_ratio = audio.get("pause_ratio", 0.15)
-        if 0.10 <= pause_ratio <= 0.20:
-            score += 15
+        pause_ratio = _feature(audio, "pause_ratio")
+        if r["optimal_pause_ratio"][0] <= pause_ratio <= r["optimal_pause_ratio"][1]:
+            score += r["pause_bonus"]
         
         # Sentence structure from NLP
-        if nlp.get("structure_score"):
-            score += (nlp["structure_score"] * 15)
+        score += (_feature(nlp, "structure_score") * r["structure_scale"])
         
         return min(100, max(0, score))
     
@@ -136,15 +365,16 @@ class ScoringEngine:
         Interaction Score (0-100)
         Factors: questions, eye contact
         """
-        score = 60.0
+        r = RUBRIC["interaction"]
+        score = r["base"]
         
         # Question patterns
-        if nlp.get("question_count", 0) > 3:
-            score += 20
+        if _feature(nlp, "question_count") > r["question_count_min"]:
+            score += r["question_bonus"]
         
         # Eye contact
-        if visual.get("eye_contact_ratio", 0) > 0.6:
-            score += 20
+        if _feature(visual, "eye_contact_ratio") > r["eye_contact_min"]:
+            score += r["eye_contact_bonus"]
         
         return min(100, max(0, score))
     
@@ -160,15 +390,15 @@ class ScoringEngine:
             if metric == "overall":
                 continue
             
-            if score >= 85:
+            if score >= STRENGTH_MIN:
                 strengths.append(self._get_strength_message(metric, score))
-            elif score < 70:
+            elif score < IMPROVEMENT_BELOW:
                 improvements.append(self._get_improvement_message(metric, score))
                 recommendations.extend(self._get_recommendations(metric))
         
         # Overall recommendations
-        if scores["overall"] >= 90:
-            recommendations.append("Excellent performance! Consider mentoring other instructors.")
+        if scores["overall"] >= EXCELLENT_OVERALL:
+            recommendations.append(EXCELLENT_RECOMMENDATION)
         
         return {
             "strengths": strengths[:5],
@@ -177,44 +407,70 @@ class ScoringEngine:
             "key_highlights": self._generate_key_highlights(analysis_results, scores)
         }
     
+    def generate_insights_batch(self, scores: Dict[str, List[float]]) -> List[Dict]:
+        """
+        Insights for many analyses at once
+        
+        Analyses are grouped by which metrics are strengths or need
+        improvement and by overall band; recommendations and highlights are
+        worked out once per group, only the messages are formatted per analysis.
+        
+        Args:
+            scores: Rounded scores of each analysis by metric, plus "overall"
+        
+        Returns:
+            Insights of each analysis, in order
+        """
+        overall = np.array(scores["overall"], dtype=np.float64)
+        
+        # 0 = neither, 1 = strength, 2 = needs improvement, per metric
+        codes = np.zeros(len(overall), dtype=np.int64)
+        for k, metric in enumerate(METRICS):
+            values = np.array(scores[metric], dtype=np.float64)
+            category = np.where(values >= STRENGTH_MIN, 1, np.where(values < IMPROVEMENT_BELOW, 2, 0))
+            codes += category * 3 ** k
+        band = np.searchsorted(-np.array([limit for limit, _ in HIGHLIGHTS[:-1]]), -overall, side="left")
+        codes += 3 ** len(METRICS) * (band * 2 + (overall >= EXCELLENT_OVERALL))
+        
+        groups = {}
+        insights = []
+        for i, code in enumerate(codes.tolist()):
+            group = groups.get(code)
+            if group is None:
+                row = {metric: scores[metric][i] for metric in SCORE_METRICS}
+                pattern = self.generate_insights({}, row)
+                group = groups[code] = (
+                    [m for m in METRICS if row[m] >= STRENGTH_MIN],
+                    [m for m in METRICS if row[m] < IMPROVEMENT_BELOW],
+                    pattern["recommendations"],
+                    pattern["key_highlights"]
+                )
+            strong, weak, recommendations, highlights = group
+            insights.append({
+                "strengths": [STRENGTH_MESSAGES[m].format(score=scores[m][i]) for m in strong][:5],
+                "improvements": [IMPROVEMENT_MESSAGES[m].format(score=scores[m][i]) for m in weak][:5],
+                "recommendations": list(recommendations),
+                "key_highlights": highlights
+            })
+        return insights
+    
     def _get_strength_message(self, metric: str, score: float) -> str:
-        messages = {
-            "engagement": f"Outstanding student engagement (Score: {score}/100)",
-            "communication": f"Excellent communication clarity (Score: {score}/100)",
-            "technical_depth": f"Strong technical knowledge (Score: {score}/100)",
-            "clarity": f"Very clear explanations (Score: {score}/100)",
-            "interaction": f"Effective student interaction (Score: {score}/100)"
-        }
-        return messages.get(metric, f"Strong {metric}")
+        if metric in STRENGTH_MESSAGES:
+            return STRENGTH_MESSAGES[metric].format(score=score)
+        return f"Strong {metric}"
     
     def _get_improvement_message(self, metric: str, score: float) -> str:
-        messages = {
-            "engagement": f"Student engagement needs improvement (Score: {score}/100)",
-            "communication": f"Communication could be enhanced (Score: {score}/100)",
-            "technical_depth": f"Technical depth requires strengthening (Score: {score}/100)",
-            "clarity": f"Explanations need better structure (Score: {score}/100)",
-            "interaction": f"Increase student interaction (Score: {score}/100)"
-        }
-        return messages.get(metric, f"{metric} needs attention")
+        if metric in IMPROVEMENT_MESSAGES:
+            return IMPROVEMENT_MESSAGES[metric].format(score=score)
+        return f"{metric} needs attention"
     
     def _get_recommendations(self, metric: str) -> List[str]:
-        recommendations = {
-            "engagement": ["Use more real-world examples", "Add interactive elements"],
-            "communication": ["Practice pronunciation", "Work on pacing"],
-            "technical_depth": ["Deepen subject knowledge", "Add practical examples"],
-            "clarity": ["Create structured outlines", "Break down complex topics"],
-            "interaction": ["Schedule Q&A sessions", "Encourage questions"]
-        }
-        return recommendations.get(metric, [])
+        return list(RECOMMENDATIONS.get(metric, []))
     
     def _generate_key_highlights(self, results: Dict, scores: Dict) -> str:
         overall = scores["overall"]
         
-        if overall >= 90:
-            return "Exceptional teaching performance across all metrics"
-        elif overall >= 80:
-            return "Strong teaching performance with minor areas for growth"
-        elif overall >= 70:
-            return "Good teaching foundation with opportunities for improvement"
-        else:
-            return "Developing teaching skills with focused improvement needed"
\ No newline at end of file
+        for limit, highlight in HIGHLIGHTS:
+            if overall >= limit:
+                return highlight
+        return HIGHLIGHTS[-1][1]
\ No newline at end of file
@@ -0,0 +1,321 @@
+"""
+Stage Graph
+Declarative pipeline stages scheduled by their data dependencies
+"""
+
+import asyncio
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.metrics import collect_fallbacks, record_fallback
+from app.services.analysis.checkpoints import StageCheckpoints
+
+RESOURCE_CLASSES = ("cpu", "io", "llm")
+
+
+class StageSpec:
+    """
+    One pipeline stage
+
+    Args:
+        name: Stage name, used in traces and metrics
+        run: Coroutine function called with the input values, in order
+        output: Name of the value the stage produces
+        inputs: Names of values the stage needs
+        resource: "cpu" (heavy compute), "io" or "llm"
+        timeout: Seconds the stage may run once started, None for no limit
+        fallback: Builds the output when the stage fails or times out
+        when: Called with the input values; False skips the stage (output None)
+        release: Called with the output once every consumer has finished
+        progress: ProgressTracker stage reported while this stage runs
+        version: Code and settings the output depends on; bump to invalidate
+        checkpoint: Persist the output (must be BSON-serialisable) for resuming
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[..., Awaitable],
+        output: str,
+        inputs: Tuple[str, ...] = (),
+        resource: str = "cpu",
+        timeout: Optional[float] = None,
+        fallback: Callable[[], Any] = lambda: None,
+        when: Optional[Callable[..., bool]] = None,
+        release: Optional[Callable[[Any], None]] = None,
+        progress: Optional[str] = None,
+        version: str = "1",
+        checkpoint: bool = False
+    ):
+        if resource not in RESOURCE_CLASSES:
+            raise ValueError(f"Unknown resource class {resource!r} for stage {name!r}")
+
+        self.name = name
+        self.run = run
+        self.output = output
+        self.inputs = tuple(inputs)
+        self.resource = resource
+        self.timeout = timeout or None
+        self.fallback = fallback
+        self.when = when
+        self.release = release
+        self.progress = progress
+        self.version = version
+        self.checkpoint = checkpoint
+
+
+class ResourceLimits:
+    """
+    Process-wide concurrency limit per resource class
+
+    Shared by every analysis in the process, so two jobs can't both start
+    Whisper and MediaPipe on all cores at once.
+    """
+
+    def __init__(self):
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def limit_for(self, resource: str) -> int:
+        """Configured slots for a resource class"""
+        return max(1, {
+            "cpu": settings.STAGE_SLOTS_CPU,
+            "io": settings.STAGE_SLOTS_IO,
+            "llm": settings.STAGE_SLOTS_LLM,
+        }[resource])
+
+    def slot(self, resource: str) -> asyncio.Semaphore:
+        """Semaphore guarding a resource class"""
+        if resource not in self._semaphores:
+            self._semaphores[resource] = asyncio.Semaphore(self.limit_for(resource))
+        return self._semaphores[resource]
+
+
+class StageGraph:
+    """
+    Runs stages as soon as their inputs are ready
+
+    Every stage runs as its own task: it waits for the stages producing its
+    inputs, then for a slot of its resource class, then runs under its
+    timeout. A failed or timed-out stage yields its fallback value so the
+    rest of the pipeline still completes. `trace` records what happened.
+
+    With checkpoints, outputs of current versions are restored instead of
+    recomputed, and stages only run if something still needs their output.
+    An output is tainted when its stage or any stage upstream of it fell
+    back; tainted outputs are never checkpointed, so a retry recomputes them.
+    """
+
+    def __init__(self, stages: List[StageSpec], limits: Optional[ResourceLimits] = None):
+        self.stages = self._ordered(stages)
+        self.limits = limits or resource_limits
+        self.trace: List[Dict] = []
+        # Outputs of the last run built on fallback values, and the ones the caller needed
+        self.tainted: Set[str] = set()
+        self.required: Set[str] = set()
+
+    @staticmethod
+    def _ordered(stages: List[StageSpec]) -> List[StageSpec]:
+        """Validate the graph and return stages in dependency order"""
+        producers = {}
+        for spec in stages:
+            if spec.output in producers:
+                raise ValueError(f"Output {spec.output!r} produced by both {producers[spec.output].name!r} and {spec.name!r}")
+            producers[spec.output] = spec
+
+        for spec in stages:
+            missing = [name for name in spec.inputs if name not in producers]
+            if missing:
+                raise ValueError(f"Stage {spec.name!r} needs {missing}, which no stage produces")
+
+        ordered, placed = [], set()
+        remaining = list(stages)
+        while remaining:
+            ready = [s for s in remaining if all(producers[i].name in placed for i in s.inputs)]
+            if not ready:
+                raise ValueError(f"Stage graph has a cycle among {[s.name for s in remaining]}")
+            for spec in ready:
+                ordered.append(spec)
+                placed.add(spec.name)
+                remaining.remove(spec)
+
+        return ordered
+
+    @property
+    def degraded(self) -> bool:
+        """Whether a required output of the last run depends on a fallback value"""
+        return bool(self.tainted & self.required)
+
+    def versions(self) -> Dict[str, str]:
+        """Effective stage versions, covering the versions of every upstream stage"""
+        producers = {spec.output: spec for spec in self.stages}
+        versions = {}
+        for spec in self.stages:
+            parts = [spec.name, spec.version] + sorted(versions[producers[name].name] for name in spec.inputs)
+            versions[spec.name] = hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+        return versions
+
+    async def run(
+        self,
+        progress=None,
+        checkpoints: Optional[StageCheckpoints] = None,
+        required: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the graph
+
+        Args:
+            progress: Optional ProgressTracker to report stages to
+            checkpoints: Stored stage outputs to resume from and save to
+            required: Outputs the caller needs, defaults to all of them
+
+        Returns:
+            Stage outputs by name (None for stages that didn't need to run)
+        """
+        self.trace = []
+        self.tainted = set()
+        started_at = time.perf_counter()
+        producers = {spec.output: spec for spec in self.stages}
+        versions = self.versions()
+        required = set(required) if required is not None else set(producers)
+        self.required = required
+        values: Dict[str, Any] = {}
+
+        # Restore current checkpoints
+        restored = set()
+        if checkpoints is not None:
+            for spec in self.stages:
+                if not spec.checkpoint:
+                    continue
+                found, output = checkpoints.get(spec.name, versions[spec.name])
+                if found:
+                    values[spec.output] = output
+                    restored.add(spec.output)
+                    self.trace.append({
+                        "stage": spec.name, "resource": spec.resource, "status": "checkpoint",
+                        "ready_at": 0.0, "started_at": 0.0, "finished_at": 0.0
+                    })
+                    if progress is not None and spec.progress:
+                        progress.skip(spec.progress)
+
+        # Walk back from the required outputs to find what has to run
+        to_run: List[StageSpec] = []
+        for spec in reversed(self.stages):
+            if spec.output in restored:
+                continue
+            if spec.output in required or any(spec.output in other.inputs for other in to_run):
+                to_run.insert(0, spec)
+        for spec in self.stages:
+            values.setdefault(spec.output, None)
+
+        consumers = {
+            spec.output: sum(1 for other in to_run if spec.output in other.inputs)
+            for spec in self.stages
+        }
+        released = set()
+
+        def release(output: str):
+            if output in released or output in restored:
+                return
+            released.add(output)
+            spec = producers[output]
+            if spec.release is not None and values[output] is not None:
+                spec.release(values[output])
+
+        async def run_stage(spec: StageSpec):
+            inputs = []
+            for name in spec.inputs:
+                if name in restored:
+                    inputs.append(values[name])
+                else:
+                    inputs.append(await tasks[producers[name].name])
+
+            value, degraded = await self._run_stage(spec, inputs, started_at, progress)
+            values[spec.output] = value
+
+            # Restored inputs are never tainted, only clean outputs are saved
+            if degraded or any(name in self.tainted for name in spec.inputs):
+                self.tainted.add(spec.output)
+            elif checkpoints is not None and spec.checkpoint and value is not None:
+                await checkpoints.save(spec.name, versions[spec.name], value)
+
+            # Free inputs nobody else still needs (e.g. the decoded audio)
+            for name in spec.inputs:
+                consumers[name] -= 1
+                if consumers[name] == 0:
+                    release(name)
+            return value
+
+        tasks: Dict[str, asyncio.Task] = {}
+        for spec in to_run:
+            tasks[spec.name] = asyncio.ensure_future(run_stage(spec))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            for spec in to_run:
+                release(spec.output)
+
+        self.trace.sort(key=lambda entry: entry["started_at"])
+        return values
+
+    async def _run_stage(self, spec: StageSpec, inputs: List, started_at: float, progress) -> Tuple[Any, bool]:
+        """
+        Run one stage under its resource slot and timeout, tracing it
+
+        Returns:
+            (output, whether any fallback was used)
+        """
+        entry = {
+            "stage": spec.name,
+            "resource": spec.resource,
+            "status": "ok",
+            "ready_at": round(time.perf_counter() - started_at, 3)
+        }
+        self.trace.append(entry)
+
+        if spec.when is not None and not spec.when(*inputs):
+            entry.update({"status": "skipped", "started_at": entry["ready_at"], "finished_at": entry["ready_at"]})
+            if progress is not None and spec.progress:
+                progress.skip(spec.progress)
+            return None, False
+
+        async with self.limits.slot(spec.resource):
+            begin = time.perf_counter()
+            entry["started_at"] = round(begin - started_at, 3)
+            if progress is not None and spec.progress:
+                await progress.start(spec.progress)
+
+            with collect_fallbacks() as fallbacks:
+                try:
+                    value = await asyncio.wait_for(spec.run(*inputs), timeout=spec.timeout)
+                except asyncio.TimeoutError:
+                    print(f"⚠️ Stage {spec.name} timed out after {spec.timeout}s")
+                    record_fallback(spec.name, "timeout")
+                    entry["status"] = "timeout"
+                    value = spec.fallback()
+                except Exception as e:
+                    print(f"⚠️ Stage {spec.name} failed: {e}")
+                    record_fallback(spec.name, "error")
+                    entry.update({"status": "error", "error": str(e)})
+                    value = spec.fallback()
+
+            if fallbacks and entry["status"] == "ok":
+                entry["status"] = "degraded"
+
+            end = time.perf_counter()
+            entry["finished_at"] = round(end - started_at, 3)
+            entry["wait_seconds"] = round(entry["started_at"] - entry["ready_at"], 3)
+            entry["run_seconds"] = round(end - begin, 3)
+
+            if progress is not None and spec.progress:
+                await progress.finish(spec.progress)
+
+        return value, bool(fallbacks)
+
+
+# Global resource limits
+resource_limits = ResourceLimits()
@@ -3,79 +3,241 @@ Video Processing Orchestrator
 Coordinates all AI pipeline components
 """
 
-import asyncio
-from typing import Dict
+import os
+from typing import Dict, List, Optional, Tuple
 
+from app.services.ai_pipeline.audio_decoder import AudioDecoder, DecodedAudio
 from app.services.ai_pipeline.whisper_transcription import WhisperTranscriber
 from app.services.ai_pipeline.audio_analysis import AudioAnalyzer
 from app.services.ai_pipeline.mediapipe_analysis import MediaPipeAnalyzer
 from app.services.ai_pipeline.llama_scoring import LlamaScorer
+from app.services.ai_pipeline.stage_runner import stage_runner
+from app.services.ai_pipeline.vad import detect_speech_intervals
+from app.services.analysis.checkpoints import StageCheckpoints
+from app.services.analysis.stage_graph import StageGraph, StageSpec
+from app.services.jobs.progress import ProgressTracker
+from app.core.config import settings
+from app.core.metrics import record_fallback, stage
+
+
+def stage_versions() -> Dict[str, str]:
+    """
+    Own version of each pipeline stage: code version, then the settings
+    its output depends on (bump the leading number on code changes)
+
+    Shared by stage checkpoints and the result cache key.
+    """
+    return {
+        "decode": f"1:sr={settings.AUDIO_SAMPLE_RATE}",
+        "duration": "1",
+        "vad": f"1:{settings.VAD_ENABLED}:{settings.VAD_THRESHOLD_DB}"
+               f":{settings.VAD_MIN_SILENCE_SECONDS}:{settings.VAD_PAD_SECONDS}",
+        "transcription": f"1:{settings.WHISPER_BACKEND}:{settings.WHISPER_MODEL}:{settings.WHISPER_COMPUTE_TYPE}"
+                         f":beam={settings.WHISPER_BEAM_SIZE}:{settings.TRANSCRIPTION_SEGMENT_SECONDS}",
+        "audio": f"2:{settings.AUDIO_ANALYSIS_MAX_SECONDS}:{settings.AUDIO_BLOCK_SECONDS}",
+        "visual": f"1:{settings.VISUAL_SAMPLES_PER_MINUTE}:{settings.VISUAL_MIN_SAMPLES}"
+                  f":{settings.VISUAL_MAX_SAMPLES}:{settings.VISUAL_MIN_SAMPLE_INTERVAL}"
+                  f":{settings.VISUAL_SCENE_CHANGE_THRESHOLD}:{settings.VISUAL_SCENE_EXTRA_RATIO}",
+        "nlp": f"1:{settings.OLLAMA_MODEL}:{settings.LLM_SCORING_MODE}"
+               f":{settings.LLM_TRANSCRIPT_MODE}:{settings.LLM_CHUNK_TOKENS}",
+    }
 
 
 class VideoProcessor:
     """Orchestrates video analysis pipeline"""
     
-    def __init__(self, video_path: str):
+    # Stage outputs process() builds its results from
+    RESULT_OUTPUTS = ("transcription", "audio_features", "visual_features", "nlp_analysis", "duration")
+    
+    def __init__(
+        self,
+        video_path: str,
+        subject: Optional[str] = None,
+        progress: Optional[ProgressTracker] = None
+    ):
         self.video_path = video_path
+        self.subject = subject
+        self.progress = progress or ProgressTracker()
+        # Worker processes memory-map the decoded audio from a temp file
+        spill_dir = None
+        if stage_runner.uses_processes:
+            spill_dir = os.path.join(settings.UPLOAD_DIR, "temp")
+        self.audio_decoder = AudioDecoder(spill_dir=spill_dir)
         self.transcriber = WhisperTranscriber()
         self.audio_analyzer = AudioAnalyzer()
         self.visual_analyzer = MediaPipeAnalyzer()
         self.llama_scorer = LlamaScorer()
+        
+        # Execution trace of the last process() run, and whether any
+        # stage in it fell back to default or simulated output
+        self.trace: List[Dict] = []
+        self.degraded = False
+    
+    def _build_graph(self) -> StageGraph:
+        """
+        Pipeline stages and the values they pass along
+        
+        Visual analysis only needs the video, so it starts while audio
+        decodes. The decoded audio is released once VAD, transcription and
+        audio analysis are done with it. Stage versions come from
+        stage_versions(), the NLP one also covers the subject.
+        """
+        versions = stage_versions()
+        return StageGraph([
+            StageSpec(
+                "decode", self._run_audio_decode, output="audio",
+                resource="cpu", timeout=settings.STAGE_TIMEOUT_DECODE,
+                release=lambda audio: audio.release(), progress="decoding",
+                version=versions["decode"]
+            ),
+            StageSpec(
+                "duration", self._run_duration, output="duration", inputs=("audio",),
+                resource="io", checkpoint=True, version=versions["duration"]
+            ),
+            StageSpec(
+                "vad", self._run_vad, output="speech", inputs=("audio",),
+                resource="cpu", timeout=settings.STAGE_TIMEOUT_VAD, checkpoint=True,
+                version=versions["vad"]
+            ),
+            StageSpec(
+                "transcription", self._run_transcription, output="transcription", inputs=("audio", "speech"),
+                resource="cpu", timeout=settings.STAGE_TIMEOUT_TRANSCRIPTION, checkpoint=True,
+                fallback=lambda: {"text": "", "segments": []}, progress="transcribing",
+                version=versions["transcription"]
+            ),
+            StageSpec(
+                "audio", self._run_audio_analysis, output="audio_features", inputs=("audio", "speech"),
+                resource="cpu", timeout=settings.STAGE_TIMEOUT_AUDIO, checkpoint=True,
+                fallback=dict, progress="audio",
+                version=versions["audio"]
+            ),
+            StageSpec(
+                "visual", self._run_visual_analysis, output="visual_features",
+                resource="cpu", timeout=settings.STAGE_TIMEOUT_VISUAL, checkpoint=True,
+                fallback=dict, progress="visual",
+                version=versions["visual"]
+            ),
+            StageSpec(
+                "nlp", self._run_nlp_analysis, output="nlp_analysis", inputs=("transcription",),
+                resource="llm", timeout=settings.STAGE_TIMEOUT_NLP, checkpoint=True,
+                fallback=dict, when=lambda transcription: bool(transcription["text"]), progress="nlp",
+                version=f"{versions['nlp']}:{self.subject}"
+            ),
+        ])
     
-    async def process(self) -> Dict:
-        """Run complete analysis pipeline"""
-        results = {}
+    async def process(self, checkpoints: Optional[StageCheckpoints] = None) -> Dict:
+        """
+        Run complete analysis pipeline
         
-        # Run analyses in parallel
-        tasks = [
-            self._run_transcription(),
-            self._run_audio_analysis(),
-            self._run_visual_analysis()
-        ]
+        Args:
+            checkpoints: Stage outputs saved by an earlier attempt; current
+                ones are reused and new ones are saved as stages finish
+        """
+        graph = self._build_graph()
+        values = await graph.run(self.progress, checkpoints, required=self.RESULT_OUTPUTS)
+        self.trace = graph.trace
+        self.degraded = graph.degraded
         
-        transcript, audio_features, visual_features = await asyncio.gather(*tasks)
+        transcription = values["transcription"]
         
-        results["transcript"] = transcript
-        results["audio_features"] = audio_features
-        results["visual_features"] = visual_features
+        results = {
+            "transcript": transcription["text"],
+            "transcript_segments": transcription["segments"],
+            "audio_features": values["audio_features"],
+            "visual_features": values["visual_features"]
+        }
         
-        # Run NLP analysis
-        if transcript:
-            nlp_results = await self._run_nlp_analysis(transcript)
-            results["nlp_analysis"] = nlp_results
+        if values["nlp_analysis"] is not None:
+            results["nlp_analysis"] = values["nlp_analysis"]
         
-        results["duration"] = audio_features.get("duration", 0)
+        if values["duration"] is not None:
+            results["duration"] = values["duration"]
+        else:
+            results["duration"] = values["audio_features"].get("duration", 0)
         
         return results
     
-    async def _run_transcription(self) -> str:
+    async def _run_duration(self, audio: Optional[DecodedAudio]) -> Optional[float]:
+        """Recording length, kept after the audio buffer is released"""
+        return audio.duration if audio is not None else None
+    
+    async def _run_audio_decode(self) -> Optional[DecodedAudio]:
+        """Decode the audio track with ffmpeg"""
+        try:
+            with stage("decode"):
+                return await self.audio_decoder.decode(self.video_path)
+        except Exception as e:
+            print(f"Audio decode error: {e}")
+            record_fallback("decode", "error")
+            return None
+    
+    async def _run_vad(self, audio: Optional[DecodedAudio]) -> Optional[List[Tuple[float, float]]]:
+        """Detect speech intervals, None means transcribe everything"""
+        if audio is None or not settings.VAD_ENABLED:
+            return None
+        try:
+            with stage("vad"):
+                return await stage_runner.run("audio", detect_speech_intervals, audio)
+        except Exception as e:
+            print(f"VAD error: {e}")
+            record_fallback("vad", "error")
+            return None
+    
+    async def _run_transcription(
+        self,
+        audio: Optional[DecodedAudio],
+        speech: Optional[List[Tuple[float, float]]] = None
+    ) -> Dict:
         """Transcribe audio using Whisper"""
+        empty = {"text": "", "segments": []}
+        if audio is None:
+            record_fallback("transcription", "no_audio")
+            return empty
         try:
-            return await self.transcriber.transcribe(self.video_path)
+            with stage("transcription"):
+                return await self.transcriber.transcribe(
+                    audio,
+                    speech,
+                    on_progress=lambda fraction: self.progress.update("transcribing", fraction)
+                )
         except Exception as e:
             print(f"Transcription error: {e}")
-            return ""
+            record_fallback("transcription", "error")
+            return empty
     
-    async def _run_audio_analysis(self) -> Dict:
+    async def _run_audio_analysis(
+        self,
+        audio: Optional[DecodedAudio],
+        speech: Optional[List[Tuple[float, float]]] = None
+    ) -> Dict:
         """Analyze audio features"""
+        if audio is None:
+            record_fallback("audio", "no_audio")
+            return {}
         try:
-            return await self.audio_analyzer.analyze(self.video_path)
+            with stage("audio"):
+                return await self.audio_analyzer.analyze(audio, speech)
         except Exception as e:
             print(f"Audio analysis error: {e}")
+            record_fallback("audio", "error")
             return {}
     
     async def _run_visual_analysis(self) -> Dict:
         """Analyze visual features"""
         try:
-            return await self.visual_analyzer.analyze(self.video_path)
+            with stage("visual"):
+                return await self.visual_analyzer.analyze(self.video_path)
         except Exception as e:
             print(f"Visual analysis error: {e}")
+            record_fallback("visual", "error")
             return {}
     
-    async def _run_nlp_analysis(self, transcript: str) -> Dict:
+    async def _run_nlp_analysis(self, transcription: Dict) -> Dict:
         """Analyze transcript with LLaMA"""
         try:
-            return await self.llama_scorer.analyze_transcript(transcript)
+            with stage("nlp"):
+                return await self.llama_scorer.analyze_transcript(transcription["text"], self.subject)
         except Exception as e:
             print(f"NLP analysis error: {e}")
+            record_fallback("nlp", "error")
             return {}
\ No newline at end of file
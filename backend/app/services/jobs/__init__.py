@@ -0,0 +1 @@
+"""Jobs Package"""
\ No newline at end of file
@@ -0,0 +1,249 @@
+"""
+Job Queue
+Durable analysis queue on the analyses collection, claimed with leases
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from pymongo import ASCENDING, ReturnDocument
+
+from app.core.config import settings
+from app.core.database import get_collection
+from app.models.analysis import AnalysisStatus
+from app.services.jobs.progress import queued_progress
+
+
+class JobQueue:
+    """
+    Lease-based job queue
+
+    Each analysis document is its own job. A worker claims one with an atomic
+    find_one_and_update that sets a lease; while working it keeps extending
+    the lease with heartbeats. If the worker dies the lease expires and any
+    other worker can reclaim the job. Failures are retried with exponential
+    backoff until JOB_MAX_ATTEMPTS is reached.
+    """
+
+    def __init__(self, collection_name: str = "analyses"):
+        self.collection_name = collection_name
+        self.lease_seconds = settings.JOB_LEASE_SECONDS
+        self.max_attempts = settings.JOB_MAX_ATTEMPTS
+
+    @property
+    def collection(self):
+        return get_collection(self.collection_name)
+
+    async def ensure_indexes(self):
+        """Create indexes used by claim()"""
+        await self.collection.create_index(
+            [("status", ASCENDING), ("next_attempt_at", ASCENDING)]
+        )
+        await self.collection.create_index(
+            [("status", ASCENDING), ("lease_expires_at", ASCENDING)]
+        )
+
+    def job_fields(self) -> Dict:
+        """Queue fields for a newly created analysis document"""
+        return {
+            "status": AnalysisStatus.PENDING,
+            "attempts": 0,
+            "next_attempt_at": datetime.utcnow(),
+            "progress": queued_progress()
+        }
+
+    async def enqueue(self, analysis_id: str) -> bool:
+        """
+        Put an existing analysis back on the queue
+
+        Returns:
+            True if the analysis exists and isn't currently leased
+        """
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            {
+                "_id": analysis_id,
+                "$or": [
+                    {"status": {"$ne": AnalysisStatus.PROCESSING}},
+                    {"lease_expires_at": {"$lt": now}}
+                ]
+            },
+            {
+                "$set": {
+                    "status": AnalysisStatus.PENDING,
+                    "attempts": 0,
+                    "next_attempt_at": now,
+                    "progress": queued_progress(),
+                    "updated_at": now
+                },
+                "$unset": {"lease_owner": "", "lease_expires_at": "", "error": ""}
+            }
+        )
+        return result.matched_count > 0
+
+    async def claim(self, worker_id: str) -> Optional[Dict]:
+        """
+        Atomically lease the oldest runnable job
+
+        Runnable means pending and due, or processing with an expired lease
+        (the worker holding it stopped heartbeating) and attempts left.
+        Expired jobs without attempts left are failed first, so a job that
+        keeps killing or hanging its worker doesn't come back forever.
+
+        Returns:
+            The claimed analysis document, or None if the queue is empty
+        """
+        await self.fail_exhausted()
+        now = datetime.utcnow()
+        attempts_left = {"$not": {"$gte": self.max_attempts}}
+
+        return await self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": AnalysisStatus.PENDING, "next_attempt_at": {"$lte": now}},
+                    {"status": AnalysisStatus.PENDING, "next_attempt_at": {"$exists": False}},
+                    {"status": AnalysisStatus.PROCESSING, "lease_expires_at": {"$lt": now}, "attempts": attempts_left},
+                    # Jobs left by the old in-process BackgroundTasks runner
+                    {"status": AnalysisStatus.PROCESSING, "lease_expires_at": {"$exists": False}, "attempts": attempts_left}
+                ]
+            },
+            {
+                "$set": {
+                    "status": AnalysisStatus.PROCESSING,
+                    "lease_owner": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def fail_exhausted(self) -> int:
+        """
+        Fail processing jobs whose lease expired on their last attempt
+
+        Their worker died or hung (e.g. killed for running out of memory)
+        without reaching fail(), so nothing else would ever stop them.
+
+        Returns:
+            Number of jobs marked FAILED
+        """
+        now = datetime.utcnow()
+        result = await self.collection.update_many(
+            {
+                "status": AnalysisStatus.PROCESSING,
+                "$or": [
+                    {"lease_expires_at": {"$lt": now}},
+                    {"lease_expires_at": {"$exists": False}}
+                ],
+                "attempts": {"$gte": self.max_attempts}
+            },
+            {
+                "$set": {
+                    "status": AnalysisStatus.FAILED,
+                    "error": "Lease expired too many times: the worker died or hung while processing",
+                    "updated_at": now
+                },
+                "$unset": {"lease_owner": "", "lease_expires_at": "", "next_attempt_at": ""}
+            }
+        )
+        if result.modified_count:
+            print(f"⚠️ Failed {result.modified_count} job(s) whose lease expired on the last attempt")
+        return result.modified_count
+
+    async def heartbeat(self, analysis_id: str, worker_id: str) -> bool:
+        """
+        Extend a held lease
+
+        Returns:
+            False if the lease was lost to another worker
+        """
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            {"_id": analysis_id, "lease_owner": worker_id},
+            {"$set": {"lease_expires_at": now + timedelta(seconds=self.lease_seconds)}}
+        )
+        return result.matched_count > 0
+
+    async def complete(self, analysis_id: str, worker_id: str, fields: Dict) -> bool:
+        """Mark a leased job completed and store its results"""
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            {"_id": analysis_id, "lease_owner": worker_id},
+            {
+                "$set": {
+                    **fields,
+                    "status": AnalysisStatus.COMPLETED,
+                    "completed_at": now,
+                    "updated_at": now
+                },
+                "$unset": {"lease_owner": "", "lease_expires_at": "", "next_attempt_at": "", "error": ""}
+            }
+        )
+        return result.matched_count > 0
+
+    async def fail(self, job: Dict, worker_id: str, error: str, fields: Optional[Dict] = None) -> bool:
+        """
+        Record a failed attempt
+
+        Retries with exponential backoff, or marks the analysis FAILED once
+        it has used up its attempts. `fields` (e.g. the attempt's timings)
+        are stored either way.
+        """
+        now = datetime.utcnow()
+        attempts = job.get("attempts", 1)
+
+        if attempts < self.max_attempts:
+            delay = min(
+                settings.JOB_RETRY_BACKOFF_SECONDS * (2 ** (attempts - 1)),
+                settings.JOB_RETRY_BACKOFF_MAX_SECONDS
+            )
+            update = {
+                "$set": {
+                    **(fields or {}),
+                    "status": AnalysisStatus.PENDING,
+                    "next_attempt_at": now + timedelta(seconds=delay),
+                    "error": error,
+                    "updated_at": now
+                },
+                "$unset": {"lease_owner": "", "lease_expires_at": ""}
+            }
+        else:
+            update = {
+                "$set": {
+                    **(fields or {}),
+                    "status": AnalysisStatus.FAILED,
+                    "error": error,
+                    "updated_at": now
+                },
+                "$unset": {"lease_owner": "", "lease_expires_at": "", "next_attempt_at": ""}
+            }
+
+        result = await self.collection.update_one(
+            {"_id": job["_id"], "lease_owner": worker_id},
+            update
+        )
+        return result.matched_count > 0
+
+    async def release(self, analysis_id: str, worker_id: str) -> bool:
+        """Give a job back without counting the attempt (worker shutdown)"""
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            {"_id": analysis_id, "lease_owner": worker_id},
+            {
+                "$set": {
+                    "status": AnalysisStatus.PENDING,
+                    "next_attempt_at": now,
+                    "updated_at": now
+                },
+                "$inc": {"attempts": -1},
+                "$unset": {"lease_owner": "", "lease_expires_at": ""}
+            }
+        )
+        return result.matched_count > 0
+
+
+# Global job queue
+job_queue = JobQueue()
@@ -0,0 +1,340 @@
+"""
+Analysis Progress
+Per-stage progress tracking, persisted on the analysis and pushed to SSE subscribers
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Set
+
+from app.core.config import settings
+from app.core.database import get_collection
+from app.models.analysis import AnalysisStatus
+
+# Pipeline stages and their share of the total work, in percent.
+# transcribing, audio and visual run in parallel; the weights only
+# need to add up to a sensible overall figure.
+STAGE_WEIGHTS = {
+    "decoding": 5,
+    "transcribing": 45,
+    "audio": 10,
+    "visual": 15,
+    "nlp": 20,
+    "scoring": 5,
+}
+STAGES = tuple(STAGE_WEIGHTS)
+
+# Only these fields are read when checking progress
+PROGRESS_PROJECTION = {"status": 1, "progress": 1, "error": 1}
+
+TERMINAL_STATUSES = (AnalysisStatus.COMPLETED.value, AnalysisStatus.FAILED.value)
+
+# Subscriber queues drop their oldest event when a client falls this far behind
+SUBSCRIBER_QUEUE_SIZE = 64
+
+
+def queued_progress() -> Dict:
+    """Progress of an analysis waiting for a worker"""
+    return {
+        "stage": "queued",
+        "percent": 0,
+        "eta_seconds": None,
+        "stages": {stage: "pending" for stage in STAGES},
+        "updated_at": datetime.utcnow()
+    }
+
+
+def completed_progress() -> Dict:
+    """Progress of a finished analysis"""
+    return {
+        "stage": "done",
+        "percent": 100,
+        "eta_seconds": 0,
+        "stages": {stage: "done" for stage in STAGES},
+        "updated_at": datetime.utcnow()
+    }
+
+
+def progress_event(doc: Dict) -> Dict:
+    """
+    Client event from a projected analysis document
+
+    Args:
+        doc: Analysis document with at least _id and status
+
+    Returns:
+        Status plus the stored progress fields
+    """
+    status = doc.get("status")
+    if isinstance(status, AnalysisStatus):
+        status = status.value
+
+    event = {"analysis_id": doc["_id"], "status": status}
+    event.update(doc.get("progress") or queued_progress())
+
+    if status == AnalysisStatus.COMPLETED.value:
+        event.update({"stage": "done", "percent": 100, "eta_seconds": 0})
+    if doc.get("error"):
+        event["error"] = doc["error"]
+
+    return event
+
+
+async def read_progress(analysis_id: str) -> Optional[Dict]:
+    """Projected read of an analysis's status and progress"""
+    doc = await get_collection("analyses").find_one({"_id": analysis_id}, PROGRESS_PROJECTION)
+    return progress_event(doc) if doc else None
+
+
+class ProgressTracker:
+    """
+    Tracks one analysis run through the pipeline stages
+
+    Stage transitions are published to local subscribers immediately and
+    written to the analysis's `progress` field, so API processes watching a
+    job that runs in another worker process see them too. Progress within a
+    stage is written at most every PROGRESS_PERSIST_INTERVAL seconds.
+
+    Without an analysis_id nothing is published (standalone VideoProcessor use).
+    """
+
+    def __init__(self, analysis_id: Optional[str] = None):
+        self.analysis_id = analysis_id
+        self.started_at = time.monotonic()
+        self.fractions = {stage: 0.0 for stage in STAGES}
+        self.states = {stage: "pending" for stage in STAGES}
+        self.stage = "queued"
+        self._running = []
+        self._last_persist = 0.0
+
+    async def start(self, stage: str):
+        """Mark a stage as running"""
+        self.states[stage] = "running"
+        self._running.append(stage)
+        self.stage = stage
+        await self._report(force=True)
+
+    async def update(self, stage: str, fraction: float):
+        """Report progress within a running stage (0-1)"""
+        self.fractions[stage] = min(1.0, max(0.0, fraction))
+        await self._report()
+
+    async def finish(self, stage: str):
+        """Mark a stage as done"""
+        self.fractions[stage] = 1.0
+        self.states[stage] = "done"
+        if stage in self._running:
+            self._running.remove(stage)
+        if self._running:
+            self.stage = self._running[-1]
+        await self._report(force=True)
+
+    def skip(self, *stages: str):
+        """Mark stages that don't need to run (e.g. on a result cache hit)"""
+        for stage in stages:
+            self.fractions[stage] = 1.0
+            self.states[stage] = "skipped"
+
+    @property
+    def percent(self) -> float:
+        return sum(STAGE_WEIGHTS[stage] * self.fractions[stage] for stage in STAGES)
+
+    def snapshot(self) -> Dict:
+        """Current progress as stored on the analysis document"""
+        percent = self.percent
+        elapsed = time.monotonic() - self.started_at
+
+        # Linear extrapolation from the work done so far
+        eta = None
+        if 1 <= percent < 100:
+            eta = round(elapsed * (100 - percent) / percent)
+        elif percent >= 100:
+            eta = 0
+
+        return {
+            "stage": self.stage,
+            "percent": round(percent, 1),
+            "eta_seconds": eta,
+            "stages": dict(self.states),
+            "updated_at": datetime.utcnow()
+        }
+
+    async def _report(self, force: bool = False):
+        """Publish locally and persist (throttled unless force)"""
+        if self.analysis_id is None:
+            return
+
+        snapshot = self.snapshot()
+        progress_bus.publish(self.analysis_id, {
+            "analysis_id": self.analysis_id,
+            "status": AnalysisStatus.PROCESSING.value,
+            **snapshot
+        })
+
+        now = time.monotonic()
+        if not force and now - self._last_persist < settings.PROGRESS_PERSIST_INTERVAL:
+            return
+        self._last_persist = now
+
+        try:
+            await get_collection("analyses").update_one(
+                {"_id": self.analysis_id, "status": AnalysisStatus.PROCESSING},
+                {"$set": {"progress": snapshot}}
+            )
+        except Exception as e:
+            print(f"⚠️ Progress update failed for {self.analysis_id}: {e}")
+
+
+class ProgressBus:
+    """
+    In-process pub/sub for progress events
+
+    Jobs run by the embedded worker publish straight to subscribers. For
+    jobs running in standalone worker processes, one watcher task per
+    watched analysis polls its status and progress fields (a projected
+    _id lookup), however many clients are subscribed to it.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._watchers: Dict[str, asyncio.Task] = {}
+        self._last_local: Dict[str, float] = {}
+
+    def subscribe(self, analysis_id: str) -> asyncio.Queue:
+        """Queue receiving events for one analysis"""
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(analysis_id, set()).add(queue)
+
+        watcher = self._watchers.get(analysis_id)
+        if watcher is None or watcher.done():
+            self._watchers[analysis_id] = asyncio.create_task(self._watch(analysis_id))
+
+        return queue
+
+    def unsubscribe(self, analysis_id: str, queue: asyncio.Queue):
+        """Stop delivering to a queue, stop watching once nobody listens"""
+        queues = self._subscribers.get(analysis_id)
+        if queues is None:
+            return
+
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[analysis_id]
+            self._last_local.pop(analysis_id, None)
+            watcher = self._watchers.pop(analysis_id, None)
+            if watcher is not None:
+                watcher.cancel()
+
+    def publish(self, analysis_id: str, event: Dict):
+        """Deliver an event produced in this process"""
+        if analysis_id not in self._subscribers:
+            return
+        self._last_local[analysis_id] = time.monotonic()
+        self._deliver(analysis_id, event)
+
+    async def refresh(self, analysis_id: str):
+        """Re-read an analysis and deliver its state (after complete/fail)"""
+        if analysis_id not in self._subscribers:
+            return
+        try:
+            event = await read_progress(analysis_id)
+        except Exception as e:
+            print(f"⚠️ Progress read failed for {analysis_id}: {e}")
+            return
+        if event is not None:
+            self.publish(analysis_id, event)
+
+    def _deliver(self, analysis_id: str, event: Dict):
+        for queue in self._subscribers.get(analysis_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def _watch(self, analysis_id: str):
+        """Poll for progress made by other processes"""
+        interval = settings.PROGRESS_POLL_INTERVAL
+        while analysis_id in self._subscribers:
+            await asyncio.sleep(interval)
+
+            # Events are arriving locally, the stored copy can only lag behind
+            if time.monotonic() - self._last_local.get(analysis_id, 0.0) < interval:
+                continue
+
+            try:
+                event = await read_progress(analysis_id)
+            except Exception as e:
+                print(f"⚠️ Progress poll failed for {analysis_id}: {e}")
+                continue
+
+            if event is None:
+                event = {"analysis_id": analysis_id, "status": "deleted"}
+            self._deliver(analysis_id, event)
+            if event["status"] not in (AnalysisStatus.PENDING.value, AnalysisStatus.PROCESSING.value):
+                return
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat() + "Z"
+    return str(value)
+
+
+def format_sse(event: Dict, event_type: str = "progress") -> str:
+    """Encode one Server-Sent Events message"""
+    return f"event: {event_type}\ndata: {json.dumps(event, default=_json_default)}\n\n"
+
+
+async def stream_progress(
+    analysis_id: str,
+    initial: Dict,
+    is_disconnected: Callable[[], Awaitable[bool]]
+) -> AsyncIterator[str]:
+    """
+    SSE stream of an analysis's progress
+
+    Sends the current state, then every change, and ends once the analysis
+    completes, fails or is deleted. Comment lines keep idle connections
+    open through proxies.
+
+    Args:
+        analysis_id: Analysis to follow
+        initial: Current state from read_progress
+        is_disconnected: Request.is_disconnected of the client connection
+
+    Yields:
+        Encoded SSE messages
+    """
+    queue = progress_bus.subscribe(analysis_id)
+    try:
+        yield f"retry: {int(settings.PROGRESS_POLL_INTERVAL * 1000)}\n\n"
+        yield format_sse(initial)
+        if initial["status"] in TERMINAL_STATUSES:
+            return
+
+        last_status, last_at = initial["status"], initial.get("updated_at")
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    return
+                yield ": keepalive\n\n"
+                continue
+
+            # Polled state can repeat (or trail) what was already sent
+            updated_at = event.get("updated_at")
+            if event["status"] == last_status and updated_at and last_at and updated_at <= last_at:
+                continue
+            last_status, last_at = event["status"], updated_at or last_at
+
+            yield format_sse(event)
+            if event["status"] in TERMINAL_STATUSES or event["status"] == "deleted":
+                return
+    finally:
+        progress_bus.unsubscribe(analysis_id, queue)
+
+
+# Global progress bus
+progress_bus = ProgressBus()
@@ -0,0 +1,117 @@
+"""
+Analysis Worker
+Claims jobs from the queue and runs them with heartbeated leases
+"""
+
+import asyncio
+import os
+import socket
+import time
+import uuid
+from typing import Dict, List
+
+from app.core.config import settings
+from app.core.metrics import ANALYSIS_SECONDS, AnalysisTimings
+from app.services.jobs.job_queue import job_queue
+from app.services.jobs.progress import progress_bus
+from app.services.analysis.feature_matrix import feature_matrix
+from app.services.analysis.pipeline import run_analysis
+
+
+class AnalysisWorker:
+    """Runs up to `concurrency` analyses at a time"""
+
+    def __init__(self, concurrency: int = None, worker_id: str = None):
+        self.concurrency = concurrency or settings.WORKER_CONCURRENCY
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.poll_interval = settings.JOB_POLL_INTERVAL
+        self.heartbeat_interval = max(1.0, settings.JOB_LEASE_SECONDS / 3)
+
+        self._stopping = asyncio.Event()
+        self._slots: List[asyncio.Task] = []
+
+    def start(self):
+        """Start worker slots as background tasks"""
+        self._slots = [
+            asyncio.create_task(self._slot_loop())
+            for _ in range(self.concurrency)
+        ]
+        print(f"✅ Worker {self.worker_id} started with {self.concurrency} slot(s)")
+
+    async def run(self):
+        """Run until stop() is called"""
+        self.start()
+        await asyncio.gather(*self._slots, return_exceptions=True)
+
+    async def stop(self):
+        """Stop claiming jobs and hand in-flight jobs back to the queue"""
+        self._stopping.set()
+        for slot in self._slots:
+            slot.cancel()
+        await asyncio.gather(*self._slots, return_exceptions=True)
+        self._slots = []
+        print(f"✅ Worker {self.worker_id} stopped")
+
+    async def _slot_loop(self):
+        """Claim and process jobs one at a time"""
+        while not self._stopping.is_set():
+            try:
+                job = await job_queue.claim(self.worker_id)
+            except Exception as e:
+                print(f"Job claim error: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._process(job)
+
+    async def _process(self, job: Dict):
+        """Run one job while keeping its lease alive"""
+        analysis_id = job["_id"]
+        timings = AnalysisTimings()
+        started = time.perf_counter()
+        work = asyncio.create_task(run_analysis(job, timings))
+        heartbeat = asyncio.create_task(self._heartbeat(analysis_id, work))
+
+        try:
+            fields = await work
+        except asyncio.CancelledError:
+            if self._stopping.is_set():
+                # Shutdown: give the job back right away
+                await job_queue.release(analysis_id, self.worker_id)
+                raise
+            print(f"Analysis {analysis_id} lost its lease, abandoning")
+            return
+        except Exception as e:
+            ANALYSIS_SECONDS.labels("failed").observe(time.perf_counter() - started)
+            await job_queue.fail(job, self.worker_id, str(e), {"timings": timings.as_dict()})
+            await progress_bus.refresh(analysis_id)
+            print(f"Analysis failed for {analysis_id}: {str(e)}")
+            return
+        finally:
+            heartbeat.cancel()
+            if not work.done():
+                work.cancel()
+
+        ANALYSIS_SECONDS.labels("completed").observe(time.perf_counter() - started)
+        if await job_queue.complete(analysis_id, self.worker_id, fields):
+            feature_matrix.add({**job, **fields})
+        await progress_bus.refresh(analysis_id)
+
+    async def _heartbeat(self, analysis_id: str, work: asyncio.Task):
+        """Extend the lease until the work finishes, cancel it if the lease is lost"""
+        while not work.done():
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                held = await job_queue.heartbeat(analysis_id, self.worker_id)
+            except Exception as e:
+                print(f"Heartbeat error for {analysis_id}: {e}")
+                continue
+            if not held:
+                work.cancel()
+                return
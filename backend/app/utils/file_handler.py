@@ -4,10 +4,18 @@ File Handling Utilities
 
 import os
 import shutil
+import hashlib
+import uuid
+import aiofiles
 from typing import Optional
 from pathlib import Path
 
 
+class FileTooLargeError(ValueError):
+    """Uploaded file exceeds the size limit"""
+    pass
+
+
 class FileHandler:
     """Handle file operations for video uploads"""
     
@@ -41,6 +49,70 @@ class FileHandler:
         
         return filepath
     
+    async def save_upload_stream(
+        self,
+        upload,
+        filename: str,
+        max_size: int,
+        chunk_size: int = 1024 * 1024
+    ) -> dict:
+        """
+        Copy an upload to the videos directory in chunks
+        
+        Data is hashed and counted as it passes through and written to a
+        temp file that is atomically renamed into place once complete.
+        
+        By the time this runs Starlette has already spooled the multipart
+        body to its own temp file; the limit on what is received is enforced
+        earlier, while the body arrives, by UploadSizeLimitMiddleware. This
+        check enforces max_size on the file itself.
+        
+        Args:
+            upload: FastAPI UploadFile (anything with async read(size))
+            filename: Filename to save as
+            max_size: Maximum size in bytes
+            chunk_size: Bytes read per chunk
+            
+        Returns:
+            Dictionary with path, size_bytes and sha256
+            
+        Raises:
+            FileTooLargeError: The file is larger than max_size bytes
+        """
+        os.makedirs(self.temp_dir, exist_ok=True)
+        os.makedirs(self.videos_dir, exist_ok=True)
+        
+        temp_path = os.path.join(self.temp_dir, f"{uuid.uuid4()}.part")
+        filepath = os.path.join(self.videos_dir, filename)
+        
+        sha256 = hashlib.sha256()
+        size = 0
+        
+        try:
+            async with aiofiles.open(temp_path, 'wb') as f:
+                while True:
+                    chunk = await upload.read(chunk_size)
+                    if not chunk:
+                        break
+                    
+                    size += len(chunk)
+                    if size > max_size:
+                        raise FileTooLargeError(f"File exceeds maximum size of {max_size} bytes")
+                    
+                    sha256.update(chunk)
+                    await f.write(chunk)
+            
+            os.replace(temp_path, filepath)
+        except BaseException:
+            self.delete_file(temp_path)
+            raise
+        
+        return {
+            "path": filepath,
+            "size_bytes": size,
+            "sha256": sha256.hexdigest()
+        }
+    
     def delete_file(self, filepath: str) -> bool:
         """
         Delete a file
@@ -0,0 +1,90 @@
+"""
+Request Body Size Limit
+ASGI middleware enforcing the upload limit while the body arrives
+"""
+
+import json
+
+from starlette.exceptions import HTTPException
+
+# Methods whose bodies are limited
+LIMITED_METHODS = ("POST", "PUT", "PATCH")
+
+
+class BodyTooLargeError(HTTPException):
+    """Raised from receive() once the body passes the limit"""
+
+    def __init__(self, max_size: int):
+        super().__init__(status_code=413, detail=f"File exceeds maximum size of {max_size} bytes")
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject request bodies larger than `limit` bytes
+
+    A Content-Length over the limit is answered with 413 before anything is
+    read. Otherwise (including chunked requests without a length) body bytes
+    are counted on the receive channel and the request is aborted with 413
+    as soon as the count passes the limit, before Starlette spools the rest
+    of the upload to disk.
+
+    Args:
+        app: ASGI app to wrap
+        limit: Maximum body size in bytes
+        max_size: File size reported in the error message
+    """
+
+    def __init__(self, app, limit: int, max_size: int):
+        self.app = app
+        self.limit = limit
+        self.max_size = max_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in LIMITED_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length", b"").decode()
+        if content_length.isdigit() and int(content_length) > self.limit:
+            await self._reject(send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.limit:
+                    raise BodyTooLargeError(self.max_size)
+            return message
+
+        async def tracked_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except BodyTooLargeError:
+            # Raised outside a route (e.g. in other middleware)
+            if response_started:
+                raise
+            await self._reject(send)
+
+    async def _reject(self, send):
+        body = json.dumps({"detail": f"File exceeds maximum size of {self.max_size} bytes"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
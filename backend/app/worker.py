@@ -0,0 +1,62 @@
+"""
+Standalone Analysis Worker
+Run with: python -m app.worker [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import signal
+
+from prometheus_client import start_http_server
+
+from app.core.config import settings
+from app.core.database import connect_to_mongo, close_mongo_connection
+from app.services.ai_pipeline.llm_cache import llm_cache
+from app.services.ai_pipeline.model_registry import model_registry
+from app.services.ai_pipeline.stage_runner import stage_runner
+from app.services.jobs.job_queue import job_queue
+from app.services.jobs.worker import AnalysisWorker
+
+
+async def main(concurrency: int):
+    """Connect, warm up models and process jobs until SIGINT/SIGTERM"""
+    await connect_to_mongo()
+    await job_queue.ensure_indexes()
+    await llm_cache.ensure_indexes()
+
+    if settings.PRELOAD_MODELS:
+        await model_registry.warm_up()
+
+    # Standalone workers have no API, serve /metrics on a port of their own
+    if settings.WORKER_METRICS_PORT > 0:
+        start_http_server(settings.WORKER_METRICS_PORT)
+        print(f"✅ Metrics on :{settings.WORKER_METRICS_PORT}/metrics")
+
+    worker = AnalysisWorker(concurrency=concurrency)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_event_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    worker.start()
+    await stop.wait()
+
+    # Shutdown
+    await worker.stop()
+    model_registry.close()
+    stage_runner.shutdown()
+    await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mentor Scoring AI analysis worker")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.WORKER_CONCURRENCY,
+        help="Analyses to run at the same time"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args.concurrency))
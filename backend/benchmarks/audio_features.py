@@ -0,0 +1,148 @@
+"""
+Audio Features Benchmark
+Per-minute-of-audio cost of the original librosa feature code vs the
+streaming extractor, and the streaming extractor's peak memory by duration
+
+Usage (from backend/):
+    python -m benchmarks.audio_features [--minutes 2] [--repeat 3] [--memory-minutes 2 10 30]
+
+Runs on a synthetic speech-like signal (voiced harmonic bursts separated by
+pauses), so no ffmpeg or video is needed. For the memory table the signal
+is written to a temp file and memory-mapped, as in the process executor.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import librosa
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.services.ai_pipeline.audio_analysis import AudioAnalyzer, _tempo
+from app.services.ai_pipeline.audio_decoder import DecodedAudio
+
+FEATURES = ("energy_mean", "energy_std", "pitch_mean", "pitch_std", "speech_rate", "pause_ratio")
+
+
+def make_speech_like(seconds: float, sr: int) -> np.ndarray:
+    """Voiced syllables with drifting pitch, separated by short pauses"""
+    rng = np.random.default_rng(0)
+    y = np.zeros(int(seconds * sr), dtype=np.float32)
+    pos = 0
+    while pos < len(y):
+        length = int(rng.uniform(0.12, 0.35) * sr)
+        f0 = rng.uniform(110, 240)
+        t = np.arange(length) / sr
+        syllable = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 5))
+        syllable *= np.hanning(length) * rng.uniform(0.2, 0.8)
+        end = min(len(y), pos + length)
+        y[pos:end] = syllable[:end - pos]
+        pos = end + int(rng.uniform(0.05, 0.5) * sr)
+    return y + rng.normal(0, 0.002, len(y)).astype(np.float32)
+
+
+def legacy_features(y: np.ndarray, sr: int) -> dict:
+    """Feature code as it was before the shared STFT"""
+    energy = librosa.feature.rms(y=y)[0]
+
+    pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
+    pitch_values = []
+    for t in range(pitches.shape[1]):
+        index = magnitudes[:, t].argmax()
+        pitch = pitches[index, t]
+        if pitch > 0:
+            pitch_values.append(pitch)
+
+    onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+    tempo = _tempo(onset_envelope=onset_env, sr=sr)[0]
+
+    rms = librosa.feature.rms(y=y)[0]
+    threshold = np.percentile(rms, 20)
+
+    return {
+        "energy_mean": float(np.mean(energy)),
+        "energy_std": float(np.std(energy)),
+        "pitch_mean": float(np.mean(pitch_values)) if pitch_values else 0,
+        "pitch_std": float(np.std(pitch_values)) if pitch_values else 0,
+        "speech_rate": float(tempo) * 1.5,
+        "pause_ratio": float(np.sum(rms < threshold) / len(rms)),
+    }
+
+
+def timed(func, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_memory(analyzer: AudioAnalyzer, minutes: float, sr: int) -> float:
+    """Peak traced allocation (MB) analysing a memory-mapped recording"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "audio.f32")
+        with open(path, "wb") as f:
+            # Write in one-minute pieces so building the file stays small too
+            for minute in range(int(np.ceil(minutes))):
+                seconds = min(60, minutes * 60 - minute * 60)
+                f.write(make_speech_like(seconds, sr).tobytes())
+
+        audio = DecodedAudio.from_file(path, sr)
+        tracemalloc.start()
+        analyzer._extract_features(audio)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del audio
+        return peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audio feature extraction benchmark")
+    parser.add_argument("--minutes", type=float, default=2.0, help="Audio length")
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--memory-minutes", type=float, nargs="*", default=[2, 10, 30],
+                        help="Durations for the peak memory table")
+    args = parser.parse_args()
+
+    sr = args.sample_rate
+    y = make_speech_like(args.minutes * 60, sr)
+    audio = DecodedAudio(y, sr)
+    analyzer = AudioAnalyzer(max_duration=0)
+    minutes = len(y) / sr / 60
+
+    # Warm up librosa's caches and JIT so the first timing isn't skewed
+    analyzer._extract_features(DecodedAudio(y[:sr * 5], sr))
+    legacy_features(y[:sr * 5], sr)
+
+    legacy_time, legacy = timed(lambda: legacy_features(y, sr), args.repeat)
+    shared_time, shared = timed(lambda: analyzer._extract_features(audio), args.repeat)
+
+    print(f"Audio: {minutes:.2f} min at {sr} Hz\n")
+    print(f"{'method':<14}{'time (s)':>10}{'s / min audio':>15}")
+    print(f"{'legacy':<14}{legacy_time:>10.3f}{legacy_time / minutes:>15.3f}")
+    print(f"{'streaming':<14}{shared_time:>10.3f}{shared_time / minutes:>15.3f}")
+    print(f"\nSpeed-up: {legacy_time / shared_time:.2f}x\n")
+
+    print(f"{'feature':<14}{'legacy':>12}{'streaming':>14}")
+    for name in FEATURES:
+        print(f"{name:<14}{legacy[name]:>12.4f}{shared[name]:>14.4f}")
+
+    if args.memory_minutes:
+        print(f"\n{'minutes':<10}{'float32 audio (MB)':>20}{'peak traced (MB)':>18}")
+        for minutes in args.memory_minutes:
+            audio_mb = minutes * 60 * sr * 4 / 2 ** 20
+            print(f"{minutes:<10g}{audio_mb:>20.1f}{peak_memory(analyzer, minutes, sr):>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Frame Sampling Benchmark
+Compares frames requested per analysed sample and wall time: sequential read vs FrameSampler
+
+Usage (from backend/):
+    python -m benchmarks.frame_sampling [video_path] [--samples 30] [--interval 10]
+
+Without a video path a synthetic clip is generated in a temp directory.
+"requested" counts grab()/read() calls; decoding from the keyframe after a
+seek isn't visible to OpenCV, so compare the times as well.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.services.ai_pipeline.frame_sampler import FrameSampler
+
+
+def make_synthetic_video(path: str, seconds: int, fps: int = 30, size=(640, 360)):
+    """Write a moving-gradient test clip"""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    base = np.tile(np.linspace(0, 255, size[0], dtype=np.uint8), (size[1], 1))
+
+    for i in range(seconds * fps):
+        shifted = np.roll(base, i * 4, axis=1)
+        frame = cv2.merge([shifted, np.full_like(shifted, (i // fps) % 255), 255 - shifted])
+        writer.write(frame)
+
+    writer.release()
+
+
+def sequential_read(video_path: str, timestamps):
+    """Old approach: read() every frame, keep the ones on the sample grid"""
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    wanted = {int(round(t * fps)) for t in timestamps}
+    last = max(wanted)
+
+    requested = 0
+    samples = 0
+    frame_idx = 0
+
+    while cap.isOpened() and frame_idx <= last:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        requested += 1
+        if frame_idx in wanted:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            samples += 1
+        frame_idx += 1
+
+    cap.release()
+    return requested, samples, 0
+
+
+def seek_sampling(video_path: str, timestamps):
+    """New approach: FrameSampler with grab()/seek"""
+    cap = cv2.VideoCapture(video_path)
+    sampler = FrameSampler(cap)
+
+    samples = 0
+    for _, frame in sampler.frames(timestamps):
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        samples += 1
+
+    cap.release()
+    return sampler.frames_requested, samples, sampler.seeks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("video", nargs="?", help="Video to sample (default: synthetic clip)")
+    parser.add_argument("--samples", type=int, default=30, help="Samples to analyse")
+    parser.add_argument("--interval", type=float, default=10.0, help="Seconds between samples")
+    parser.add_argument("--seconds", type=int, default=300, help="Synthetic clip length")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    video_path = args.video
+    if video_path is None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        video_path = os.path.join(tmp_dir.name, "synthetic.mp4")
+        print(f"Generating {args.seconds}s synthetic clip...")
+        make_synthetic_video(video_path, args.seconds)
+
+    cap = cv2.VideoCapture(video_path)
+    duration = FrameSampler(cap).duration
+    cap.release()
+
+    timestamps = [i * args.interval for i in range(args.samples) if i * args.interval < duration]
+
+    print(f"Video: {video_path} ({duration:.1f}s), {len(timestamps)} samples every {args.interval}s\n")
+    print(f"{'method':<12}{'requested':>11}{'samples':>10}{'req/sample':>12}{'seeks':>8}{'time (s)':>10}")
+
+    for name, method in [("sequential", sequential_read), ("seek", seek_sampling)]:
+        start = time.perf_counter()
+        requested, samples, seeks = method(video_path, timestamps)
+        elapsed = time.perf_counter() - start
+        per_sample = requested / samples if samples else 0
+        print(f"{name:<12}{requested:>11}{samples:>10}{per_sample:>12.1f}{seeks:>8}{elapsed:>10.2f}")
+
+    if tmp_dir is not None:
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
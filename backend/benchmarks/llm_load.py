@@ -0,0 +1,98 @@
+"""
+LLM Load Benchmark
+Runs concurrent LlamaScorer analyses and reports gateway queueing and cache behaviour
+
+Usage (from backend/), against the stand-in server:
+    python -m benchmarks.ollama_stub --parallel 2 &
+    OLLAMA_BASE_URL=http://localhost:11435 OLLAMA_NUM_PARALLEL=2 \
+        python -m benchmarks.llm_load [--analyses 8] [--words 3000] [--rounds 2]
+
+The second round re-scores the same transcripts, so it measures the LLM cache.
+Runs without MongoDB; only the in-memory cache tier is used.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("OLLAMA_BASE_URL", "http://localhost:11435")
+
+from app.core.config import settings
+from app.services.ai_pipeline.llama_scoring import LlamaScorer
+from app.services.ai_pipeline.llm_cache import llm_cache
+from app.services.ai_pipeline.model_registry import model_registry
+
+VOCABULARY = (
+    "the function returns a list of values and we iterate over each element "
+    "using a loop then the algorithm sorts the array with a complexity of "
+    "n log n so for example the database query uses an index and the class "
+    "stores state in a variable first we define the problem next we test it"
+).split()
+
+
+def make_transcript(seed: int, words: int) -> str:
+    """Deterministic lecture-like transcript"""
+    rng = random.Random(seed)
+    sentences = []
+    remaining = words
+    while remaining > 0:
+        length = min(remaining, rng.randint(8, 20))
+        sentence = " ".join(rng.choice(VOCABULARY) for _ in range(length))
+        sentences.append(sentence.capitalize() + rng.choice([".", ".", "?"]))
+        remaining -= length
+    return " ".join(sentences)
+
+
+async def run_round(transcripts):
+    """Score all transcripts concurrently, each as its own analysis"""
+    start = time.perf_counter()
+    latencies = []
+
+    async def one(transcript):
+        t0 = time.perf_counter()
+        await LlamaScorer().analyze_transcript(transcript)
+        latencies.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*(one(t) for t in transcripts))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+async def main(args):
+    transcripts = [make_transcript(i, args.words) for i in range(args.analyses)]
+    gateway = model_registry.get_llm_gateway()
+
+    print(f"Ollama: {settings.OLLAMA_BASE_URL}  model: {settings.OLLAMA_MODEL}")
+    print(f"{args.analyses} analyses x {args.words} words, mode={settings.LLM_SCORING_MODE}/"
+          f"{settings.LLM_TRANSCRIPT_MODE}, OLLAMA_NUM_PARALLEL={gateway.max_in_flight}\n")
+    print(f"{'round':<7}{'wall (s)':>10}{'p50 (s)':>10}{'max (s)':>10}{'requests':>10}"
+          f"{'wait avg':>10}{'hits':>7}{'misses':>8}")
+
+    for round_no in range(1, args.rounds + 1):
+        requests_before = gateway.requests
+        wall, latencies = await run_round(transcripts)
+        stats = gateway.stats()
+        cache = llm_cache.stats()
+        print(
+            f"{round_no:<7}{wall:>10.2f}{latencies[len(latencies) // 2]:>10.2f}{latencies[-1]:>10.2f}"
+            f"{stats['requests'] - requests_before:>10}{stats['queue_wait_avg']:>10.3f}"
+            f"{cache['memory_hits'] + cache['persistent_hits']:>7}{cache['misses']:>8}"
+        )
+
+    print(f"\nGateway: {gateway.stats()}")
+    print(f"Cache:   {llm_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent LLM scoring load test")
+    parser.add_argument("--analyses", type=int, default=8, help="Concurrent analyses")
+    parser.add_argument("--words", type=int, default=3000, help="Transcript length in words")
+    parser.add_argument("--rounds", type=int, default=2, help="Repeat rounds (later rounds hit the cache)")
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
@@ -0,0 +1,192 @@
+"""
+Ollama Stand-in Server
+Deterministic local implementation of the /api/generate subset LlamaScorer uses
+
+Usage (from backend/):
+    python -m benchmarks.ollama_stub [--port 11435] [--token-delay 0.02] [--parallel 1]
+
+Then point the backend at it:
+    OLLAMA_BASE_URL=http://localhost:11435
+
+Responses depend only on (model, prompt), so runs are repeatable. Latency is
+simulated as prompt tokens * --prompt-delay + generated tokens * --token-delay,
+and at most --parallel requests are "computed" at once (like OLLAMA_NUM_PARALLEL);
+up to --max-queue more wait, beyond that requests get 503 like a full Ollama queue.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Rough tokens per character for prompt/response sizes
+CHARS_PER_TOKEN = 4
+
+
+class StubState:
+    """Configuration and counters shared by the handlers"""
+
+    def __init__(self, token_delay: float, prompt_delay: float, parallel: int, max_queue: int):
+        self.token_delay = token_delay
+        self.prompt_delay = prompt_delay
+        self.parallel = parallel
+        self.max_queue = max_queue
+        self.semaphore = asyncio.Semaphore(parallel)
+
+        self.requests = 0
+        self.rejected = 0
+        self.waiting = 0
+        self.running = 0
+        self.max_running = 0
+        self.max_waiting = 0
+        self.loaded_models = set()
+
+
+def deterministic_scores(model: str, prompt: str) -> dict:
+    """Rubric scores derived from a hash of the request"""
+    digest = hashlib.sha256(f"{model}\n{prompt}".encode()).digest()
+    # Spread over 0.30-0.95 so different transcripts get different scores
+    return {
+        "technical_depth": round(0.30 + digest[0] / 255 * 0.65, 2),
+        "clarity": round(0.30 + digest[1] / 255 * 0.65, 2),
+        "structure": round(0.30 + digest[2] / 255 * 0.65, 2),
+    }
+
+
+def build_response_text(model: str, prompt: str, format: str) -> str:
+    """Text the stub 'generates' for a prompt"""
+    scores = deterministic_scores(model, prompt)
+    if format == "json":
+        return json.dumps(scores)
+    return f"{scores['technical_depth']:.2f}"
+
+
+def create_app(state: StubState) -> FastAPI:
+    """Build the stub server"""
+    app = FastAPI(title="Ollama stand-in")
+
+    @app.get("/")
+    async def root():
+        return "Ollama is running"
+
+    @app.get("/api/version")
+    async def version():
+        return {"version": "0.0.0-stub"}
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": name, "model": name} for name in sorted(state.loaded_models)]}
+
+    @app.get("/stub/stats")
+    async def stats():
+        return {
+            "requests": state.requests,
+            "rejected": state.rejected,
+            "running": state.running,
+            "waiting": state.waiting,
+            "max_running": state.max_running,
+            "max_waiting": state.max_waiting,
+            "parallel": state.parallel
+        }
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        body = await request.json()
+        model = body.get("model", "")
+        prompt = body.get("prompt", "")
+        format = body.get("format", "")
+        options = body.get("options") or {}
+        stream = body.get("stream", True)
+
+        state.requests += 1
+        state.loaded_models.add(model)
+        created_at = datetime.now(timezone.utc).isoformat()
+
+        # Empty prompt only loads the model
+        if not prompt:
+            return {"model": model, "created_at": created_at, "response": "", "done": True, "done_reason": "load"}
+
+        if state.waiting >= state.max_queue:
+            state.rejected += 1
+            return JSONResponse(status_code=503, content={"error": "server busy, please try again. maximum pending requests exceeded"})
+
+        text = build_response_text(model, prompt, format)
+        prompt_tokens = max(1, len(prompt) // CHARS_PER_TOKEN)
+        num_predict = options.get("num_predict", 128)
+        if num_predict is None or num_predict < 0:
+            num_predict = 128
+        eval_tokens = max(1, min(num_predict, len(text) // CHARS_PER_TOKEN + 1))
+
+        queued_at = time.perf_counter()
+        state.waiting += 1
+        state.max_waiting = max(state.max_waiting, state.waiting)
+        await state.semaphore.acquire()
+        state.waiting -= 1
+        state.running += 1
+        state.max_running = max(state.max_running, state.running)
+        started_at = time.perf_counter()
+
+        def final_fields(eval_duration: float) -> dict:
+            return {
+                "model": model,
+                "created_at": created_at,
+                "done": True,
+                "done_reason": "stop",
+                "total_duration": int((time.perf_counter() - queued_at) * 1e9),
+                "load_duration": 0,
+                "prompt_eval_count": prompt_tokens,
+                "prompt_eval_duration": int(prompt_tokens * state.prompt_delay * 1e9),
+                "eval_count": eval_tokens,
+                "eval_duration": int(eval_duration * 1e9)
+            }
+
+        async def finish():
+            state.running -= 1
+            state.semaphore.release()
+
+        if not stream:
+            try:
+                await asyncio.sleep(prompt_tokens * state.prompt_delay + eval_tokens * state.token_delay)
+            finally:
+                await finish()
+            return {"response": text, **final_fields(time.perf_counter() - started_at)}
+
+        async def chunks():
+            try:
+                await asyncio.sleep(prompt_tokens * state.prompt_delay)
+                eval_started = time.perf_counter()
+                step = max(1, len(text) // eval_tokens)
+                for i in range(0, len(text), step):
+                    await asyncio.sleep(state.token_delay)
+                    yield json.dumps({"model": model, "created_at": created_at, "response": text[i:i + step], "done": False}) + "\n"
+                yield json.dumps({"response": "", **final_fields(time.perf_counter() - eval_started)}) + "\n"
+            finally:
+                await finish()
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministic Ollama stand-in for benchmarks and tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--token-delay", type=float, default=0.02, help="Seconds per generated token")
+    parser.add_argument("--prompt-delay", type=float, default=0.0005, help="Seconds per prompt token")
+    parser.add_argument("--parallel", type=int, default=1, help="Requests computed at once")
+    parser.add_argument("--max-queue", type=int, default=512, help="Waiting requests before 503")
+    args = parser.parse_args()
+
+    state = StubState(args.token_delay, args.prompt_delay, args.parallel, args.max_queue)
+    uvicorn.run(create_app(state), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
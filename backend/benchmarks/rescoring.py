@@ -0,0 +1,107 @@
+"""
+Rescoring Benchmark
+Per-analysis scores and insights vs the vectorized batch path used by `python -m app.rescore`
+
+Usage (from backend/):
+    python -m benchmarks.rescoring [--analyses 200000] [--batch-size 2000]
+
+Runs on synthetic stored features (some missing, as in old analyses), so no
+MongoDB is needed. Checks both paths agree exactly, and reports the cost of
+building the bulk_write operations per batch as well.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.services.analysis.rescoring import Rescorer
+from app.services.analysis.scoring_engine import ScoringEngine
+
+# Plausible ranges of the stored features
+RANGES = {
+    "energy_mean": (0.0, 1.0),
+    "speech_rate": (90, 210),
+    "pause_ratio": (0.0, 0.4),
+    "gesture_count": (0, 25),
+    "face_confidence": (0.3, 1.0),
+    "eye_contact_ratio": (0.2, 1.0),
+    "clarity_score": (0.0, 1.0),
+    "technical_term_count": (0, 15),
+    "technical_depth_score": (0.0, 1.0),
+    "structure_score": (0.0, 1.0),
+    "question_count": (0, 8),
+}
+SECTIONS = {
+    "audio_features": ("energy_mean", "speech_rate", "pause_ratio"),
+    "visual_features": ("gesture_count", "face_confidence", "eye_contact_ratio"),
+    "nlp_analysis": ("clarity_score", "technical_term_count", "technical_depth_score", "structure_score", "question_count"),
+}
+
+
+def make_docs(count: int):
+    rng = random.Random(0)
+    docs = []
+    for i in range(count):
+        doc = {"_id": str(i)}
+        for section, fields in SECTIONS.items():
+            values = {}
+            for field in fields:
+                if rng.random() < 0.05:
+                    continue  # missing in older analyses
+                low, high = RANGES[field]
+                values[field] = rng.randint(low, high) if isinstance(low, int) else rng.uniform(low, high)
+            doc[section] = values
+        docs.append(doc)
+    return docs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk rescoring benchmark")
+    parser.add_argument("--analyses", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    docs = make_docs(args.analyses)
+    engine = ScoringEngine()
+    batches = [docs[i:i + args.batch_size] for i in range(0, len(docs), args.batch_size)]
+
+    start = time.perf_counter()
+    scalar = []
+    for doc in docs:
+        scores = engine.calculate_scores(doc)
+        scalar.append((scores, engine.generate_insights(doc, scores)))
+    scalar_time = time.perf_counter() - start
+
+    rescorer = Rescorer(batch_size=args.batch_size)
+    start = time.perf_counter()
+    vectorized = []
+    for batch in batches:
+        scores, insights = rescorer.score(batch)
+        vectorized.extend(zip(scores, insights))
+    vectorized_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    operations = sum(len(rescorer.score_batch(batch, "benchmark")) for batch in batches)
+    operations_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(scalar, vectorized) if a != b)
+
+    print(f"Analyses: {args.analyses}, batch size: {args.batch_size}, mismatches: {mismatches}\n")
+    print(f"{'method':<32}{'time (s)':>10}{'per second':>14}")
+    for name, elapsed in [
+        ("per analysis", scalar_time),
+        ("vectorized batches", vectorized_time),
+        ("bulk_write operations", operations_time),
+    ]:
+        print(f"{name:<32}{elapsed:>10.2f}{args.analyses / elapsed:>14,.0f}")
+    print(f"\n{operations} update operations built")
+
+
+if __name__ == "__main__":
+    main()
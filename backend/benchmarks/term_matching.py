@@ -0,0 +1,93 @@
+"""
+Term Matching Benchmark
+Compares the old per-pattern regex passes with the compiled TermMatcher
+
+Usage (from backend/):
+    python -m benchmarks.term_matching [--words 20000] [--terms 5000] [--repeat 5]
+
+Uses the built-in software vocabulary plus --terms synthetic terms, and a
+transcript of --words words sprinkled with vocabulary terms.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.services.ai_pipeline.term_matcher import BUILTIN_VOCABULARY_DIR, TermMatcher, term_vocabularies
+
+FILLER = "so now we look at how this works and then we can see why it matters here".split()
+
+
+def regex_count(patterns, text: str) -> int:
+    """Original approach: one re.findall per pattern, flags on every call"""
+    count = 0
+    for pattern in patterns:
+        count += len(re.findall(pattern, text, re.IGNORECASE))
+    return count
+
+
+def timed(func, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Technical term matching benchmark")
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--terms", type=int, default=5000, help="Synthetic terms added to the vocabulary")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    base_terms, _ = term_vocabularies._read(os.path.join(BUILTIN_VOCABULARY_DIR, "software.txt"))
+    synthetic = [
+        " ".join(f"t{rng.randrange(10**6)}" for _ in range(rng.randint(1, 3)))
+        for _ in range(args.terms)
+    ]
+    terms = base_terms + synthetic
+
+    words = []
+    while len(words) < args.words:
+        words.extend(rng.choice(terms).split() if rng.random() < 0.1 else [rng.choice(FILLER)])
+    transcript = " ".join(words[:args.words])
+
+    # Regex baselines: four patterns over the whole vocabulary, and one combined alternation
+    quarter = max(1, len(terms) // 4)
+    patterns = [
+        r'\b(?:' + "|".join(re.escape(t) for t in terms[i:i + quarter]) + r')\b'
+        for i in range(0, len(terms), quarter)
+    ]
+    combined = re.compile(
+        r'\b(?:' + "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)) + r')\b',
+        re.IGNORECASE
+    )
+
+    compile_time, matcher = timed(lambda: TermMatcher("benchmark", terms), 1)
+
+    print(f"Transcript: {args.words} words, vocabulary: {len(terms)} terms "
+          f"(trie compiled in {compile_time * 1000:.1f} ms)\n")
+    print(f"{'method':<22}{'matches':>10}{'time (ms)':>12}")
+
+    for name, func in [
+        ("regex per pattern", lambda: regex_count(patterns, transcript)),
+        ("regex combined", lambda: len(combined.findall(transcript))),
+        ("token trie", lambda: sum(matcher.count(transcript).values())),
+    ]:
+        elapsed, matches = timed(func, args.repeat)
+        print(f"{name:<22}{matches:>10}{elapsed * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+VAD Trimming Benchmark
+How much audio reaches Whisper with and without the VAD pre-pass
+
+Usage (from backend/):
+    python -m benchmarks.vad_trim [--minutes 30] [--silence 0.4] [--whisper]
+
+Builds a synthetic lecture: speech-like stretches separated by long silent
+breaks (setup, board writing) making up --silence of the recording, over a
+low noise floor. Whisper cost scales with the audio it decodes, so seconds
+transcribed is the headline number; --whisper also times real transcription
+of both plans when openai-whisper is installed.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.core.config import settings
+from app.services.ai_pipeline.audio_decoder import DecodedAudio
+from app.services.ai_pipeline.vad import detect_speech, pause_statistics
+from benchmarks.audio_features import make_speech_like
+
+
+def make_lecture(minutes: float, silence: float, sr: int):
+    """Speech stretches and silent breaks, plus the true speech intervals"""
+    rng = np.random.default_rng(1)
+    total = int(minutes * 60 * sr)
+    y = rng.normal(0, 0.002, total).astype(np.float32)
+    truth = []
+
+    pos = 0
+    while pos < total:
+        pause = rng.uniform(10, 45)
+        talk = pause * (1 - silence) / max(silence, 0.05)
+        end = min(total, pos + int(talk * sr))
+        n = end - pos
+        y[pos:end] += make_speech_like(n / sr + 0.01, sr)[:n]
+        truth.append((pos / sr, end / sr))
+        pos = end + int(pause * sr)
+
+    return y, truth
+
+
+def overlap(a, b) -> float:
+    """Seconds covered by both interval lists"""
+    total, i, j = 0.0, 0, 0
+    while i < len(a) and j < len(b):
+        total += max(0.0, min(a[i][1], b[j][1]) - max(a[i][0], b[j][0]))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VAD trimming benchmark")
+    parser.add_argument("--minutes", type=float, default=30)
+    parser.add_argument("--silence", type=float, default=0.4, help="Approximate share of silent breaks")
+    parser.add_argument("--whisper", action="store_true", help="Also time real Whisper transcription")
+    args = parser.parse_args()
+
+    sr = settings.AUDIO_SAMPLE_RATE
+    y, truth = make_lecture(args.minutes, args.silence, sr)
+    duration = len(y) / sr
+
+    start = time.perf_counter()
+    speech = detect_speech(y, sr)
+    vad_time = time.perf_counter() - start
+
+    detected = sum(e - s for s, e in speech)
+    true_speech = sum(e - s for s, e in truth)
+
+    print(f"Recording: {duration / 60:.1f} min, true speech {true_speech / 60:.1f} min\n")
+    print(f"VAD time:            {vad_time:.2f} s ({vad_time / (duration / 60) * 1000:.0f} ms per minute)")
+    print(f"Speech recall:       {overlap(speech, truth) / true_speech:.3f}")
+    print(f"Transcribed audio:   {duration / 60:.1f} min -> {detected / 60:.1f} min "
+          f"({1 - detected / duration:.0%} less Whisper input)")
+    print(f"Pause metrics:       {pause_statistics(speech, duration)}")
+
+    if args.whisper:
+        from app.services.ai_pipeline.whisper_transcription import plan_transcription, run_transcription
+
+        audio = DecodedAudio(y, sr)
+        for name, plan in [("no VAD", plan_transcription(audio)), ("VAD", plan_transcription(audio, speech))]:
+            start = time.perf_counter()
+            for intervals in plan:
+                run_transcription(audio, intervals)
+            print(f"Whisper ({name}):     {time.perf_counter() - start:.1f} s over {len(plan)} segments")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Whisper Real-Time Factor Benchmark
+Transcription speed of each Whisper backend and model size
+
+Usage (from backend/):
+    python -m benchmarks.whisper_rtf [audio_or_video] [--backends openai faster_whisper]
+                                     [--models tiny base small] [--seconds 120]
+
+RTF = processing time / audio duration (lower is faster, < 1 is faster than
+real time). Pass a real lecture for meaningful numbers; without one a
+synthetic speech-like signal is used, which times the decoder but produces
+no useful text. Backends that aren't installed are skipped.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.core.config import settings
+from app.services.ai_pipeline.audio_decoder import AudioDecoder
+from app.services.ai_pipeline.whisper_backends import BACKENDS, WHISPER_SAMPLE_RATE, create_whisper_backend
+from benchmarks.audio_features import make_speech_like
+
+
+def load_audio(path: str, seconds: float) -> np.ndarray:
+    """First `seconds` of a file at Whisper's rate, or synthetic audio"""
+    if path is None:
+        print(f"No input given, using {seconds:.0f}s of synthetic audio\n")
+        return make_speech_like(seconds, WHISPER_SAMPLE_RATE)
+
+    audio = asyncio.run(AudioDecoder(sample_rate=WHISPER_SAMPLE_RATE).decode(path))
+    return np.array(audio.samples[:int(seconds * WHISPER_SAMPLE_RATE)], dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Whisper backend real-time factor")
+    parser.add_argument("input", nargs="?", help="Audio or video file (decoded with ffmpeg)")
+    parser.add_argument("--backends", nargs="+", default=sorted(BACKENDS), choices=sorted(BACKENDS))
+    parser.add_argument("--models", nargs="+", default=["tiny", "base"])
+    parser.add_argument("--seconds", type=float, default=120, help="Audio length to transcribe")
+    parser.add_argument("--beam-size", type=int, default=settings.WHISPER_BEAM_SIZE)
+    parser.add_argument("--threads", type=int, default=settings.WHISPER_NUM_THREADS)
+    args = parser.parse_args()
+
+    samples = load_audio(args.input, args.seconds)
+    duration = len(samples) / WHISPER_SAMPLE_RATE
+
+    print(f"Audio: {duration:.1f}s, device={settings.WHISPER_DEVICE}, beam={args.beam_size}, "
+          f"threads={args.threads or 'default'}\n")
+    print(f"{'backend':<16}{'model':<10}{'detail':<14}{'load (s)':>10}{'run (s)':>10}{'RTF':>8}{'words':>8}")
+
+    for backend_name in args.backends:
+        for model_name in args.models:
+            backend = create_whisper_backend(
+                backend_name, model_name=model_name, beam_size=args.beam_size, threads=args.threads
+            )
+            detail = getattr(backend, "compute_type", "fp32" if backend.device == "cpu" else "fp16")
+
+            try:
+                start = time.perf_counter()
+                backend.load()
+                load_time = time.perf_counter() - start
+            except ImportError as e:
+                print(f"{backend_name:<16}{model_name:<10}skipped: {e}")
+                break
+
+            # Warm-up pass so one-off initialisation isn't counted
+            backend.transcribe(samples[:WHISPER_SAMPLE_RATE * 5])
+
+            start = time.perf_counter()
+            result = backend.transcribe(samples)
+            run_time = time.perf_counter() - start
+
+            print(f"{backend_name:<16}{model_name:<10}{detail:<14}{load_time:>10.1f}{run_time:>10.1f}"
+                  f"{run_time / duration:>8.3f}{len(result['text'].split()):>8}")
+
+
+if __name__ == "__main__":
+    main()